@@ -0,0 +1,300 @@
+"""
+Cross-season driver index.
+
+An inverted index from driver code to every race row the driver appears in,
+(season, round, row) → a few per-race numbers, plus running career and
+per-season sums. Profile, DNA and rating requests read the index only;
+no race document is opened per request.
+
+Built once from every stored race (files / Mongo) and kept current from the
+race store: a race loaded for the first time is added, a re-loaded race
+replaces its previous contribution.
+"""
+
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.race_store import backfill, race_store, season_complete
+from app.core.standings import driver_points
+
+DRIVER_INDEX_REFRESH_S = float(os.getenv("DRIVER_INDEX_REFRESH_S", "300"))
+RECENT_RACES = 5
+WET_COMPOUNDS = {"INTERMEDIATE", "WET"}
+
+# summed per driver (career + season); averages are sum / count
+_SUMS = ("finish", "grid", "positions_gained", "stops", "consistency", "risk", "degradation")
+
+
+def _num(value) -> Optional[float]:
+    return float(value) if isinstance(value, (int, float)) and value == value else None
+
+
+def _entry(season: int, round_number: int, row: int, d: Dict[str, Any]) -> Dict[str, Any]:
+    finish = d.get("finish")
+    grid = d.get("grid")
+    risk = d.get("strategy_risk") or {}
+    return {
+        "season":           season,
+        "round":            round_number,
+        "row":              row,
+        "name":             d.get("driver_name"),
+        "team":             d.get("team"),
+        "finish":           _num(finish) if _num(finish) is not None and 0 < finish < 99 else None,
+        "grid":             _num(grid) if _num(grid) is not None and grid > 0 else None,
+        "positions_gained": _num(d.get("positions_gained")),
+        "stops":            _num(d.get("stops")),
+        "consistency":      _num(d.get("consistency_index")),
+        "risk":             _num(risk.get("risk_score")),
+        "degradation":      _num(d.get("tyre_degradation_index")),
+        "points":           driver_points(d),
+        "wet":              bool(WET_COMPOUNDS & set(d.get("tyre_sequence") or [])),
+    }
+
+
+class _Agg:
+    """Running sums for one driver (career or one season)."""
+
+    def __init__(self):
+        self.races = 0
+        self.wins = 0
+        self.podiums = 0
+        self.points = 0.0
+        self.sums = dict.fromkeys(_SUMS, 0.0)
+        self.counts = dict.fromkeys(_SUMS, 0)
+
+    def add(self, e: Dict[str, Any], sign: int = 1):
+        self.races += sign
+        self.wins += sign * (e["finish"] == 1)
+        self.podiums += sign * (e["finish"] is not None and e["finish"] <= 3)
+        self.points += sign * e["points"]
+        for k in _SUMS:
+            if e[k] is not None:
+                self.sums[k] += sign * e[k]
+                self.counts[k] += sign
+
+    def mean(self, key: str, digits: int = 2) -> Optional[float]:
+        n = self.counts[key]
+        return round(self.sums[key] / n, digits) if n else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "races":            self.races,
+            "classified":       self.counts["finish"],
+            "wins":             self.wins,
+            "podiums":          self.podiums,
+            "points":           round(self.points, 1),
+            "avg_finish":       self.mean("finish"),
+            "avg_grid":         self.mean("grid"),
+            "positions_gained": int(self.sums["positions_gained"]),
+            "avg_stops":        self.mean("stops"),
+            "consistency":      self.mean("consistency", 1),
+            "avg_risk":         self.mean("risk", 1),
+            "avg_degradation":  self.mean("degradation", 1),
+        }
+
+
+class DriverIndex:
+    def __init__(self):
+        self.postings: Dict[str, List[Dict[str, Any]]] = defaultdict(list)   # code → entries by (season, round)
+        self.career: Dict[str, _Agg] = defaultdict(_Agg)
+        self.seasons: Dict[Tuple[str, int], _Agg] = defaultdict(_Agg)
+        self._races: Dict[Tuple[int, int], List[Tuple[str, Dict[str, Any]]]] = {}
+        self._leaders: Optional[Dict[int, float]] = None            # season → most points
+        self._lock = threading.RLock()
+        self.refreshed_at = 0.0
+
+    # ---------------------------
+    # incremental updates
+    # ---------------------------
+
+    def add_race(self, season: int, round_number: int, doc: Dict[str, Any]):
+        rows = [
+            (d["driver_code"], _entry(season, round_number, i, d))
+            for i, d in enumerate(doc.get("drivers", []))
+            if d.get("driver_code")
+        ]
+        with self._lock:
+            self._remove_race(season, round_number)
+            for code, e in rows:
+                postings = self.postings[code]
+                postings.append(e)
+                if len(postings) > 1 and (postings[-2]["season"], postings[-2]["round"]) > (season, round_number):
+                    postings.sort(key=lambda x: (x["season"], x["round"]))
+                self.career[code].add(e)
+                self.seasons[(code, season)].add(e)
+            self._races[(season, round_number)] = rows
+            self._leaders = None
+
+    def _remove_race(self, season: int, round_number: int):
+        for code, e in self._races.pop((season, round_number), []):
+            self.postings[code].remove(e)
+            self.career[code].add(e, sign=-1)
+            self.seasons[(code, season)].add(e, sign=-1)
+
+    def has_race(self, season: int, round_number: int) -> bool:
+        return (season, round_number) in self._races
+
+    # ---------------------------
+    # reads
+    # ---------------------------
+
+    def codes(self) -> List[str]:
+        with self._lock:
+            return sorted(c for c, p in self.postings.items() if p)
+
+    def profile(self, code: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            postings = self.postings.get(code)
+            if not postings:
+                return None
+            career = self.career[code].to_dict()
+            seasons = sorted({e["season"] for e in postings})
+            by_season = {s: self.seasons[(code, s)].to_dict() for s in seasons}
+            finishes = [e["finish"] for e in postings if e["finish"] is not None]
+            recent = finishes[-RECENT_RACES:]
+            latest = postings[-1]
+            wet = [e["finish"] for e in postings if e["wet"] and e["finish"] is not None]
+            titles = self.titles(code, seasons)
+
+        return {
+            "code":          code,
+            "name":          latest["name"] or code,
+            "team":          latest["team"],
+            "best_finish":   int(min(finishes)) if finishes else None,
+            "recent_form":   round(sum(recent) / len(recent), 2) if recent else None,
+            "wet_avg_finish": round(sum(wet) / len(wet), 2) if wet else None,
+            "titles":        titles,
+            **career,
+            "seasons":       by_season,
+            "races_index":   [(e["season"], e["round"], e["row"]) for e in postings],
+        }
+
+    def titles(self, code: str, seasons: List[int]) -> int:
+        """Completed seasons in which the driver scored the most points."""
+        if self._leaders is None:
+            leaders: Dict[int, float] = {}
+            for (_, season), agg in self.seasons.items():
+                if agg.races:
+                    leaders[season] = max(leaders.get(season, 0.0), agg.points)
+            # only seasons the store knows are over can award a title
+            self._leaders = {s: pts for s, pts in leaders.items() if season_complete(s)}
+        return sum(
+            1 for s in seasons
+            if self._leaders.get(s, 0.0) > 0 and self.seasons[(code, s)].points == self._leaders[s]
+        )
+
+
+# ===========================
+# DERIVED VIEWS
+# ===========================
+
+def _clip(x: float) -> int:
+    return int(max(0, min(100, round(x))))
+
+
+def dna(profile: Dict[str, Any]) -> Dict[str, int]:
+    """0–100 trait scores from career aggregates."""
+    avg_finish = profile["avg_finish"] or 20
+    gained_per_race = profile["positions_gained"] / profile["races"] if profile["races"] else 0
+    pace = _clip(100 - (avg_finish - 1) * 5)
+    wet_finish = profile["wet_avg_finish"]
+    return {
+        "pace":            pace,
+        "racecraft":       _clip(50 + gained_per_race * 8),
+        "tyres":           _clip(profile["avg_degradation"] if profile["avg_degradation"] is not None else 50),
+        "consistency":     _clip(profile["consistency"] if profile["consistency"] is not None else 50),
+        "wet":             _clip(100 - (wet_finish - 1) * 5) if wet_finish is not None else pace,
+        "risk_management": _clip(100 - profile["avg_risk"]) if profile["avg_risk"] is not None else 50,
+    }
+
+
+_TRAIT_LABELS = {
+    "pace":            "Raw Pace",
+    "racecraft":       "Racecraft",
+    "tyres":           "Tyre Management",
+    "consistency":     "Consistency",
+    "wet":             "Wet Weather",
+    "risk_management": "Strategy Discipline",
+}
+
+
+def insight(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Rule-based rating / tier / trend summary for the driver profile page."""
+    traits = dna(profile)
+    rating = int(round(sum(traits.values()) / len(traits)))
+    strength = max(traits, key=traits.get)
+    weakness = min(traits, key=traits.get)
+
+    recent, career = profile["recent_form"], profile["avg_finish"]
+    if recent is None or career is None or abs(recent - career) < 1:
+        trend = "Stable"
+    else:
+        trend = "Improving" if recent < career else "Declining"
+
+    avg_risk = profile["avg_risk"]
+    risk = "Unknown" if avg_risk is None else "High" if avg_risk >= 60 else "Medium" if avg_risk >= 35 else "Low"
+    tier = "Elite" if rating >= 80 else "Strong" if rating >= 65 else "Midfield" if rating >= 50 else "Developing"
+
+    return {
+        "rating":   rating,
+        "tier":     tier,
+        "strength": _TRAIT_LABELS[strength],
+        "weakness": _TRAIT_LABELS[weakness],
+        "trend":    trend,
+        "risk":     risk,
+        "summary": (
+            f"{profile['name']} averages P{career} over {profile['races']} races "
+            f"({profile['wins']} wins, {profile['podiums']} podiums). "
+            f"Strongest trait: {_TRAIT_LABELS[strength].lower()}; "
+            f"weakest: {_TRAIT_LABELS[weakness].lower()}. Form is {trend.lower()}."
+        ),
+    }
+
+
+# ===========================
+# MODULE INDEX
+# ===========================
+
+driver_index = DriverIndex()
+_build_lock = threading.Lock()
+
+
+def refresh(force: bool = False) -> DriverIndex:
+    """Add stored races the index hasn't seen (at most every DRIVER_INDEX_REFRESH_S)."""
+    now = time.monotonic()
+    if not force and driver_index.refreshed_at and now - driver_index.refreshed_at < DRIVER_INDEX_REFRESH_S:
+        return driver_index
+    with _build_lock:
+        if not force and driver_index.refreshed_at and now - driver_index.refreshed_at < DRIVER_INDEX_REFRESH_S:
+            return driver_index
+        backfill(driver_index.has_race, driver_index.add_race)
+        driver_index.refreshed_at = time.monotonic()
+    return driver_index
+
+
+def list_drivers() -> List[Dict[str, Any]]:
+    index = refresh()
+    out = []
+    for code in index.codes():
+        p = index.profile(code)
+        out.append({
+            "code":    code,
+            "name":    p["name"],
+            "team":    p["team"],
+            "country": None,
+            "image":   None,
+            "rating":  insight(p)["rating"],
+            "titles":  p["titles"],
+            "races":   p["races"],
+        })
+    return out
+
+
+def get_profile(code: str) -> Optional[Dict[str, Any]]:
+    return refresh().profile(code.upper())
+
+
+race_store.subscribe(driver_index.add_race)
@@ -0,0 +1,110 @@
+"""
+Bulk dataset export as streamed Arrow IPC or Parquet.
+
+One race at a time is read from the stored race documents (files / Mongo,
+past the race store's memory tier) and lap tables — never FastF1 — turned
+into a single RecordBatch with a fixed schema and written to the stream; the bytes written so far are
+handed to the client before the next race is read. Memory stays bounded by
+one race whatever the number of seasons.
+
+    results    one row per (season, round, driver): grid, finish, points, …
+    strategy   one row per (season, round, driver): stops, tyre sequence, indices
+    laps       the stored lap tables with season / round columns
+"""
+
+from typing import Iterator, List, Sequence
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from app.core import lap_store, metrics
+from app.core.race_store import available_rounds, stored_race
+from app.core.race_table import COLUMNS, race_rows
+
+FORMATS = {
+    "arrow":   ("application/vnd.apache.arrow.stream", "arrows"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+_ARROW_TYPES = {"i": pa.int32(), "f": pa.float64(), "b": pa.bool_(), "s": pa.string()}
+_LAP_TYPES = {"string": pa.string(), "int16": pa.int16(), "float32": pa.float32(), "float64": pa.float64()}
+
+_RESULT_COLUMNS = [
+    "season", "round", "event_name", "location", "driver", "team",
+    "grid", "finish", "positions_gained", "points", "is_winner", "classified",
+]
+_STRATEGY_COLUMNS = [
+    "season", "round", "driver", "stops", "strategy", "start_compound", "longest_stint",
+    "consistency_index", "tyre_degradation_index", "pit_efficiency", "risk_score",
+]
+DATASETS = {
+    "results":  pa.schema([(c, _ARROW_TYPES[COLUMNS[c]]) for c in _RESULT_COLUMNS]),
+    "strategy": pa.schema([(c, _ARROW_TYPES[COLUMNS[c]]) for c in _STRATEGY_COLUMNS]),
+    "laps":     pa.schema(
+        [("season", pa.int32()), ("round", pa.int32())]
+        + [(c, _LAP_TYPES[t]) for c, t in lap_store.LAP_COLUMNS.items()]
+    ),
+}
+
+
+class _Chunks:
+    """Write-only file object whose contents are drained after every batch."""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        out, self._parts = b"".join(self._parts), []
+        return out
+
+
+def _batches(dataset: str, seasons: Sequence[int]) -> Iterator[pa.RecordBatch]:
+    schema = DATASETS[dataset]
+    for season in seasons:
+        for rnd in available_rounds(season):
+            if dataset == "laps":
+                table = lap_store.load_lap_table(season, rnd)
+                if table is None or table.empty:
+                    continue
+                frame = table.assign(season=season, round=rnd)
+                yield pa.RecordBatch.from_pandas(frame, schema=schema, preserve_index=False)
+                continue
+            rows = race_rows(season, rnd, stored_race(season, rnd) or {})
+            if rows:
+                yield pa.RecordBatch.from_pydict(
+                    {f.name: [r[f.name] for r in rows] for f in schema}, schema=schema,
+                )
+
+
+def stream_export(dataset: str, seasons: Sequence[int], fmt: str = "arrow") -> Iterator[bytes]:
+    """Arrow IPC stream / Parquet file bytes, one race per chunk (row group)."""
+    schema = DATASETS[dataset]
+    sink = _Chunks()
+    writer = ipc.new_stream(sink, schema) if fmt == "arrow" else pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for batch in _batches(dataset, seasons):
+            with metrics.timer("serialize", format=fmt):
+                if fmt == "arrow":
+                    writer.write_batch(batch)
+                else:
+                    writer.write_table(pa.Table.from_batches([batch], schema=schema))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    tail = sink.drain()
+    if tail:
+        yield tail
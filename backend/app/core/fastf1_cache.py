@@ -0,0 +1,240 @@
+"""
+Single, managed FastF1 disk cache.
+
+Every FastF1 user in the backend (API routes, telemetry_source, the precompute
+scripts) goes through this module so there is exactly one cache directory:
+
+    $FASTF1_CACHE  (default: backend/.fastf1-cache)
+
+FastF1 lays the cache out as <season>/<event>/<session>/*.ff1pkl. Session
+loads made through `load_session` are recorded (hit / miss + last use) in a
+small SQLite stats store shared by every process using the cache, and the
+cache is pruned least-recently-used session first whenever it grows past
+FASTF1_CACHE_MAX_MB.
+"""
+
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import fastf1
+
+from app.core import metrics
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+CACHE_DIR = os.path.abspath(os.path.expanduser(
+    os.getenv("FASTF1_CACHE", os.path.join(BASE_DIR, ".fastf1-cache"))
+))
+CACHE_MAX_MB = float(os.getenv("FASTF1_CACHE_MAX_MB", "4096"))
+
+_STATS_DB = os.path.join(CACHE_DIR, "strathub_cache_stats.sqlite3")
+_HTTP_CACHE = "fastf1_http_cache.sqlite"
+
+_STATS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS sessions (path TEXT PRIMARY KEY, last_used REAL NOT NULL);
+INSERT OR IGNORE INTO counters (name, value) VALUES ('hits', 0), ('misses', 0);
+"""
+
+_enabled = False
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def enable():
+    """Point FastF1 at the shared cache directory (idempotent)."""
+    global _enabled
+    if _enabled:
+        return
+    with _lock:
+        if not _enabled:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            fastf1.Cache.enable_cache(CACHE_DIR)
+            _enabled = True
+
+
+# ---------------------------
+# Stats store (shared by every process using the cache)
+# ---------------------------
+
+def _stats_db() -> sqlite3.Connection:
+    # one connection per thread; updates are single atomic statements, so
+    # concurrent workers never lose a hit / miss
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        conn = sqlite3.connect(_STATS_DB, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_STATS_SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+def _read_stats() -> Dict[str, Any]:
+    try:
+        conn = _stats_db()
+        counts = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        sessions = dict(conn.execute("SELECT path, last_used FROM sessions").fetchall())
+    except sqlite3.Error:
+        return {"hits": 0, "misses": 0, "sessions": {}}
+    return {"hits": counts.get("hits", 0), "misses": counts.get("misses", 0), "sessions": sessions}
+
+
+def _record(session_rel: str, hit: bool):
+    try:
+        conn = _stats_db()
+        conn.execute("UPDATE counters SET value = value + 1 WHERE name = ?", ("hits" if hit else "misses",))
+        conn.execute(
+            "INSERT OR REPLACE INTO sessions (path, last_used) VALUES (?, ?)",
+            (session_rel, time.time()),
+        )
+    except sqlite3.Error:
+        pass
+
+
+def _session_rel_path(session) -> str:
+    # api_path looks like '/static/2023/2023-03-05_Bahrain_Grand_Prix/2023-03-05_Race/'
+    return session.api_path[len("/static/"):].strip("/")
+
+
+def _has_cached_data(session_rel: str) -> bool:
+    path = os.path.join(CACHE_DIR, session_rel)
+    return os.path.isdir(path) and any(f.endswith(".ff1pkl") for f in os.listdir(path))
+
+
+# ---------------------------
+# Loading
+# ---------------------------
+
+def get_session(year: int, round_number: int, identifier: str = "R"):
+    enable()
+    return fastf1.get_session(year, round_number, identifier)
+
+
+def load_session(year: int, round_number: int, identifier: str = "R", **load_kwargs):
+    """
+    fastf1.get_session(...).load(**load_kwargs) through the managed cache.
+    Records a hit when the session was already on disk, then enforces the budget.
+    """
+    session = get_session(year, round_number, identifier)
+    rel = _session_rel_path(session)
+    hit = _has_cached_data(rel)
+    with metrics.timer("session_load", cached=str(hit).lower()):
+        session.load(**load_kwargs)
+    _record(rel, hit)
+    if not hit:
+        prune(keep=rel)
+    return session
+
+
+# ---------------------------
+# Footprint & pruning
+# ---------------------------
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, name))
+            except OSError:
+                pass
+    return total
+
+
+def session_entries() -> List[Dict[str, Any]]:
+    """Every cached session directory with its size and last use."""
+    used = _read_stats()["sessions"]
+    out = []
+    if not os.path.isdir(CACHE_DIR):
+        return out
+    for season in sorted(os.listdir(CACHE_DIR)):
+        season_dir = os.path.join(CACHE_DIR, season)
+        if not (season.isdigit() and os.path.isdir(season_dir)):
+            continue
+        for event in sorted(os.listdir(season_dir)):
+            event_dir = os.path.join(season_dir, event)
+            if not os.path.isdir(event_dir):
+                continue
+            for sess in sorted(os.listdir(event_dir)):
+                path = os.path.join(event_dir, sess)
+                if not os.path.isdir(path):
+                    continue
+                rel = f"{season}/{event}/{sess}"
+                out.append({
+                    "season":    int(season),
+                    "event":     event,
+                    "session":   sess,
+                    "path":      rel,
+                    "bytes":     _dir_size(path),
+                    "last_used": used.get(rel, os.path.getmtime(path)),
+                })
+    return out
+
+
+def counters() -> Dict[str, int]:
+    """Hit / miss counts only (cheap enough for every metrics scrape)."""
+    stats = _read_stats()
+    return {"hits": stats["hits"], "misses": stats["misses"]}
+
+
+def report() -> Dict[str, Any]:
+    entries = session_entries()
+    stats = _read_stats()
+    by_season: Dict[int, Dict[str, int]] = {}
+    for e in entries:
+        s = by_season.setdefault(e["season"], {"sessions": 0, "bytes": 0})
+        s["sessions"] += 1
+        s["bytes"] += e["bytes"]
+
+    http_path = os.path.join(CACHE_DIR, _HTTP_CACHE)
+    lookups = stats["hits"] + stats["misses"]
+    return {
+        "cache_dir":        CACHE_DIR,
+        "max_bytes":        int(CACHE_MAX_MB * 1024 * 1024),
+        "session_bytes":    sum(e["bytes"] for e in entries),
+        "http_cache_bytes": os.path.getsize(http_path) if os.path.exists(http_path) else 0,
+        "sessions":         len(entries),
+        "by_season":        by_season,
+        "hits":             stats["hits"],
+        "misses":           stats["misses"],
+        "hit_ratio":        round(stats["hits"] / lookups, 4) if lookups else None,
+    }
+
+
+def prune(max_bytes: Optional[int] = None, keep: Optional[str] = None) -> List[str]:
+    """
+    Delete least-recently-used session directories until the session data
+    fits in the budget, never the `keep` session (the one just loaded).
+    Returns the removed paths (relative to CACHE_DIR).
+    """
+    if max_bytes is None:
+        max_bytes = int(CACHE_MAX_MB * 1024 * 1024)
+
+    entries = session_entries()
+    total = sum(e["bytes"] for e in entries)
+    removed = []
+    for e in sorted(entries, key=lambda e: e["last_used"]):
+        if total <= max_bytes:
+            break
+        if e["path"] == keep:
+            continue
+        path = os.path.join(CACHE_DIR, e["path"])
+        shutil.rmtree(path, ignore_errors=True)
+        try:
+            os.rmdir(os.path.dirname(path))     # drop the event folder once empty
+        except OSError:
+            pass
+        total -= e["bytes"]
+        removed.append(e["path"])
+
+    if removed:
+        try:
+            _stats_db().executemany("DELETE FROM sessions WHERE path = ?", [(rel,) for rel in removed])
+        except sqlite3.Error:
+            pass
+    return removed
@@ -0,0 +1,190 @@
+"""
+Head-to-head driver comparison over an arbitrary set of races.
+
+Everything is computed from the columnar lap tables of the selected races
+concatenated into one frame, plus the stored race documents for results and
+strategy — no per-race session loads (races without stored data are skipped),
+no per-driver loops over laps:
+
+    shared laps     clean laps both drivers completed → pivot (race, lap) × driver,
+                    per-pair lap-time deltas
+    stint pace      median fuel-corrected clean-lap time per (driver, compound)
+    results         finish / grid / points per race and who finished ahead
+    strategy        stops and tyre sequence per race, where the drivers differed
+"""
+
+from functools import lru_cache
+from itertools import combinations
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core import lap_store, metrics, track_intel
+from app.core.race_model import clean_laps
+from app.core.race_store import available_rounds, stored_race
+from app.core.standings import driver_points
+
+Race = Tuple[int, int]
+
+
+def resolve_races(
+    season: Optional[int] = None,
+    circuit: Optional[str] = None,
+    races: Optional[Sequence[Race]] = None,
+) -> List[Race]:
+    """The race set: an explicit list, a circuit across seasons, or a season."""
+    if races:
+        return sorted(set(races))
+    if circuit:
+        index = track_intel.refresh()
+        key = index.resolve(circuit)
+        return sorted(index.records.get(key, {})) if key else []
+    if season is not None:
+        return [(season, rnd) for rnd in available_rounds(season)]
+    return []
+
+
+@lru_cache(maxsize=128)
+def _race_laps(season: int, round_number: int) -> Optional[pd.DataFrame]:
+    """
+    Clean laps of the whole field for one race (shared by every comparison).
+    Stored lap tables only — a race without one is skipped, not loaded from FastF1.
+    """
+    table = lap_store.load_lap_table(season, round_number)
+    if table is None:
+        return None
+    return clean_laps(table).assign(Season=season, Round=round_number)
+
+
+def _lap_frame(races: Sequence[Race], drivers: Sequence[str]) -> pd.DataFrame:
+    """Clean laps of the selected drivers in every race, with Season/Round columns."""
+    frames = [f for f in (_race_laps(s, r) for s, r in races) if f is not None]
+    if not frames:
+        return pd.DataFrame(columns=["Season", "Round", "Driver", "LapNumber", "Compound", "seconds", "fuel_corrected"])
+    laps = pd.concat(frames, ignore_index=True)
+    return laps[laps["Driver"].isin(drivers)]
+
+
+def _shared_laps(laps: pd.DataFrame, drivers: Sequence[str]) -> Dict[str, Any]:
+    if laps.empty:
+        return {}
+    wide = laps.pivot_table(index=["Season", "Round", "LapNumber"], columns="Driver", values="seconds", aggfunc="first")
+    out = {}
+    for a, b in combinations(drivers, 2):
+        if a not in wide.columns or b not in wide.columns:
+            continue
+        both = wide[[a, b]].dropna()
+        if both.empty:
+            continue
+        delta = (both[a] - both[b]).to_numpy()
+        per_race = (both[a] - both[b]).groupby(level=["Season", "Round"]).agg(["mean", "size"])
+        out[f"{a}-{b}"] = {
+            "shared_laps":      int(delta.size),
+            "mean_delta_s":     round(float(delta.mean()), 3),       # negative = first driver faster
+            "median_delta_s":   round(float(np.median(delta)), 3),
+            "first_faster_pct": round(float((delta < 0).mean() * 100), 1),
+            "by_race": [
+                {"season": int(s), "round": int(r), "mean_delta_s": round(float(row["mean"]), 3), "laps": int(row["size"])}
+                for (s, r), row in per_race.iterrows()
+            ],
+        }
+    return out
+
+
+def _stint_pace(laps: pd.DataFrame) -> Dict[str, Any]:
+    if laps.empty:
+        return {}
+    g = laps.groupby(["Driver", "Compound"])["fuel_corrected"].agg(["median", "size"])
+    out: Dict[str, Any] = {}
+    for (driver, compound), row in g.iterrows():
+        out.setdefault(driver, {})[compound] = {"median_s": round(float(row["median"]), 3), "laps": int(row["size"])}
+    return out
+
+
+def _results(races: Sequence[Race], drivers: Sequence[str]) -> pd.DataFrame:
+    rows = []
+    for season, rnd in races:
+        doc = stored_race(season, rnd)
+        for d in (doc or {}).get("drivers", []):
+            if d.get("driver_code") in drivers:
+                rows.append({
+                    "season":        season,
+                    "round":         rnd,
+                    "event_name":    doc.get("event_name"),
+                    "driver":        d["driver_code"],
+                    "finish":        d.get("finish"),
+                    "grid":          d.get("grid"),
+                    "points":        driver_points(d),
+                    "stops":         d.get("stops"),
+                    "tyre_sequence": list(d.get("tyre_sequence") or []),
+                })
+    return pd.DataFrame(rows)
+
+
+def compare(drivers: Sequence[str], races: Sequence[Race]) -> Dict[str, Any]:
+    with metrics.timer("analytics", task="head_to_head"):
+        return _compare(tuple(dict.fromkeys(d.upper() for d in drivers)), tuple(sorted(set(races))))
+
+
+@lru_cache(maxsize=64)
+def _compare(drivers: Tuple[str, ...], races: Tuple[Race, ...]) -> Dict[str, Any]:
+    res = _results(races, drivers)
+    laps = _lap_frame(races, drivers)
+
+    summary, head_to_head, strategy = {}, {}, []
+    if not res.empty:
+        # finish may be None, or a float when the document came from Mongo
+        res["finish"] = pd.to_numeric(res["finish"], errors="coerce")
+        res["classified"] = res["finish"].between(1, 98)
+        for driver, g in res.groupby("driver"):
+            fin = g.loc[g["classified"], "finish"].astype(float)
+            summary[driver] = {
+                "races":      int(len(g)),
+                "points":     round(float(g["points"].sum()), 1),
+                "avg_finish": round(float(fin.mean()), 2) if not fin.empty else None,
+                "best_finish": int(fin.min()) if not fin.empty else None,
+                "avg_grid":   round(float(g["grid"].astype(float).mean()), 2),
+                "avg_stops":  round(float(g["stops"].astype(float).mean()), 2),
+            }
+
+        finish = res.pivot_table(index=["season", "round"], columns="driver", values="finish", aggfunc="first")
+        for a, b in combinations(drivers, 2):
+            if a not in finish.columns or b not in finish.columns:
+                continue
+            both = finish[[a, b]].dropna()
+            head_to_head[f"{a}-{b}"] = {
+                "races":              int(len(both)),
+                f"{a}_ahead":         int((both[a] < both[b]).sum()),
+                f"{b}_ahead":         int((both[b] < both[a]).sum()),
+                "mean_finish_delta":  round(float((both[a] - both[b]).mean()), 2) if len(both) else None,
+            }
+
+        for (season, rnd), g in res.groupby(["season", "round"], sort=True):
+            by_driver = {
+                row.driver: {
+                    "stops":         row.stops,
+                    "tyre_sequence": row.tyre_sequence,
+                    "finish":        int(row.finish) if pd.notna(row.finish) else None,
+                }
+                for row in g.itertuples(index=False)
+            }
+            seqs = {tuple(v["tyre_sequence"]) for v in by_driver.values()}
+            stops = {v["stops"] for v in by_driver.values()}
+            strategy.append({
+                "season":        int(season),
+                "round":         int(rnd),
+                "event_name":    g["event_name"].iloc[0],
+                "drivers":       by_driver,
+                "same_strategy": len(seqs) == 1 and len(stops) == 1,
+            })
+
+    return {
+        "drivers":      list(drivers),
+        "races":        [{"season": s, "round": r} for s, r in races],
+        "summary":      summary,
+        "head_to_head": head_to_head,
+        "lap_deltas":   _shared_laps(laps, drivers),
+        "stint_pace":   _stint_pace(laps),
+        "strategy":     strategy,
+    }
@@ -0,0 +1,243 @@
+"""
+Incident timeline.
+
+Safety cars, VSCs, red flags, penalties and retirements for one race as a
+compact, time-ordered event list aligned to lap numbers. Built from race
+control messages, the session's track-status feed (FastF1 only loads it
+with the laps) and the results table — no telemetry or weather — then
+stored as computed_data/<year>/incidents_<round>.json so repeat views never
+touch FastF1.
+
+Track-status samples only carry a session timestamp. They are aligned to
+laps through the race control messages (which carry both a UTC time and a
+lap): the UTC ↔ session-time offset is the median gap between matching
+status changes and messages, and laps are then interpolated over the
+messages' (time, lap) pairs with np.interp.
+"""
+
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core import precomputed_loader
+from app.core.telemetry_source import load_session_parts
+
+# track-status codes → period type ("1" = all clear ends any period)
+_STATUS_PERIODS = {"4": "SC", "5": "RED", "6": "VSC"}
+# message that accompanies each status change (for time alignment)
+_STATUS_MESSAGES = {
+    "4": r"^SAFETY CAR DEPLOYED",
+    "5": r"RED FLAG",
+    "6": r"^VIRTUAL SAFETY CAR DEPLOYED",
+    "1": r"^TRACK CLEAR",
+}
+_PENALTY = re.compile(r"PENALTY", re.I)
+_NOT_PENALTY = re.compile(r"NO FURTHER|UNDER INVESTIGATION|WILL BE INVESTIGATED|NOTED", re.I)
+_CAR = re.compile(r"CAR (\d+)(?: \((\w{3})\))?")
+_FINISHED = re.compile(r"^(Finished|\+\d+ Laps?|Lapped)$")
+
+
+def _seconds(col: pd.Series) -> np.ndarray:
+    return col.dt.total_seconds().to_numpy(dtype=float)
+
+
+def _messages(session) -> pd.DataFrame:
+    rcm = session.race_control_messages
+    if rcm is None or rcm.empty:
+        return pd.DataFrame(columns=["Time", "Category", "Message", "Flag", "Scope", "RacingNumber", "Lap"])
+    rcm = rcm.copy()
+    for col in ("Category", "Message", "Flag", "Scope", "RacingNumber"):
+        if col not in rcm.columns:
+            rcm[col] = None
+    rcm["Message"] = rcm["Message"].fillna("").astype(str)
+    rcm["Lap"] = pd.to_numeric(rcm.get("Lap"), errors="coerce")
+    return rcm.sort_values("Time").reset_index(drop=True)
+
+
+def _track_status(session) -> pd.DataFrame:
+    try:
+        ts = pd.DataFrame(session.track_status)
+    except Exception:
+        # not loaded / no feed for this session
+        return pd.DataFrame(columns=["Time", "Status"])
+    if ts.empty:
+        return pd.DataFrame(columns=["Time", "Status"])
+    ts["Status"] = ts["Status"].astype(str)
+    return ts.sort_values("Time").reset_index(drop=True)
+
+
+def _status_laps(ts: pd.DataFrame, rcm: pd.DataFrame) -> np.ndarray:
+    """Lap number for every track-status sample (NaN when it can't be aligned)."""
+    laps = np.full(len(ts), np.nan)
+    timed = rcm[rcm["Lap"].notna() & rcm["Time"].notna()]
+    if ts.empty or timed.empty:
+        return laps
+
+    msg_utc = timed["Time"].astype("int64").to_numpy() / 1e9
+    upper = timed["Message"].str.upper()
+
+    # every (status change, matching message) pair votes for an offset;
+    # the real one is where most votes agree (within half a minute)
+    votes = []
+    for code, pattern in _STATUS_MESSAGES.items():
+        status_t = _seconds(ts.loc[ts["Status"] == code, "Time"])
+        cand = msg_utc[upper.str.contains(pattern, regex=True).to_numpy()]
+        if status_t.size and cand.size:
+            votes.append((cand[None, :] - status_t[:, None]).ravel())
+    if not votes:
+        return laps
+    votes = np.concatenate(votes)
+    hist, edges = np.histogram(votes, bins=np.arange(votes.min(), votes.max() + 60, 30))
+    centre = edges[np.argmax(hist)] + 15
+    offset = float(np.median(votes[np.abs(votes - centre) <= 30]))
+
+    status_utc = _seconds(ts["Time"]) + offset
+    return np.round(np.interp(status_utc, msg_utc, timed["Lap"].to_numpy(dtype=float)))
+
+
+def _periods(ts: pd.DataFrame, laps: np.ndarray) -> List[Dict[str, Any]]:
+    out, open_ = [], None
+    t = _seconds(ts["Time"]) if not ts.empty else np.array([])
+    for i, code in enumerate(ts["Status"]):
+        kind = _STATUS_PERIODS.get(code)
+        if open_ and (code == "1" or (kind and kind != open_["type"])):
+            open_["end_lap"] = None if np.isnan(laps[i]) else int(laps[i])
+            open_["duration_s"] = round(float(t[i] - open_["_t"]), 1)
+            out.append(open_)
+            open_ = None
+        if kind and open_ is None:
+            open_ = {"type": kind, "lap": None if np.isnan(laps[i]) else int(laps[i]), "_t": float(t[i])}
+    if open_:
+        open_["end_lap"] = None
+        open_["duration_s"] = None
+        out.append(open_)
+    for p in out:
+        p["t"] = round(p.pop("_t"), 1)
+    return out
+
+
+def _codes(results: pd.DataFrame) -> Dict[str, str]:
+    if results is None or results.empty:
+        return {}
+    return dict(zip(results["DriverNumber"].astype(str), results["Abbreviation"].astype(str)))
+
+
+def _penalties(rcm: pd.DataFrame, codes: Dict[str, str]) -> List[Dict[str, Any]]:
+    out = []
+    for row in rcm.itertuples(index=False):
+        msg = row.Message
+        if not _PENALTY.search(msg) or _NOT_PENALTY.search(msg):
+            continue
+        m = _CAR.search(msg)
+        driver = (m.group(2) or codes.get(m.group(1))) if m else None
+        out.append({
+            "type":   "PENALTY",
+            "lap":    None if pd.isna(row.Lap) else int(row.Lap),
+            "driver": driver,
+            "text":   msg,
+        })
+    return out
+
+
+def _retirements(results: pd.DataFrame) -> List[Dict[str, Any]]:
+    if results is None or results.empty or "Status" not in results.columns:
+        return []
+    out = []
+    for row in results.itertuples(index=False):
+        status = str(row.Status or "")
+        if not status or _FINISHED.match(status):
+            continue
+        laps = getattr(row, "Laps", None)
+        out.append({
+            "type":   "RETIREMENT",
+            "lap":    int(laps) + 1 if pd.notna(laps) else None,
+            "driver": str(row.Abbreviation),
+            "text":   status,
+        })
+    return out
+
+
+def build_timeline(year: int, round_number: int) -> Dict[str, Any]:
+    session = load_session_parts(year, round_number, laps=True, messages=True)
+    rcm = _messages(session)
+    ts = _track_status(session)
+    codes = _codes(session.results)
+
+    periods = _periods(ts, _status_laps(ts, rcm))
+    if ts.empty:
+        # no status feed: fall back to the deployment messages themselves
+        for row in rcm.itertuples(index=False):
+            msg = row.Message.upper()
+            kind = (
+                "VSC" if msg.startswith("VIRTUAL SAFETY CAR DEPLOYED") else
+                "SC" if msg.startswith("SAFETY CAR DEPLOYED") else
+                "RED" if str(row.Flag).upper() == "RED" else None
+            )
+            if kind:
+                periods.append({"type": kind, "lap": None if pd.isna(row.Lap) else int(row.Lap)})
+
+    events = periods + _penalties(rcm, codes) + _retirements(session.results)
+    events.sort(key=lambda e: (e["lap"] is None, e["lap"] or 0))
+
+    flags = rcm["Flag"].fillna("").astype(str).str.upper()
+    summary = {
+        "safety_car_count": sum(e["type"] == "SC" for e in events),
+        "vsc_count":        sum(e["type"] == "VSC" for e in events),
+        "red_flags":        sum(e["type"] == "RED" for e in events),
+        "yellow_flags":     int(flags.isin(["YELLOW", "DOUBLE YELLOW"]).sum()),
+        "penalties":        sum(e["type"] == "PENALTY" for e in events),
+        "retirements":      sum(e["type"] == "RETIREMENT" for e in events),
+    }
+    return {
+        "season":  year,
+        "round":   round_number,
+        **summary,
+        # drop empty fields — the list is what the client downloads per race
+        "events":  [{k: v for k, v in e.items() if v is not None} for e in events],
+    }
+
+
+# ---------------------------
+# Persistence (computed_data/<year>/incidents_<round>.json)
+# ---------------------------
+
+def _path(year: int, round_number: int) -> str:
+    return os.path.join(precomputed_loader.DATA_DIR, str(year), f"incidents_{round_number}.json")
+
+
+def save_timeline(year: int, round_number: int, timeline: Dict[str, Any]):
+    path = _path(year, round_number)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(timeline, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def timeline_mtime(year: int, round_number: int) -> Optional[float]:
+    try:
+        return os.path.getmtime(_path(year, round_number))
+    except OSError:
+        return None
+
+
+def get_timeline(year: int, round_number: int) -> Dict[str, Any]:
+    """Stored timeline, extracting (and persisting) it on the first request."""
+    mtime = timeline_mtime(year, round_number)
+    if mtime is not None:
+        return _read_timeline(_path(year, round_number), mtime)
+    timeline = build_timeline(year, round_number)
+    save_timeline(year, round_number, timeline)
+    return timeline
+
+
+@lru_cache(maxsize=64)
+def _read_timeline(path: str, mtime: float) -> Dict[str, Any]:
+    # keyed by mtime, so a re-extracted timeline is re-read
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,143 @@
+"""
+Columnar lap tables.
+
+A slim, typed copy of `session.laps` per race, persisted next to the race
+documents as computed_data/<year>/laps/race_<round>.parquet, so season-wide
+analytics (tyre models, pace indices, comparisons) read a few MB of columns
+instead of loading FastF1 sessions.
+
+Times are float seconds; column names follow FastF1 so helpers written for
+`session.laps` (e.g. race_model.clean_laps) work on either.
+"""
+
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core import precomputed_loader
+
+LAP_COLUMNS = {
+    "Driver":      "string",
+    "Team":        "string",
+    "LapNumber":   "int16",
+    "Stint":       "float32",
+    "Compound":    "string",
+    "TyreLife":    "float32",
+    "LapTime":     "float64",
+    "Sector1Time": "float64",
+    "Sector2Time": "float64",
+    "Sector3Time": "float64",
+    "PitInTime":   "float64",
+    "PitOutTime":  "float64",
+    "Time":        "float64",
+    "TrackStatus": "string",
+    "Position":    "float32",
+}
+# race documents mark the scale of drivers' consistency_index with this;
+# older precomputed documents stored the lap-time std in seconds instead
+CONSISTENCY_SCALE = "score_0_100"
+
+_TIME_COLUMNS = ("LapTime", "Sector1Time", "Sector2Time", "Sector3Time", "PitInTime", "PitOutTime", "Time")
+
+
+def _path(year: int, round_number: int) -> str:
+    return os.path.join(precomputed_loader.DATA_DIR, str(year), "laps", f"race_{round_number}.parquet")
+
+
+def lap_table_from_laps(laps: pd.DataFrame) -> pd.DataFrame:
+    """FastF1 Laps → slim typed DataFrame (missing columns become nulls)."""
+    out = {}
+    n = len(laps)
+    for col, dtype in LAP_COLUMNS.items():
+        if col not in laps.columns:
+            out[col] = pd.Series([None] * n if dtype == "string" else np.full(n, np.nan)).astype(dtype)
+            continue
+        s = laps[col].reset_index(drop=True)
+        if col in _TIME_COLUMNS and hasattr(s, "dt"):
+            s = s.dt.total_seconds()
+        if col == "LapNumber":
+            s = s.fillna(0)
+        out[col] = s.astype(dtype)
+    return pd.DataFrame(out)
+
+
+def save_lap_table(year: int, round_number: int, table: pd.DataFrame):
+    path = _path(year, round_number)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    table.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def table_mtime(year: int, round_number: int) -> Optional[float]:
+    try:
+        return os.path.getmtime(_path(year, round_number))
+    except OSError:
+        return None
+
+
+def load_lap_table(year: int, round_number: int) -> Optional[pd.DataFrame]:
+    """Persisted lap table, or None when the race hasn't been stored yet."""
+    mtime = table_mtime(year, round_number)
+    if mtime is None:
+        return None
+    return _read_table(_path(year, round_number), mtime)
+
+
+@lru_cache(maxsize=64)
+def _read_table(path: str, mtime: float) -> pd.DataFrame:
+    # keyed by mtime, so a rewritten table is re-read
+    return pd.read_parquet(path)
+
+
+def get_lap_table(year: int, round_number: int) -> pd.DataFrame:
+    """Lap table from disk, building (and persisting) it from FastF1 on a miss."""
+    table = load_lap_table(year, round_number)
+    if table is not None:
+        return table
+    from app.core.telemetry_source import load_session_parts
+    session = load_session_parts(year, round_number, laps=True)
+    if session.laps is None or session.laps.empty:
+        raise LookupError("No lap data available for this race.")
+    table = lap_table_from_laps(session.laps)
+    save_lap_table(year, round_number, table)
+    return table
+
+
+def stored_rounds(year: int) -> List[int]:
+    folder = os.path.join(precomputed_loader.DATA_DIR, str(year), "laps")
+    if not os.path.isdir(folder):
+        return []
+    return sorted(
+        int(name[len("race_"):-len(".parquet")])
+        for name in os.listdir(folder)
+        if name.startswith("race_") and name.endswith(".parquet")
+    )
+
+
+def season_lap_table(year: int, rounds: Optional[List[int]] = None) -> pd.DataFrame:
+    """Every stored race of a season in one frame, with a `Round` column."""
+    frames = []
+    for rnd in rounds or stored_rounds(year):
+        table = load_lap_table(year, rnd)
+        if table is not None and not table.empty:
+            frames.append(table.assign(Round=np.int16(rnd)))
+    if not frames:
+        return pd.DataFrame(columns=list(LAP_COLUMNS) + ["Round"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def consistency_scores(table: pd.DataFrame) -> Dict[str, int]:
+    """
+    Per-driver consistency index, 0–100 (higher = more consistent): 100 minus
+    ten times the lap-time coefficient of variation in %. Same scale as the
+    race documents' consistency_index.
+    """
+    timed = table[table["LapTime"].notna()]
+    g = timed.groupby("Driver")["LapTime"].agg(["mean", "std", "size"])
+    g = g[(g["size"] > 3) & (g["mean"] > 0)]
+    score = (100 - g["std"] / g["mean"] * 100 * 10).clip(0, 100).round()
+    return {str(code): int(v) for code, v in score.items()}
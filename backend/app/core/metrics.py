@@ -0,0 +1,218 @@
+"""
+In-process metrics in Prometheus text format.
+
+A deliberately small implementation (counters + fixed-bucket histograms, one
+lock each, bisect per observation) so instrumenting hot paths costs a few
+microseconds per observation:
+
+    MetricsMiddleware          per-route latency / response size histograms
+    timer("session_load")      named timers (session loads, analytics, serialization)
+    count("...")               named counters
+
+Cache layers are not counted on the hot path; they are read when /metrics is
+scraped: every functools.lru_cache in app.*, the race store tiers, the shared
+cache and the FastF1 disk cache.
+"""
+
+import bisect
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: Labels, extra: Labels = ()) -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in labels + extra]
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name, self.help = name, help
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            out += [f"{self.name}{_labels(k)} {v:g}" for k, v in sorted(self._values.items())]
+        return out
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.name, self.help = name, help
+        self.buckets = tuple(buckets)
+        self._series: Dict[Labels, List[float]] = {}     # bucket counts..., +Inf count, sum
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            s = self._series.get(key)
+            if s is None:
+                s = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            s[i] += 1
+            s[-1] += value
+
+    def render(self) -> List[str]:
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = [(k, list(s)) for k, s in sorted(self._series.items())]
+        for key, s in series:
+            cumulative = 0.0
+            for bound, n in zip(self.buckets, s):
+                cumulative += n
+                out.append(f"{self.name}_bucket{_labels(key, (('le', f'{bound:g}'),))} {cumulative:g}")
+            cumulative += s[-2]
+            out.append(f"{self.name}_bucket{_labels(key, (('le', '+Inf'),))} {cumulative:g}")
+            out.append(f"{self.name}_sum{_labels(key)} {s[-1]:.6f}")
+            out.append(f"{self.name}_count{_labels(key)} {cumulative:g}")
+        return out
+
+
+http_latency = Histogram("strathub_http_request_duration_seconds", "HTTP request latency by route")
+http_size = Histogram("strathub_http_response_size_bytes", "HTTP response body size by route", SIZE_BUCKETS)
+timers = Histogram("strathub_timer_seconds", "Named timers: session loads, analytics, serialization")
+counters = Counter("strathub_events_total", "Named counters")
+
+
+@contextmanager
+def timer(name: str, **labels):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        timers.observe(time.perf_counter() - t0, name=name, **labels)
+
+
+def count(name: str, amount: float = 1.0, **labels):
+    counters.inc(amount, name=name, **labels)
+
+
+# ---------------------------
+# ASGI middleware
+# ---------------------------
+
+class MetricsMiddleware:
+    """Latency (until the last body chunk) and response size per route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        t0 = time.perf_counter()
+        state = {"status": 500, "bytes": 0}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                state["bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            # route templates keep label cardinality bounded; unmatched paths share one label
+            path = getattr(route, "path", None) or "unmatched"
+            http_latency.observe(time.perf_counter() - t0, method=scope["method"], route=path, status=str(state["status"]))
+            http_size.observe(state["bytes"], route=path)
+
+
+# ---------------------------
+# Cache layers (read at scrape time)
+# ---------------------------
+
+def _lru_caches() -> Iterable[Tuple[str, object]]:
+    seen = set()
+    for mod_name, mod in list(sys.modules.items()):
+        if not mod_name.startswith("app.") or mod is None:
+            continue
+        for attr, fn in list(vars(mod).items()):
+            if callable(fn) and hasattr(fn, "cache_info") and getattr(fn, "__module__", None) == mod_name:
+                if id(fn) not in seen:
+                    seen.add(id(fn))
+                    yield f"{mod_name.rsplit('.', 1)[-1]}.{attr}", fn
+
+
+def _gauge(name: str, help: str, samples: List[Tuple[Labels, Optional[float]]], kind: str = "gauge") -> List[str]:
+    out = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+    out += [f"{name}{_labels(k)} {v:g}" for k, v in samples if v is not None]
+    return out
+
+
+def cache_metrics() -> List[str]:
+    hits, misses, size, maxsize = [], [], [], []
+    for name, fn in sorted(_lru_caches()):
+        try:
+            info = fn.cache_info()
+        except Exception:
+            continue
+        key = (("cache", name),)
+        hits.append((key, info.hits))
+        misses.append((key, info.misses))
+        size.append((key, info.currsize))
+        maxsize.append((key, info.maxsize))
+    out = (
+        _gauge("strathub_lru_hits_total", "functools.lru_cache hits", hits, "counter")
+        + _gauge("strathub_lru_misses_total", "functools.lru_cache misses", misses, "counter")
+        + _gauge("strathub_lru_entries", "functools.lru_cache current size", size)
+        + _gauge("strathub_lru_max_entries", "functools.lru_cache max size", maxsize)
+    )
+
+    from app.core.race_store import race_store
+    tiers = race_store.stats()
+    for field, kind in (("hits", "counter"), ("misses", "counter"), ("errors", "counter"), ("writes", "counter")):
+        out += _gauge(f"strathub_race_store_{field}_total", f"Race store tier {field}",
+                      [((("tier", t["tier"]),), t[field]) for t in tiers], kind)
+    out += _gauge("strathub_race_store_avg_latency_seconds", "Race store tier mean lookup latency",
+                  [((("tier", t["tier"]),), t["avg_latency_ms"] / 1000 if t["avg_latency_ms"] is not None else None)
+                   for t in tiers])
+
+    from app.core.shared_cache import get_shared_cache
+    shared = get_shared_cache()
+    if shared:
+        try:
+            s = shared.stats()
+            out += _gauge("strathub_shared_cache_hits_total", "Shared cache hits", [((), s["hits"])], "counter")
+            out += _gauge("strathub_shared_cache_misses_total", "Shared cache misses", [((), s["misses"])], "counter")
+            out += _gauge("strathub_shared_cache_evictions_total", "Shared cache evictions", [((), s["evictions"])], "counter")
+            out += _gauge("strathub_shared_cache_bytes", "Shared cache size", [((), s["bytes"])])
+            out += _gauge("strathub_shared_cache_entries", "Shared cache entries", [((), s["entries"])])
+        except Exception:
+            pass
+
+    from app.core import fastf1_cache
+    f = fastf1_cache.counters()
+    out += _gauge("strathub_fastf1_cache_hits_total", "FastF1 session loads served from disk", [((), f["hits"])], "counter")
+    out += _gauge("strathub_fastf1_cache_misses_total", "FastF1 session loads that hit the network", [((), f["misses"])], "counter")
+    return out
+
+
+def render() -> str:
+    lines: List[str] = []
+    for metric in (http_latency, http_size, timers, counters):
+        lines += metric.render()
+    lines += cache_metrics()
+    return "\n".join(lines) + "\n"
@@ -1,39 +1,92 @@
-from app.db.mongo import db
+import os
 from functools import lru_cache
 
+from app.core.shared_cache import shared_cached
+from app.db.mongo import db, async_db
+
+# how long a Mongo read is reused by the other workers on the host
+MONGO_SHARED_TTL_S = float(os.getenv("MONGO_SHARED_TTL_S", "600"))
+
+
+_RACE_LIST_PROJECTION = {
+    "_id": 0,
+    "round": 1,
+    "event_name": 1,
+    "location": 1,
+}
+
 # -------------------------
-# FAST: seasons list
+# Uncached queries (the race store caches above these itself)
 # -------------------------
-@lru_cache(maxsize=1)
-def list_seasons():
+def query_seasons():
     return sorted(
         db.races.distinct("season"),
         reverse=True
     )
 
-# -------------------------
-# FAST: races list (LIGHT)
-# -------------------------
-@lru_cache(maxsize=32)
-def list_races(year: int):
+
+def query_races(year: int):
     return list(
         db.races.find(
             {"season": year},
-            {
-                "_id": 0,
-                "round": 1,
-                "event_name": 1,
-                "location": 1,
-            }
+            _RACE_LIST_PROJECTION
         ).sort("round", 1)
     )
 
+
+def query_race(year: int, round_number: int):
+    return db.races.find_one(
+        {"season": year, "round": round_number},
+        {"_id": 0}
+    )
+
+# -------------------------
+# FAST: seasons list
+# -------------------------
+@lru_cache(maxsize=1)
+@shared_cached(lambda: "mongo:seasons", ttl=MONGO_SHARED_TTL_S)
+def list_seasons():
+    return query_seasons()
+
+# -------------------------
+# FAST: races list (LIGHT)
+# -------------------------
+@lru_cache(maxsize=32)
+@shared_cached(lambda year: f"mongo:races:{year}", ttl=MONGO_SHARED_TTL_S)
+def list_races(year: int):
+    return query_races(year)
+
 # -------------------------
 # FULL race (ONLY when opened)
 # -------------------------
 @lru_cache(maxsize=128)
+@shared_cached(lambda year, round_number: f"mongo:race:{year}:{round_number}", ttl=MONGO_SHARED_TTL_S)
 def load_race(year: int, round_number: int):
-    return db.races.find_one(
+    return query_race(year, round_number)
+
+
+# =========================
+# ASYNC (Motor) variants — same results, awaited on the event loop.
+# Uncached: the race store caches above them.
+# =========================
+
+async def list_seasons_async():
+    return sorted(
+        await async_db.races.distinct("season"),
+        reverse=True
+    )
+
+
+async def list_races_async(year: int):
+    cursor = async_db.races.find(
+        {"season": year},
+        _RACE_LIST_PROJECTION
+    ).sort("round", 1)
+    return await cursor.to_list(length=None)
+
+
+async def load_race_async(year: int, round_number: int):
+    return await async_db.races.find_one(
         {"season": year, "round": round_number},
         {"_id": 0}
     )
@@ -3,7 +3,8 @@ import os
 from functools import lru_cache
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-DATA_DIR = os.path.join(BASE_DIR, "computed_data")
+# read at call time (precomputed_loader.DATA_DIR), never copied on import
+DATA_DIR = os.getenv("F1_DATA_DIR", os.path.join(BASE_DIR, "computed_data"))
 
 
 # ---------------------------
@@ -37,4 +38,52 @@ def load_race(year: int, round_number: int):
     if not os.path.exists(path):
         return None
     with open(path, "r") as f:
-        return json.load(f)
\ No newline at end of file
+        return json.load(f)
+
+
+# ---------------------------
+# FAST: when a race file was last written (None when there is none)
+# ---------------------------
+def race_mtime(year: int, round_number: int):
+    try:
+        return os.path.getmtime(os.path.join(DATA_DIR, str(year), f"race_{round_number}.json"))
+    except OSError:
+        return None
+
+
+# ---------------------------
+# WRITE-BACK: persist a race document (atomic replace)
+# ---------------------------
+def save_race(year: int, round_number: int, doc: dict):
+    season_dir = os.path.join(DATA_DIR, str(year))
+    os.makedirs(season_dir, exist_ok=True)
+    path = os.path.join(season_dir, f"race_{round_number}.json")
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(doc, f)
+    os.replace(tmp, path)
+
+
+# ---------------------------
+# FAST: which rounds are on disk (no JSON parsing)
+# ---------------------------
+def stored_rounds(year: int):
+    season_dir = os.path.join(DATA_DIR, str(year))
+    if not os.path.isdir(season_dir):
+        return []
+    return sorted(
+        int(name[len("race_"):-len(".json")])
+        for name in os.listdir(season_dir)
+        if name.startswith("race_") and name.endswith(".json") and name[len("race_"):-len(".json")].isdigit()
+    )
+
+
+# ---------------------------
+# FAST: season metadata written by precompute (e.g. whether it is complete)
+# ---------------------------
+def load_season_meta(year: int):
+    path = os.path.join(DATA_DIR, str(year), "season.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
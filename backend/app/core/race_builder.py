@@ -0,0 +1,338 @@
+"""
+Live race document builder.
+
+Turns a FastF1 race session into the race document served by
+/seasons/{year}/races/{round} — results + per-driver strategy analytics +
+race-level derived metrics. This is the slowest tier of the race store.
+"""
+
+import math
+import pandas as pd
+
+from app.core import fastf1_cache, lap_store, sector_analysis, strategy_batch, tyre_model
+
+
+# ─── safe converters ──────────────────────────────────────────────────────────
+
+def _str(val, default="—"):
+    if val is None:
+        return default
+    try:
+        if pd.isna(val):
+            return default
+    except (TypeError, ValueError):
+        pass
+    s = str(val).strip()
+    return s if s not in ("nan", "None", "") else default
+
+
+def _int(val, default=0):
+    if val is None:
+        return default
+    try:
+        f = float(val)
+        return default if math.isnan(f) else int(f)
+    except (TypeError, ValueError):
+        return default
+
+
+def _float(val, default=0.0):
+    if val is None:
+        return default
+    try:
+        f = float(val)
+        return default if math.isnan(f) else round(f, 2)
+    except (TypeError, ValueError):
+        return default
+
+
+# ─── per-driver lap analytics ─────────────────────────────────────────────────
+
+def _driver_lap_stats(session, driver_code: str):
+    """
+    Returns stops, tyre_sequence, longest_stint, consistency_index,
+    tyre_degradation_index, pit_efficiency for one driver.
+    Falls back gracefully when lap data is unavailable.
+    """
+    defaults = {
+        "stops": 1,
+        "tyre_sequence": ["UNKNOWN"],
+        "longest_stint": 0,
+        "consistency_index": None,
+        "tyre_degradation_index": 50,
+        "pit_efficiency": "Nominal",
+    }
+    try:
+        laps = session.laps.pick_drivers(driver_code)
+        if laps is None or laps.empty:
+            return defaults
+
+        # ── Stints ──────────────────────────────────────────────────────
+        stint_col = "Stint" if "Stint" in laps.columns else None
+        compound_col = "Compound" if "Compound" in laps.columns else None
+
+        if stint_col:
+            stint_groups = laps.groupby(stint_col, sort=True)
+            stint_list = []
+            for _, slaps in stint_groups:
+                compound = "UNKNOWN"
+                if compound_col:
+                    c = slaps[compound_col].dropna()
+                    if not c.empty:
+                        compound = _str(c.iloc[0], "UNKNOWN")
+                stint_list.append({
+                    "laps": len(slaps),
+                    "compound": compound,
+                })
+            stops = max(0, len(stint_list) - 1)
+            tyre_seq = [s["compound"] for s in stint_list]
+            longest_stint = max((s["laps"] for s in stint_list), default=0)
+        else:
+            stops = 1
+            tyre_seq = ["UNKNOWN"]
+            longest_stint = len(laps)
+
+        total_laps = len(laps)
+
+        # ── Consistency index (0–100; higher = more consistent) ──────────
+        consistency_index = None
+        if "LapTime" in laps.columns:
+            valid = laps.dropna(subset=["LapTime"])
+            if len(valid) > 3:
+                secs = valid["LapTime"].dt.total_seconds()
+                mean_lt = secs.mean()
+                std_lt  = secs.std()
+                if mean_lt > 0:
+                    cv = (std_lt / mean_lt) * 100       # coefficient of variation
+                    consistency_index = max(0, min(100, round(100 - cv * 10)))
+
+        # ── Tyre degradation index (0–100; higher = better tyre life) ────
+        if total_laps > 0 and longest_stint > 0:
+            tdi = min(100, round((longest_stint / total_laps) * 100))
+        else:
+            tdi = 50
+
+        # ── Pit efficiency (qualitative) ─────────────────────────────────
+        if stops == 0:
+            pit_eff = "Zero-stop"
+        elif stops == 1:
+            pit_eff = "Optimal"
+        elif stops == 2:
+            pit_eff = "Standard"
+        else:
+            pit_eff = "Aggressive"
+
+        return {
+            "stops":                  stops,
+            "tyre_sequence":          tyre_seq,
+            "longest_stint":          longest_stint,
+            "consistency_index":      consistency_index,
+            "tyre_degradation_index": tdi,
+            "pit_efficiency":         pit_eff,
+        }
+
+    except Exception:
+        return defaults
+
+
+# ─── strategy risk & simulation ───────────────────────────────────────────────
+
+def _strategy_risk(driver_stops: int, positions_gained: int, avg_stops: float) -> dict:
+    """Per-driver wrapper over strategy_batch.dashboard_risk."""
+    out = strategy_batch.dashboard_risk(driver_stops, positions_gained, avg_stops)
+    return {"risk_score": strategy_batch.py(out["risk_score"]), "risk_label": str(out["risk_label"])}
+
+
+def _strategy_simulation(
+    driver_stops: int,
+    positions_gained: int,
+    winner_stops: int,
+) -> dict:
+    """Per-driver wrapper over strategy_batch.dashboard_swap."""
+    out = strategy_batch.dashboard_swap(driver_stops, positions_gained, winner_stops)
+    return {"verdict": str(out["verdict"])}
+
+
+# ─── derived race analytics ───────────────────────────────────────────────────
+
+def _derive_race_meta(drivers_data: list) -> dict:
+    """Build winning_recipe and style_profile from processed driver list."""
+    if not drivers_data:
+        return {
+            "winning_recipe": {
+                "typical_stops": 1,
+                "common_tyre_sequence": "MEDIUM → HARD",
+                "avg_longest_stint": 0,
+            },
+            "style_profile": ["Strategy Circuit"],
+        }
+
+    winner = drivers_data[0]
+    top5   = drivers_data[:5]
+
+    # winning recipe
+    winner_seq = winner.get("tyre_sequence", [])
+    common_tyre_sequence = " → ".join(winner_seq) if winner_seq else "N/A"
+    avg_longest_stint = round(
+        sum(d.get("longest_stint", 0) for d in top5) / len(top5)
+    )
+
+    # style profile tags
+    all_stops = [d["stops"] for d in drivers_data]
+    avg_stops = sum(all_stops) / len(all_stops) if all_stops else 1
+
+    all_gained = [d["positions_gained"] for d in drivers_data]
+    avg_gained = sum(all_gained) / len(all_gained) if all_gained else 0
+
+    tags = []
+    if avg_stops >= 2.5:
+        tags.append("High Degradation")
+    elif avg_stops <= 1.2:
+        tags.append("Low Degradation")
+    else:
+        tags.append("Medium Degradation")
+
+    if avg_gained > 1.0:
+        tags.append("High Overtaking")
+    else:
+        tags.append("Track Position Circuit")
+
+    if avg_longest_stint >= 30:
+        tags.append("Long Stints")
+    elif avg_longest_stint <= 15:
+        tags.append("Short Stints")
+
+    tags.append("Strategy Sensitive" if avg_stops > 2 else "Execution Focused")
+
+    return {
+        "winning_recipe": {
+            "typical_stops":        _int(winner["stops"]),
+            "common_tyre_sequence": common_tyre_sequence,
+            "avg_longest_stint":    avg_longest_stint,
+        },
+        "style_profile": tags,
+    }
+
+
+# ─── race document ────────────────────────────────────────────────────────────
+
+def build_race(year: int, round_number: int) -> dict:
+    """
+    Full race data — results + per-driver strategy analytics + race-level derived metrics.
+    Shape matches the new RaceDashboard frontend exactly.
+
+    Raises LookupError when the session has no results.
+    """
+
+    # ── Load session (with laps for strategy analytics) ────────────────────
+    session = fastf1_cache.load_session(year, round_number, "R", laps=True, telemetry=False, weather=False)
+
+    # ── Event metadata ──────────────────────────────────────────────────────
+    event      = session.event
+    event_name = _str(event.get("EventName"), "Grand Prix")
+    location   = _str(event.get("Location"),  "—")
+    date       = str(event.get("EventDate", ""))[:10]
+
+    # ── Results DataFrame ───────────────────────────────────────────────────
+    results_df = session.results
+    if results_df is None or results_df.empty:
+        raise LookupError("No race results found for this session.")
+
+    cols = set(results_df.columns)
+
+    # ── Fitted tyre degradation (falls back to the stint-length heuristic) ─
+    try:
+        lap_table = lap_store.lap_table_from_laps(session.laps)
+    except Exception:
+        lap_table = None
+    try:
+        fitted_tdi = tyre_model.driver_indices(lap_table) if lap_table is not None else {}
+    except Exception:
+        fitted_tdi = {}
+    # ── Whole-field sector analysis (independent of the tyre fit) ──────────
+    try:
+        sectors = sector_analysis.analyze(lap_table) if lap_table is not None else {}
+    except Exception:
+        sectors = {}
+
+    # average stops — computed after lap stats, needed for risk scoring
+    raw_drivers = []
+    for _, row in results_df.iterrows():
+        pos_raw  = row.get("Position") if "Position" in cols else None
+        if pos_raw is None or (isinstance(pos_raw, float) and math.isnan(pos_raw)):
+            pos_raw = row.get("ClassifiedPosition")
+
+        finish   = _int(pos_raw, 99)
+        grid     = _int(row.get("GridPosition") if "GridPosition" in cols else None, 0)
+        abbr     = _str(row.get("Abbreviation") if "Abbreviation"  in cols else None, "???")
+        name     = _str(row.get("FullName")      if "FullName"      in cols else None, abbr)
+        team     = _str(row.get("TeamName")      if "TeamName"      in cols else None, "Unknown")
+        status   = _str(row.get("Status")        if "Status"        in cols else None, "Finished")
+        points   = _float(row.get("Points")      if "Points"        in cols else None, 0.0)
+        pos_gain = (grid - finish) if grid > 0 else 0
+
+        lap_stats = _driver_lap_stats(session, abbr)
+        if abbr in fitted_tdi:
+            lap_stats["tyre_degradation_index"] = fitted_tdi[abbr]
+
+        raw_drivers.append({
+            "driver_code":            abbr,
+            "driver_name":            name,
+            "team":                   team,
+            "finish":                 finish,
+            "grid":                   grid,
+            "status":                 status,
+            "points":                 points,
+            "positions_gained":       pos_gain,
+            **lap_stats,
+        })
+
+    # sort by finish
+    raw_drivers.sort(key=lambda d: d["finish"])
+
+    # ── Risk & simulation for the whole field in one batched call ──────────
+    field = strategy_batch.field_arrays([{"drivers": raw_drivers}])
+    scored = strategy_batch.score_field(
+        field["stops"], field["longest_stint"], field["positions_gained"],
+        field["tyre_codes"], finish=field["finish"], rules="dashboard",
+    )
+
+    # ── Enrich with risk & simulation ──────────────────────────────────────
+    drivers_out = []
+    for i, d in enumerate(raw_drivers):
+        drivers_out.append({
+            "driver_code":            d["driver_code"],
+            "driver_name":            d["driver_name"],
+            "team":                   d["team"],
+            "finish":                 d["finish"],
+            "grid":                   d["grid"],
+            "status":                 d["status"],
+            "points":                 d["points"],
+            "positions_gained":       d["positions_gained"],
+            "stops":                  d["stops"],
+            "tyre_sequence":          d["tyre_sequence"],
+            "longest_stint":          d["longest_stint"],
+            "tyre_degradation_index": d["tyre_degradation_index"],
+            "pit_efficiency":         d["pit_efficiency"],
+            "consistency_index":      d["consistency_index"],
+            "strategy_risk":          {
+                "risk_score": strategy_batch.py(scored["risk_score"][i]),
+                "risk_label": str(scored["risk_label"][i]),
+            },
+            "strategy_simulation":    {"verdict": str(scored["verdict"][i])},
+        })
+
+    derived = _derive_race_meta(drivers_out)
+
+    return {
+        "season":     year,
+        "round":      round_number,
+        "event_name": event_name,
+        "location":   location,
+        "date":       date,
+        "drivers":    drivers_out,
+        "winner":     drivers_out[0] if drivers_out else None,
+        "derived":    derived,
+        "sector_analysis": sectors,
+        "consistency_scale": lap_store.CONSISTENCY_SCALE,
+    }
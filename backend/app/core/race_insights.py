@@ -0,0 +1,278 @@
+"""
+Race insights, one section at a time.
+
+Every section is computed from the cheapest source that has its data and is
+cached on its own (process LRU → shared cache, keyed by the mtimes of the
+stored race files so a re-precomputed race is never served stale), so a request for the weather
+card never loads laps and the pit card never loads weather:
+
+    pit_strategy   lap table (lap_store)
+    sectors        sector analysis on the race document (lap table fallback)
+    weather        FastF1 weather data only
+    incidents      incident timeline (race control messages + track status only)
+    event_info     FastF1 results only
+    telemetry      FastF1 laps + car data (the only section that needs telemetry)
+    track_profile  race document + track_intel index (not cached, always current)
+    winner         race document
+    ai_performance race document + driver_index ratings (not cached)
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core import driver_index, lap_store, metrics, precomputed_loader, track_intel
+from app.core.incidents import get_timeline, timeline_mtime
+from app.core.race_model import clean_laps, estimate_pit_loss, stint_table
+from app.core.race_store import get_race
+from app.core.sector_analysis import get_sector_analysis
+from app.core.shared_cache import get_shared_cache, insights_key
+from app.core.telemetry_source import load_session_parts, load_telemetry_session
+
+PIT_LANE_RANGE_S = (10.0, 60.0)
+FASTEST_STOP_S = 2.0
+
+# read from in-memory indexes that keep growing — cheap, so never cached
+_UNCACHED_SECTIONS = {"track_profile", "ai_performance"}
+
+
+def _r(value, digits: int = 2) -> Optional[float]:
+    return round(float(value), digits) if value is not None and np.isfinite(value) else None
+
+
+def _hms(seconds: Optional[float]) -> Optional[str]:
+    if seconds is None or not np.isfinite(seconds):
+        return None
+    s = int(round(seconds))
+    return f"{s // 3600}:{s % 3600 // 60:02d}:{s % 60:02d}"
+
+
+# ===========================
+# SECTIONS
+# ===========================
+
+def pit_strategy(year: int, round_number: int) -> Dict[str, Any]:
+    table = lap_store.get_lap_table(year, round_number)
+
+    # pit-lane time: PitInTime on lap n → PitOutTime on lap n + 1
+    ins = table.loc[table["PitInTime"].notna(), ["Driver", "LapNumber", "PitInTime"]]
+    outs = table.loc[table["PitOutTime"].notna(), ["Driver", "LapNumber", "PitOutTime"]]
+    stops = ins.merge(outs.assign(LapNumber=outs["LapNumber"] - 1), on=["Driver", "LapNumber"])
+    lane = (stops["PitOutTime"] - stops["PitInTime"]).to_numpy(dtype=float)
+    lane = lane[(lane >= PIT_LANE_RANGE_S[0]) & (lane <= PIT_LANE_RANGE_S[1])]
+
+    stints = stint_table(table)
+    sequences = {
+        str(driver): " → ".join(g.sort_values("Stint")["Compound"])
+        for driver, g in stints.groupby("Driver", sort=True)
+    }
+    per_driver = stints.groupby("Driver").size() - 1
+
+    # FastF1 has no stationary times: each stop's is estimated as its pit-lane
+    # time over the race's quickest pass, taken to be a FASTEST_STOP_S stop
+    stationary = lane - lane.min() + FASTEST_STOP_S if lane.size else lane
+
+    return {
+        "avg_pit_lane_time":  _r(lane.mean()) if lane.size else None,           # measured, entry → exit
+        "fastest_pit_lane_time": _r(lane.min()) if lane.size else None,
+        "est_stationary_time": _r(stationary.mean()) if lane.size else None,    # not measured, see above
+        "estimated":          True,                                             # flags est_stationary_time
+        "total_pitstops":     int(len(stops)),
+        "pit_loss_avg":       _r(estimate_pit_loss(table, clean_laps(table))),
+        "stops_distribution": {str(k): int(v) for k, v in per_driver.value_counts().sort_index().items()},
+        "tyre_sequences":     sequences,
+    }
+
+
+def sectors(year: int, round_number: int) -> Dict[str, Any]:
+    # field-wide part of the stored sector analysis
+    return get_sector_analysis(year, round_number).get("field", {})
+
+
+def weather(year: int, round_number: int) -> Dict[str, Any]:
+    w = load_session_parts(year, round_number, laps=False, weather=True).weather_data
+    if w is None or w.empty:
+        return {}
+    return {
+        "air_temp":       _r(w["AirTemp"].mean(), 1),
+        "track_temp":     _r(w["TrackTemp"].mean(), 1),
+        "track_temp_min": _r(w["TrackTemp"].min(), 1),
+        "track_temp_max": _r(w["TrackTemp"].max(), 1),
+        "humidity":       _r(w["Humidity"].mean(), 0),
+        "wind_speed":     _r(w["WindSpeed"].mean(), 1),
+        "rainfall":       bool(w["Rainfall"].astype(bool).any()),
+    }
+
+
+def incidents(year: int, round_number: int) -> Dict[str, Any]:
+    # counts from the stored incident timeline (messages + track status only)
+    timeline = get_timeline(year, round_number)
+    return {k: v for k, v in timeline.items() if k not in ("season", "round", "events")}
+
+
+def event_info(year: int, round_number: int) -> Dict[str, Any]:
+    session = load_session_parts(year, round_number, laps=False)
+    event, results = session.event, session.results
+    out = {
+        "event_name": str(event.get("EventName", "")),
+        "location":   str(event.get("Location", "")),
+        "country":    str(event.get("Country", "")),
+        "date":       str(event.get("EventDate", ""))[:10],
+        "circuit":    track_intel.circuit_key(str(event.get("Location", ""))),
+    }
+    if results is not None and not results.empty:
+        winner = results[results["Position"] == 1]
+        if not winner.empty and pd.notna(winner["Time"].iloc[0]):
+            out["race_duration"] = _hms(winner["Time"].iloc[0].total_seconds())
+        if "Laps" in results.columns:
+            out["total_laps"] = int(results["Laps"].max())
+    return out
+
+
+def telemetry(year: int, round_number: int) -> Dict[str, Any]:
+    laps = load_telemetry_session(year, round_number).laps
+    if laps is None or laps.empty:
+        return {}
+    out = {"top_speed": _r(laps["SpeedST"].max(), 0) if "SpeedST" in laps.columns else None}
+
+    fastest = laps.pick_fastest()
+    if fastest is None or pd.isna(fastest.get("LapTime")):
+        return out
+    car = fastest.get_car_data()
+    out.update({
+        "fastest_lap_driver": str(fastest["Driver"]),
+        "fastest_lap_number": int(fastest["LapNumber"]),
+        "fastest_lap_time":   _r(fastest["LapTime"].total_seconds(), 3),
+        "avg_throttle":       _r(car["Throttle"].mean(), 1),
+        "avg_brake":          _r(car["Brake"].astype(float).mean() * 100, 1),
+        "drs_usage_pct":      _r((car["DRS"] >= 10).mean() * 100, 1),
+        "max_rpm":            int(car["RPM"].max()),
+        "avg_gear":           _r(car["nGear"].mean(), 1),
+        "fastest_lap_max_speed": _r(car["Speed"].max(), 0),
+    })
+    return out
+
+
+def track_profile(year: int, round_number: int) -> Dict[str, Any]:
+    doc = get_race(year, round_number)
+    if not doc:
+        return {}
+    record = track_intel.race_record(doc) or {}
+    history = track_intel.get_track(doc.get("location") or doc.get("event_name") or "") or {}
+    signals = record.get("signals", {})
+    gain = record.get("avg_positions_gained")
+    return {
+        "circuit":              track_intel.circuit_key(doc.get("location") or ""),
+        "avg_positions_gained": gain,
+        "overtake_difficulty":  history.get("overtake_difficulty")
+                                or (None if gain is None else "Easy" if gain > 1.5 else "Moderate" if gain >= 0.5 else "Hard"),
+        "degradation_level":    signals.get("degradation_level"),
+        "overtaking_pressure":  signals.get("overtaking_pressure"),
+        "corner_stress":        signals.get("corner_stress"),
+        "style_profile":        record.get("style_profile", []),
+        "history":              history,
+    }
+
+
+def winner(year: int, round_number: int) -> Dict[str, Any]:
+    doc = get_race(year, round_number)
+    return dict(doc.get("winner") or (doc.get("drivers") or [{}])[0]) if doc else {}
+
+
+def ai_performance(year: int, round_number: int) -> Dict[str, Any]:
+    """Per-driver rating (driver index), career DNF rate and the race's strategy verdicts."""
+    doc = get_race(year, round_number)
+    if not doc:
+        return {}
+    index = driver_index.refresh()
+    out = {}
+    for d in doc.get("drivers", []):
+        code = d.get("driver_code")
+        if not code:
+            continue
+        profile = index.profile(code)
+        risk = d.get("strategy_risk") or {}
+        out[code] = {
+            "rating":          driver_index.insight(profile)["rating"] if profile else None,
+            "dnf_probability": round(1 - profile["classified"] / profile["races"], 3)
+                               if profile and profile["races"] else None,
+            "risk_score":      risk.get("risk_score"),
+            "risk_label":      risk.get("risk_label"),
+            "verdict":         (d.get("strategy_simulation") or {}).get("verdict"),
+        }
+    return out
+
+
+SECTIONS = {
+    "pit_strategy":  pit_strategy,
+    "telemetry":     telemetry,
+    "sectors":       sectors,
+    "incidents":     incidents,
+    "weather":       weather,
+    "track_profile": track_profile,
+    "event_info":    event_info,
+    "winner":        winner,
+    "ai_performance": ai_performance,
+}
+# the full page minus telemetry, which is the one section that pulls car data
+DEFAULT_SECTIONS = [s for s in SECTIONS if s != "telemetry"]
+
+
+# ===========================
+# CACHED ACCESS
+# ===========================
+
+def _stamp(year: int, round_number: int) -> str:
+    # changes whenever a stored source of the cached sections is rewritten
+    # (race document, lap table, incident timeline)
+    return "-".join(str(m) for m in (
+        precomputed_loader.race_mtime(year, round_number),
+        lap_store.table_mtime(year, round_number),
+        timeline_mtime(year, round_number),
+    ))
+
+
+def get_section(name: str, year: int, round_number: int) -> Dict[str, Any]:
+    return _section(name, year, round_number, _stamp(year, round_number))
+
+
+@lru_cache(maxsize=512)
+def _section(name: str, year: int, round_number: int, stamp: str) -> Dict[str, Any]:
+    shared = get_shared_cache()
+    key = insights_key(year, round_number, name, stamp)
+    cached = shared.get(key) if shared else None
+    if cached is not None:
+        return cached
+    with metrics.timer("analytics", task=f"insights.{name}"):
+        value = SECTIONS[name](year, round_number)
+    if shared:
+        shared.set(key, value)
+    return value
+
+
+def get_insights(year: int, round_number: int, sections: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Requested sections only. A section that fails is reported under
+    `unavailable` instead of failing the whole page.
+    """
+    names: List[str] = list(sections) if sections else DEFAULT_SECTIONS
+    unknown = [n for n in names if n not in SECTIONS]
+    if unknown:
+        raise ValueError(f"Unknown sections: {', '.join(unknown)} (available: {', '.join(SECTIONS)})")
+
+    out: Dict[str, Any] = {}
+    unavailable: Dict[str, str] = {}
+    for name in names:
+        try:
+            if name in _UNCACHED_SECTIONS:
+                out[name] = SECTIONS[name](year, round_number)
+            else:
+                out[name] = get_section(name, year, round_number)
+        except Exception as e:
+            out[name] = None
+            unavailable[name] = str(e)
+    if unavailable:
+        out["unavailable"] = unavailable
+    return out
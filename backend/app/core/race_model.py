@@ -0,0 +1,251 @@
+"""
+Per-race pace model derived from a session's actual laps.
+
+    lap_time(lap, compound, tyre_age) =
+        base[compound] + deg[compound] * tyre_age - fuel_effect * (lap - 1) + driver_offset
+
+Fitted on clean laps only (no in/out laps, green flag, within 107% of the
+race median). Also estimates pit-lane loss, safety-car likelihood and each
+finisher's actual strategy so the simulator and optimizer can replay the field.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from app.core.telemetry_source import load_session_parts
+
+FUEL_EFFECT_S_PER_LAP = 0.06     # lap time gained per lap of fuel burned
+SLOW_LAP_FACTOR = 1.07           # > 107% of the race median = not representative
+MIN_COMPOUND_LAPS = 8
+DEFAULT_PIT_LOSS_S = 22.0
+
+DRY_COMPOUNDS = ("SOFT", "MEDIUM", "HARD")
+COMPOUNDS = DRY_COMPOUNDS + ("INTERMEDIATE", "WET")
+
+# Fallback pace / degradation relative to the race baseline when a compound
+# was (barely) used in the race, plus a usable tyre life when no stint shows one.
+_DEFAULT_COMPOUNDS = {
+    "SOFT":         {"base": -0.6, "deg": 0.09, "max_stint": 25},
+    "MEDIUM":       {"base":  0.0, "deg": 0.06, "max_stint": 35},
+    "HARD":         {"base":  0.4, "deg": 0.04, "max_stint": 45},
+    "INTERMEDIATE": {"base":  8.0, "deg": 0.05, "max_stint": 40},
+    "WET":          {"base": 14.0, "deg": 0.04, "max_stint": 40},
+}
+MAX_STINT_MARGIN = 1.1
+
+
+# ===========================
+# LAP FRAMES
+# ===========================
+
+def _seconds(col: pd.Series) -> pd.Series:
+    return col.dt.total_seconds() if hasattr(col, "dt") else col.astype(float)
+
+
+def clean_laps(laps: pd.DataFrame) -> pd.DataFrame:
+    """
+    Representative racing laps with fuel-corrected times.
+
+    Columns: Driver, LapNumber, Stint, Compound, TyreLife, seconds, fuel_corrected
+    """
+    df = laps
+    mask = df["LapTime"].notna() & (df["LapNumber"] > 1)
+    if "PitInTime" in df.columns:
+        mask &= df["PitInTime"].isna()
+    if "PitOutTime" in df.columns:
+        mask &= df["PitOutTime"].isna()
+    if "TrackStatus" in df.columns:
+        mask &= df["TrackStatus"].astype(str) == "1"
+    mask &= df["Compound"].isin(COMPOUNDS) & df["TyreLife"].notna()
+
+    out = pd.DataFrame({
+        "Driver":    df.loc[mask, "Driver"].to_numpy(),
+        "LapNumber": df.loc[mask, "LapNumber"].to_numpy(dtype=float),
+        "Stint":     df.loc[mask, "Stint"].to_numpy(dtype=float),
+        "Compound":  df.loc[mask, "Compound"].astype(str).to_numpy(),
+        "TyreLife":  df.loc[mask, "TyreLife"].to_numpy(dtype=float),
+        "seconds":   _seconds(df.loc[mask, "LapTime"]).to_numpy(),
+    })
+    if out.empty:
+        out["fuel_corrected"] = pd.Series(dtype=float)
+        return out
+
+    out = out[out["seconds"] <= out["seconds"].median() * SLOW_LAP_FACTOR]
+    out = out.assign(fuel_corrected=out["seconds"] + FUEL_EFFECT_S_PER_LAP * (out["LapNumber"] - 1))
+    return out.reset_index(drop=True)
+
+
+def stint_table(laps: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per (driver, stint) — same Stint/Compound grouping as
+    race_builder._driver_lap_stats, done for the whole field at once.
+
+    Columns: Driver, Stint, Compound, first_lap, last_lap, laps, start_age
+    """
+    df = laps[laps["Stint"].notna()]
+    if df.empty:
+        return pd.DataFrame(columns=["Driver", "Stint", "Compound", "first_lap", "last_lap", "laps", "start_age"])
+    g = df.groupby(["Driver", "Stint"], sort=True)
+    out = g.agg(
+        Compound=("Compound", "first"),
+        first_lap=("LapNumber", "min"),
+        last_lap=("LapNumber", "max"),
+        laps=("LapNumber", "size"),
+        first_life=("TyreLife", "min"),
+    ).reset_index()
+    out["Compound"] = out["Compound"].fillna("UNKNOWN").astype(str)
+    out["start_age"] = (out["first_life"].fillna(1) - 1).clip(lower=0)
+    return out.drop(columns="first_life")
+
+
+# ===========================
+# MODEL PIECES
+# ===========================
+
+def _driver_offsets(clean: pd.DataFrame) -> pd.Series:
+    med = clean.groupby("Driver")["fuel_corrected"].median()
+    return med - clean["fuel_corrected"].median()
+
+
+def fit_compounds(clean: pd.DataFrame, offsets: pd.Series) -> Dict[str, Dict[str, float]]:
+    """Least-squares base + degradation per compound on driver-normalized laps."""
+    baseline = float(clean["fuel_corrected"].median()) if not clean.empty else 90.0
+    y = clean["fuel_corrected"] - clean["Driver"].map(offsets).fillna(0.0)
+
+    fitted = {}
+    for compound, idx in clean.groupby("Compound").groups.items():
+        if len(idx) < MIN_COMPOUND_LAPS:
+            continue
+        x = clean.loc[idx, "TyreLife"].to_numpy()
+        if np.ptp(x) == 0:
+            continue
+        deg, base = np.polyfit(x, y.loc[idx].to_numpy(), 1)
+        fitted[compound] = {"base": float(base), "deg": float(max(deg, 0.0)), "laps": int(len(idx))}
+
+    # fill the gaps relative to a fitted compound (or the race baseline)
+    anchor_name = next((c for c in ("MEDIUM", "HARD", "SOFT") if c in fitted), None)
+    anchor = (
+        fitted[anchor_name]["base"] - _DEFAULT_COMPOUNDS[anchor_name]["base"]
+        if anchor_name else baseline
+    )
+    for compound, d in _DEFAULT_COMPOUNDS.items():
+        if compound not in fitted:
+            fitted[compound] = {"base": anchor + d["base"], "deg": d["deg"], "laps": 0}
+    return fitted
+
+
+def max_stints(stints: pd.DataFrame) -> Dict[str, int]:
+    """Longest stint seen per compound (+10%), defaulting where unused."""
+    seen = stints.groupby("Compound")["laps"].max() if not stints.empty else pd.Series(dtype=float)
+    return {
+        c: int(round(seen[c] * MAX_STINT_MARGIN)) if c in seen.index else d["max_stint"]
+        for c, d in _DEFAULT_COMPOUNDS.items()
+    }
+
+
+def estimate_pit_loss(laps: pd.DataFrame, clean: pd.DataFrame) -> float:
+    """Median (in-lap + out-lap) minus two representative laps."""
+    if clean.empty or "PitInTime" not in laps.columns:
+        return DEFAULT_PIT_LOSS_S
+    timed = laps[laps["LapTime"].notna()]
+    inlaps = timed[timed["PitInTime"].notna()][["Driver", "LapNumber", "LapTime"]]
+    outlaps = timed[timed["PitOutTime"].notna() & (timed["LapNumber"] > 1)][["Driver", "LapNumber", "LapTime"]]
+    outlaps = outlaps.assign(LapNumber=outlaps["LapNumber"] - 1)
+    pairs = inlaps.merge(outlaps, on=["Driver", "LapNumber"], suffixes=("_in", "_out"))
+    if pairs.empty:
+        return DEFAULT_PIT_LOSS_S
+    ref = clean.groupby("Driver")["seconds"].median()
+    loss = (
+        _seconds(pairs["LapTime_in"]) + _seconds(pairs["LapTime_out"])
+        - 2 * pairs["Driver"].map(ref).fillna(clean["seconds"].median())
+    )
+    loss = float(np.nanmedian(loss))
+    return float(np.clip(loss, 12.0, 40.0)) if np.isfinite(loss) else DEFAULT_PIT_LOSS_S
+
+
+def estimate_sc_probability(laps: pd.DataFrame, total_laps: int) -> float:
+    """Per-lap chance a safety car / VSC period starts (at least one per two races)."""
+    periods = 0
+    if "TrackStatus" in laps.columns and total_laps:
+        status = laps.groupby("LapNumber")["TrackStatus"].apply(
+            lambda s: s.astype(str).str.contains("[467]").any()
+        ).reindex(range(1, total_laps + 1), fill_value=False).to_numpy()
+        periods = int(np.count_nonzero(status[1:] & ~status[:-1]) + status[0])
+    return max(periods, 0.5) / max(total_laps, 1)
+
+
+def field_strategies(stints: pd.DataFrame, finishers: List[str]) -> Dict[str, Dict[str, Any]]:
+    out = {}
+    for driver, g in stints[stints["Driver"].isin(finishers)].groupby("Driver", sort=False):
+        g = g.sort_values("Stint")
+        compounds = [c if c in COMPOUNDS else "MEDIUM" for c in g["Compound"]]
+        out[driver] = {
+            "stop_laps": [int(x) for x in g["last_lap"].iloc[:-1]],
+            "compounds": compounds,
+            "start_age": int(g["start_age"].iloc[0]),
+        }
+    return out
+
+
+# ===========================
+# PUBLIC
+# ===========================
+
+def build_race_model(session, year: int, round_number: int) -> Dict[str, Any]:
+    laps = session.laps
+    if laps is None or laps.empty:
+        raise LookupError("No lap data available for this race.")
+
+    total_laps = int(laps["LapNumber"].max())
+    clean = clean_laps(laps)
+    if clean.empty:
+        raise LookupError("No representative laps available for this race.")
+    offsets = _driver_offsets(clean)
+    residual = clean["fuel_corrected"] - clean["Driver"].map(offsets) - clean["fuel_corrected"].median()
+
+    results = session.results
+    finishers, grid = [], {}
+    if results is not None and not results.empty:
+        last_lap = laps.groupby("Driver")["LapNumber"].max()
+        for _, row in results.iterrows():
+            code = row.get("Abbreviation")
+            g = row.get("GridPosition")
+            grid[code] = int(g) if pd.notna(g) and g > 0 else 20
+            if last_lap.get(code, 0) >= total_laps - 1:
+                finishers.append(code)
+
+    stints = stint_table(laps)
+    strategies = field_strategies(stints, finishers)
+    drivers = {
+        code: {
+            "offset_s": float(offsets.get(code, 0.0)),
+            "grid":     grid.get(code, 20),
+            **strategies[code],
+        }
+        for code in finishers if code in strategies
+    }
+
+    compounds = fit_compounds(clean, offsets)
+    for c, n in max_stints(stints).items():
+        compounds[c]["max_stint"] = n
+
+    return {
+        "season":                 year,
+        "round":                  round_number,
+        "total_laps":             total_laps,
+        "compounds":              compounds,
+        "pit_loss_s":             round(estimate_pit_loss(laps, clean), 3),
+        "sc_probability_per_lap": round(estimate_sc_probability(laps, total_laps), 4),
+        "lap_noise_s":            float(np.clip(np.nanstd(residual), 0.2, 1.5)),
+        "fuel_effect_s_per_lap":  FUEL_EFFECT_S_PER_LAP,
+        "drivers":                drivers,
+    }
+
+
+@lru_cache(maxsize=32)
+def get_race_model(year: int, round_number: int) -> Dict[str, Any]:
+    session = load_session_parts(year, round_number, laps=True)
+    return build_race_model(session, year, round_number)
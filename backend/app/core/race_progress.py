@@ -0,0 +1,96 @@
+"""
+Lap-by-lap position and gap-to-leader matrices for the whole field.
+
+Built from the race's lap table in one vectorized pass (factorize drivers,
+scatter Position / Time into driver × lap arrays) and encoded compactly:
+
+    positions   int8, delta-encoded along laps per driver (first value is
+                the position itself, then lap-to-lap changes; 0 = no lap)
+    gaps        int32, fixed-point milliseconds behind the leader at the
+                end of each lap (-1 = no lap)
+
+JSON clients get the arrays base64-encoded (little-endian, row-major,
+driver × lap); binary clients get both buffers back to back.
+"""
+
+import base64
+from functools import lru_cache
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+from app.core import metrics
+from app.core.lap_store import get_lap_table
+
+NO_GAP = -1
+
+
+@lru_cache(maxsize=32)
+def progress_arrays(year: int, round_number: int) -> Dict[str, Any]:
+    table = get_lap_table(year, round_number)
+    df = table[table["LapNumber"] > 0]
+    if df.empty:
+        raise LookupError("No lap data available for this race.")
+
+    codes, drivers = pd.factorize(df["Driver"].astype(str))
+    laps = df["LapNumber"].to_numpy(dtype=np.int64) - 1
+    n_drivers, n_laps = len(drivers), int(laps.max()) + 1
+
+    pos = np.zeros((n_drivers, n_laps), dtype=np.int16)
+    pos[codes, laps] = np.nan_to_num(df["Position"].to_numpy(dtype=np.float64)).astype(np.int16)
+
+    t = np.full((n_drivers, n_laps), np.nan)
+    t[codes, laps] = df["Time"].to_numpy(dtype=np.float64)
+    leader = np.nanmin(np.where(np.isnan(t), np.inf, t), axis=0)
+    gap = t - leader[None, :]
+    gaps = np.where(np.isnan(gap), NO_GAP, np.round(gap * 1000)).astype(np.int32)
+
+    # classification order: most laps completed, then position on the last lap
+    laps_done = (pos > 0).sum(axis=1)
+    last_pos = pos[np.arange(n_drivers), np.maximum(laps_done - 1, 0)]
+    order = np.lexsort((np.where(last_pos > 0, last_pos, 99), -laps_done))
+
+    pos, gaps = pos[order], gaps[order]
+    deltas = np.diff(pos, axis=1, prepend=0).astype(np.int8)
+    return {
+        "drivers":   [str(drivers[i]) for i in order],
+        "laps":      n_laps,
+        "positions": deltas,
+        "gaps_ms":   gaps,
+    }
+
+
+def progress_json(year: int, round_number: int) -> Dict[str, Any]:
+    a = progress_arrays(year, round_number)
+    with metrics.timer("serialize", format="progress_json"):
+        return {
+            "season":    year,
+            "round":     round_number,
+            "drivers":   a["drivers"],
+            "laps":      a["laps"],
+            "encoding": {
+                "positions": "int8 delta along laps, base64, driver-major",
+                "gaps_ms":   f"int32 little-endian ms behind leader ({NO_GAP} = no lap), base64, driver-major",
+            },
+            "positions": base64.b64encode(a["positions"].tobytes()).decode("ascii"),
+            "gaps_ms":   base64.b64encode(a["gaps_ms"].astype("<i4").tobytes()).decode("ascii"),
+        }
+
+
+def progress_binary(year: int, round_number: int):
+    """(body, headers): int8 position deltas followed by int32 LE gaps."""
+    a = progress_arrays(year, round_number)
+    with metrics.timer("serialize", format="progress_binary"):
+        body = a["positions"].tobytes() + a["gaps_ms"].astype("<i4").tobytes()
+    headers = {
+        "X-Drivers": ",".join(a["drivers"]),
+        "X-Laps":    str(a["laps"]),
+        "X-Layout":  "positions:int8[drivers*laps];gaps_ms:int32le[drivers*laps]",
+    }
+    return body, headers
+
+
+def decode_positions(deltas: np.ndarray) -> np.ndarray:
+    """Inverse of the delta encoding (reference for clients)."""
+    return np.cumsum(deltas.astype(np.int16), axis=1)
@@ -0,0 +1,164 @@
+"""
+Lap-by-lap race replay over Server-Sent Events.
+
+The replay for a race is computed once from its lap table (the laps
+telemetry_source loads for the session) as driver × lap arrays — position,
+gap to leader, compound, pit-in — and every lap is turned into a delta
+against the previous one with a few vectorized comparisons:
+
+    positions   drivers whose position changed          {driver: position}
+    gaps        gaps that moved by ≥ 0.1 s               {driver: seconds}
+    pits        drivers who came in on this lap          [driver, ...]
+    tyres       drivers on a different compound          {driver: compound}
+    stopped     drivers with no further laps              [driver, ...]
+
+Events are serialized to SSE text once and shared: concurrent subscribers
+to the same race await the same computation (one asyncio.Lock per race) and
+then only differ in how fast they walk the list.
+"""
+
+import asyncio
+import json
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core import metrics
+from app.core.lap_store import get_lap_table
+from app.core.race_progress import NO_GAP, decode_positions, progress_arrays
+
+MAX_REPLAYS = 16
+KEEPALIVE_S = 15.0
+MAX_LAP_DELAY_S = 300.0     # a red flag shouldn't stall a real-time replay
+
+_replays: "OrderedDict[Tuple[int, int], Dict[str, Any]]" = OrderedDict()
+_locks: Dict[Tuple[int, int], asyncio.Lock] = {}
+
+
+def _sse(event: str, lap: int, data: Dict[str, Any]) -> str:
+    return f"id: {lap}\nevent: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def build_replay(year: int, round_number: int) -> Dict[str, Any]:
+    a = progress_arrays(year, round_number)
+    drivers = np.array(a["drivers"], dtype=object)
+    pos = decode_positions(a["positions"])                 # driver × lap, 0 = no lap
+    gaps = a["gaps_ms"]
+    tenths = np.where(gaps == NO_GAP, -1, np.round(gaps / 100)).astype(np.int64)
+    n_laps = a["laps"]
+
+    # compounds / pit-ins scattered onto the same driver × lap grid
+    table = get_lap_table(year, round_number)
+    table = table[table["LapNumber"] > 0]
+    row = pd.Index(a["drivers"]).get_indexer(table["Driver"].astype(str))
+    col = table["LapNumber"].to_numpy(dtype=np.int64) - 1
+    ok = row >= 0
+    names, codes = np.unique(table["Compound"].fillna("").astype(str).to_numpy(), return_inverse=True)
+    compound = np.full(pos.shape, -1, dtype=np.int64)
+    compound[row[ok], col[ok]] = codes[ok]
+    compound[np.isin(compound, np.flatnonzero(names == ""))] = -1
+    pit_in = np.zeros(pos.shape, dtype=bool)
+    pit_in[row[ok], col[ok]] = table["PitInTime"].notna().to_numpy()[ok]
+
+    # leader's race time at the end of each lap → real-time pacing between events
+    times = np.full(pos.shape, np.nan)
+    times[row[ok], col[ok]] = table["Time"].to_numpy(dtype=np.float64)[ok]
+    leader = np.nanmin(np.where(np.isnan(times), np.inf, times), axis=0)
+    leader[~np.isfinite(leader)] = np.nan
+    lap_s = np.nan_to_num(np.diff(leader, prepend=leader[0]), nan=0.0).clip(0, MAX_LAP_DELAY_S)
+
+    last_lap = (pos > 0).cumsum(axis=1).argmax(axis=1)      # index of each driver's final lap
+
+    events: List[Tuple[float, str]] = []
+    for lap in range(n_laps):
+        on = pos[:, lap] > 0
+        if lap == 0:
+            data = _state_data(drivers, pos, tenths, compound, names, lap)
+            data["pits"] = drivers[pit_in[:, 0]].tolist()
+            events.append((0.0, _sse("start", 1, data)))
+            continue
+        moved = on & (pos[:, lap] != pos[:, lap - 1])
+        gap_moved = on & (tenths[:, lap] != tenths[:, lap - 1])
+        changed = on & (compound[:, lap] != compound[:, lap - 1]) & (compound[:, lap - 1] >= 0)
+        stopped = (last_lap == lap - 1) & (pos[:, lap - 1] > 0)
+        data = {
+            "lap":       lap + 1,
+            "positions": {d: int(p) for d, p in zip(drivers[moved], pos[moved, lap])},
+            "gaps":      {d: t / 10 for d, t in zip(drivers[gap_moved], tenths[gap_moved, lap].tolist())},
+            "pits":      drivers[on & pit_in[:, lap]].tolist(),
+            "tyres":     {d: names[c] for d, c in zip(drivers[changed], compound[changed, lap])},
+            "stopped":   drivers[stopped].tolist(),
+        }
+        events.append((float(lap_s[lap]), _sse("lap", lap + 1, {k: v for k, v in data.items() if v or k == "lap"})))
+
+    final = _state_data(drivers, pos, tenths, compound, names, n_laps - 1, classification=True)
+    events.append((0.0, _sse("finish", n_laps, final)))
+    return {
+        "drivers": drivers, "pos": pos, "tenths": tenths, "compound": compound,
+        "names": names, "laps": n_laps, "events": events,
+    }
+
+
+def _state_data(drivers, pos, tenths, compound, names, lap: int, classification: bool = False) -> Dict[str, Any]:
+    """Full state at the end of a lap (each driver's latest lap when classifying)."""
+    if classification:
+        col = np.maximum((pos > 0).cumsum(axis=1).argmax(axis=1), 0)
+        idx = np.arange(len(drivers))
+        p, g, c = pos[idx, col], tenths[idx, col], compound[idx, col]
+        order = np.lexsort((p, -col))               # most laps, then position on the last one
+    else:
+        p, g, c = pos[:, lap], tenths[:, lap], compound[:, lap]
+        order = np.argsort(np.where(p > 0, p, 99), kind="stable")
+        order = order[p[order] > 0]
+    return {
+        "lap":   lap + 1,
+        "order": drivers[order].tolist(),
+        "gaps":  {drivers[i]: (None if g[i] < 0 else g[i] / 10) for i in order},
+        "tyres": {drivers[i]: names[c[i]] for i in order if c[i] >= 0},
+    }
+
+
+async def get_replay(year: int, round_number: int) -> Dict[str, Any]:
+    """Shared replay for a race; concurrent first subscribers wait on one build."""
+    key = (year, round_number)
+    replay = _replays.get(key)
+    if replay is not None:
+        _replays.move_to_end(key)
+        return replay
+    lock = _locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        replay = _replays.get(key)
+        if replay is None:
+            with metrics.timer("analytics", task="replay"):
+                replay = await asyncio.to_thread(build_replay, year, round_number)
+            _replays[key] = replay
+            if len(_replays) > MAX_REPLAYS:
+                _locks.pop(_replays.popitem(last=False)[0], None)
+    return replay
+
+
+async def stream(year: int, round_number: int, speed: float = 1.0, from_lap: int = 1) -> AsyncIterator[str]:
+    """
+    SSE text for one subscriber. speed = replay rate vs real time (0 = as fast
+    as possible); from_lap starts with a full-state snapshot of that lap.
+    """
+    replay = await get_replay(year, round_number)
+    from_lap = min(max(from_lap, 1), replay["laps"])
+    events = replay["events"]
+    if from_lap > 1:
+        snapshot = _state_data(replay["drivers"], replay["pos"], replay["tenths"],
+                               replay["compound"], replay["names"], from_lap - 1)
+        yield _sse("state", from_lap, snapshot)
+        events = events[from_lap:]
+
+    for i, (delay, text) in enumerate(events):
+        wait = delay / speed if speed > 0 and i > 0 else 0.0
+        while wait > 0:
+            step = min(wait, KEEPALIVE_S)
+            await asyncio.sleep(step)
+            wait -= step
+            if wait > 0:
+                yield ": keep-alive\n\n"
+        yield text
@@ -0,0 +1,153 @@
+"""
+Monte Carlo race strategy simulator.
+
+Replays a race thousands of times with the pace model from race_model:
+every finisher runs their actual strategy, the candidate runs the requested
+one, lap times get Gaussian noise, and random safety-car periods cheapen
+pit stops and bunch the field. All runs advance together lap by lap on
+(runs × cars) arrays, so 10k runs stay well under a second.
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.core.race_model import COMPOUNDS
+
+SC_LAP_FACTOR = 1.35        # safety-car lap vs representative lap
+SC_PIT_FACTOR = 0.55        # pit loss under SC / VSC
+SC_GAP_S = 0.8              # gap between cars once the field is bunched
+SC_DURATION_LAPS = (3, 6)   # [low, high)
+GRID_GAP_S = 0.25           # time per grid slot at the end of lap 1
+MAX_RUNS = 50_000
+
+
+def validate_strategy(model: Dict[str, Any], stop_laps: List[int], compounds: List[str]) -> List[str]:
+    """Raises ValueError for an impossible strategy; returns normalized compounds."""
+    total = model["total_laps"]
+    compounds = [c.strip().upper() for c in compounds]
+    if len(compounds) != len(stop_laps) + 1:
+        raise ValueError("compounds must have exactly one entry more than stop_laps")
+    unknown = [c for c in compounds if c not in COMPOUNDS]
+    if unknown:
+        raise ValueError(f"Unknown compound(s): {', '.join(unknown)}")
+    if sorted(set(stop_laps)) != list(stop_laps):
+        raise ValueError("stop_laps must be strictly increasing")
+    if stop_laps and not (1 <= stop_laps[0] and stop_laps[-1] < total):
+        raise ValueError(f"stop_laps must be between 1 and {total - 1}")
+    return compounds
+
+
+def _lap_plan(model, stop_laps, compounds, start_age=0):
+    """Deterministic per-lap (compound index, tyre age, pit flag) for one car."""
+    total = model["total_laps"]
+    laps = np.arange(1, total + 1)
+    stint = np.searchsorted(np.asarray(stop_laps, dtype=np.int64), laps, side="left")
+    stint_start = np.concatenate(([1], np.asarray(stop_laps, dtype=np.int64) + 1))[stint]
+    age = laps - stint_start + 1 + np.where(stint == 0, start_age, 0)
+    comp = np.array([COMPOUNDS.index(c) for c in compounds])[stint]
+    pit = np.isin(laps, stop_laps)
+    return comp, age, pit
+
+
+def _base_lap_times(model, plans, offsets):
+    """(cars × laps) deterministic lap times before noise / safety cars."""
+    base = np.array([model["compounds"][c]["base"] for c in COMPOUNDS])
+    deg = np.array([model["compounds"][c]["deg"] for c in COMPOUNDS])
+    laps = np.arange(model["total_laps"])
+    comp = np.stack([p[0] for p in plans])
+    age = np.stack([p[1] for p in plans])
+    pit = np.stack([p[2] for p in plans])
+    times = base[comp] + deg[comp] * age - model["fuel_effect_s_per_lap"] * laps + offsets[:, None]
+    return times, pit
+
+
+def _safety_car_laps(rng, runs, total_laps, p):
+    """(runs × laps) bool — True while a SC / VSC period is active."""
+    active = np.zeros((runs, total_laps), dtype=bool)
+    remaining = np.zeros(runs, dtype=np.int64)
+    starts = rng.random((runs, total_laps)) < p
+    durations = rng.integers(*SC_DURATION_LAPS, size=(runs, total_laps))
+    for lap in range(1, total_laps - 1):          # never on lap 1 or the final lap
+        start = (remaining == 0) & starts[:, lap]
+        remaining = np.where(start, durations[:, lap], remaining)
+        active[:, lap] = remaining > 0
+        remaining = np.maximum(remaining - 1, 0)
+    return active
+
+
+def simulate(
+    model: Dict[str, Any],
+    stop_laps: List[int],
+    compounds: List[str],
+    driver_code: Optional[str] = None,
+    runs: int = 10_000,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    compounds = validate_strategy(model, stop_laps, compounds)
+    runs = int(np.clip(runs, 1, MAX_RUNS))
+    rng = np.random.default_rng(seed)
+    total = model["total_laps"]
+
+    field = {c: d for c, d in model["drivers"].items() if c != driver_code}
+    me = model["drivers"].get(driver_code, {})
+    codes = list(field)
+    plans = [_lap_plan(model, d["stop_laps"], d["compounds"], d.get("start_age", 0)) for d in field.values()]
+    plans.append(_lap_plan(model, stop_laps, compounds))
+    offsets = np.array([d["offset_s"] for d in field.values()] + [me.get("offset_s", 0.0)])
+    grid = np.array([d["grid"] for d in field.values()] + [me.get("grid", len(field) // 2 + 1)], dtype=float)
+
+    lap_times, pit = _base_lap_times(model, plans, offsets)
+    lap_times = lap_times.astype(np.float32)
+    cars = len(offsets)
+    sc = _safety_car_laps(rng, runs, total, model["sc_probability_per_lap"])
+    sc_lap = np.float32(np.median(lap_times) * SC_LAP_FACTOR)
+    pit_loss = np.where(sc, model["pit_loss_s"] * SC_PIT_FACTOR, model["pit_loss_s"]).astype(np.float32)
+    noise = np.empty((runs, cars), dtype=np.float32)
+
+    t = np.broadcast_to(((grid - 1) * GRID_GAP_S).astype(np.float32), (runs, cars)).copy()
+    for lap in range(total):
+        rng.standard_normal(dtype=np.float32, out=noise)
+        noise *= model["lap_noise_s"]
+        noise += lap_times[:, lap]
+        under_sc = sc[:, lap]
+        any_sc = under_sc.any()
+        if any_sc:
+            noise[under_sc] = sc_lap
+        t += noise
+        pitting = np.flatnonzero(pit[:, lap])
+        if pitting.size:
+            t[:, pitting] += pit_loss[:, lap, None]
+        if any_sc:
+            # bunch the field behind the safety car, order preserved
+            rows = t[under_sc]
+            ranks = rows.argsort(axis=1).argsort(axis=1)
+            t[under_sc] = rows.min(axis=1, keepdims=True) + ranks * np.float32(SC_GAP_S)
+
+    me_t = t[:, -1]
+    positions = (t[:, :-1] < me_t[:, None]).sum(axis=1) + 1
+    dist = np.bincount(positions, minlength=cars + 1)[1:] / runs
+
+    return {
+        "season":                model["season"],
+        "round":                 model["round"],
+        "driver_code":           driver_code,
+        "strategy":              {"stop_laps": list(stop_laps), "compounds": compounds},
+        "runs":                  runs,
+        "field_size":            cars,
+        "position_distribution": {str(i + 1): round(float(p), 4) for i, p in enumerate(dist) if p > 0},
+        "expected_position":     round(float(positions.mean()), 2),
+        "p_win":                 round(float(dist[0]), 4),
+        "p_podium":              round(float(dist[:3].sum()), 4),
+        "p_points":              round(float(dist[:10].sum()), 4),
+        "race_time_s": {
+            "p10":    round(float(np.percentile(me_t, 10)), 3),
+            "median": round(float(np.median(me_t)), 3),
+            "p90":    round(float(np.percentile(me_t, 90)), 3),
+        },
+        "safety_car_runs_pct":   round(float(sc.any(axis=1).mean() * 100), 1),
+        "field":                 codes,
+        "elapsed_ms":            round((time.perf_counter() - t0) * 1000, 1),
+    }
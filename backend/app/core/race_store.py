@@ -0,0 +1,496 @@
+"""
+Tiered read-through race store.
+
+One entry point for race documents, cheapest source first:
+
+    memory → shared (cross-worker SQLite) → precomputed files → MongoDB → live FastF1 compute
+
+A miss on a tier falls through to the next one; the first hit is written
+back to every faster writable tier, stamped with the race file's mtime so
+a rewritten file is picked up everywhere. Async routes use
+`get_race_async`, which reads Mongo through Motor instead of holding a
+threadpool thread. Each tier keeps its own hit / miss / latency counters
+(see `race_store.stats()`).
+"""
+
+import copy
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core import lap_store, metrics, mongo_loader, precomputed_loader
+from app.core.shared_cache import get_shared_cache, race_key
+from app.db import mongo
+
+RACE_STORE_MEMORY_SIZE = int(os.getenv("RACE_STORE_MEMORY_SIZE", "128"))
+RACE_STORE_FILE_WRITEBACK = os.getenv("RACE_STORE_FILE_WRITEBACK", "0") == "1"
+RACE_STORE_MONGO_WRITEBACK = os.getenv("RACE_STORE_MONGO_WRITEBACK", "0") == "1"
+
+
+# ===========================
+# TIERS
+# ===========================
+
+class _Tier(ABC):
+    """
+    Base tier: subclasses implement _get and _put (read-only tiers are never
+    written to — `writable` is False). Tiers with a non-blocking read set
+    `awaitable` and implement _aget.
+    """
+    name = "tier"
+    writable = False
+    awaitable = False
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.writes = 0
+        self.seconds = 0.0
+
+    def available(self) -> bool:
+        return True
+
+    def get(self, year: int, round_number: int) -> Optional[dict]:
+        t0 = time.perf_counter()
+        try:
+            doc = self._get(year, round_number)
+        finally:
+            self.seconds += time.perf_counter() - t0
+        return self._counted(doc)
+
+    async def aget(self, year: int, round_number: int) -> Optional[dict]:
+        t0 = time.perf_counter()
+        try:
+            doc = await self._aget(year, round_number)
+        finally:
+            self.seconds += time.perf_counter() - t0
+        return self._counted(doc)
+
+    def _counted(self, doc: Optional[dict]) -> Optional[dict]:
+        if doc is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return doc
+
+    def put(self, year: int, round_number: int, doc: dict):
+        self._put(year, round_number, doc)
+        self.writes += 1
+
+    @abstractmethod
+    def _get(self, year: int, round_number: int) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def _put(self, year: int, round_number: int, doc: dict):
+        ...
+
+    async def _aget(self, year: int, round_number: int) -> Optional[dict]:
+        raise TypeError(f"{self.name} tier has no non-blocking read")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "tier":           self.name,
+            "available":      self.available(),
+            "hits":           self.hits,
+            "misses":         self.misses,
+            "errors":         self.errors,
+            "writes":         self.writes,
+            "hit_ratio":      round(self.hits / lookups, 4) if lookups else None,
+            "avg_latency_ms": round(self.seconds / lookups * 1000, 3) if lookups else None,
+        }
+
+
+def _stamp(year: int, round_number: int):
+    # a cached document is only served while its race file is unchanged, so a
+    # refit or re-precompute (in any process) reaches the faster tiers
+    return precomputed_loader.race_mtime(year, round_number)
+
+
+class MemoryTier(_Tier):
+    """
+    In-process LRU. Documents go in and come out as deep copies, so a caller
+    that mutates its result can't change what later requests are served.
+    """
+    name = "memory"
+    writable = True
+
+    def __init__(self, maxsize: int = RACE_STORE_MEMORY_SIZE):
+        super().__init__()
+        self.maxsize = maxsize
+        self._docs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, year, round_number):
+        key = (year, round_number)
+        current = _stamp(year, round_number)
+        with self._lock:
+            entry = self._docs.get(key)
+            if entry is None:
+                return None
+            stamp, doc = entry
+            if stamp != current:
+                del self._docs[key]
+                return None
+            self._docs.move_to_end(key)
+        return copy.deepcopy(doc)
+
+    def _put(self, year, round_number, doc):
+        entry = (_stamp(year, round_number), copy.deepcopy(doc))
+        with self._lock:
+            self._docs[(year, round_number)] = entry
+            self._docs.move_to_end((year, round_number))
+            while len(self._docs) > self.maxsize:
+                self._docs.popitem(last=False)
+
+    def invalidate(self, year: int, round_number: int):
+        with self._lock:
+            self._docs.pop((year, round_number), None)
+
+
+class SharedTier(_Tier):
+    """Host-wide cache shared by every uvicorn worker."""
+    name = "shared"
+    writable = True
+
+    def available(self):
+        return get_shared_cache() is not None
+
+    def _get(self, year, round_number):
+        entry = get_shared_cache().get(race_key(year, round_number))
+        if not entry or "doc" not in entry or entry.get("stamp") != _stamp(year, round_number):
+            return None
+        return entry["doc"]
+
+    def _put(self, year, round_number, doc):
+        get_shared_cache().set(race_key(year, round_number), {"stamp": _stamp(year, round_number), "doc": doc})
+
+    def invalidate(self, year: int, round_number: int):
+        if self.available():
+            get_shared_cache().delete(race_key(year, round_number))
+
+
+class PrecomputedTier(_Tier):
+    name = "precomputed"
+
+    def __init__(self, writable: bool = RACE_STORE_FILE_WRITEBACK):
+        super().__init__()
+        self.writable = writable
+
+    def _get(self, year, round_number):
+        return precomputed_loader.load_race(year, round_number)
+
+    def _put(self, year, round_number, doc):
+        precomputed_loader.save_race(year, round_number, doc)
+
+
+class MongoTier(_Tier):
+    name = "mongo"
+    awaitable = True
+
+    def __init__(self, writable: bool = RACE_STORE_MONGO_WRITEBACK):
+        super().__init__()
+        self.writable = writable
+
+    def available(self):
+        return bool(mongo.MONGO_URI)
+
+    def _get(self, year, round_number):
+        # uncached query — the memory and shared tiers own caching here
+        return mongo_loader.query_race(year, round_number)
+
+    async def _aget(self, year, round_number):
+        return await mongo_loader.load_race_async(year, round_number)
+
+    def _put(self, year, round_number, doc):
+        mongo.db.races.replace_one(
+            {"season": year, "round": round_number},
+            dict(doc),
+            upsert=True,
+        )
+
+
+class LiveTier(_Tier):
+    """FastF1 compute — always answers (or raises), never written to."""
+    name = "live"
+
+    def _get(self, year, round_number):
+        from app.core.race_builder import build_race
+        with metrics.timer("analytics", task="build_race"):
+            return build_race(year, round_number)
+
+    def _put(self, year, round_number, doc):
+        # read-only: a built document is stored by the tiers above
+        pass
+
+
+# ===========================
+# STORE
+# ===========================
+
+def _conform(year: int, round_number: int, doc: dict):
+    """Bring documents stored before the shared schema up to it (in place)."""
+    drivers = doc.get("drivers") or []
+    if "consistency_scale" not in doc:
+        # live-built documents always used the 0–100 score; old precomputed
+        # ones (no `winner`) hold std-seconds — rescore from the lap table
+        if "winner" not in doc:
+            table = lap_store.load_lap_table(year, round_number)
+            scores = lap_store.consistency_scores(table) if table is not None else {}
+            for d in drivers:
+                d["consistency_index"] = scores.get(d.get("driver_code"))
+        doc["consistency_scale"] = lap_store.CONSISTENCY_SCALE
+    doc.setdefault("date", None)
+    doc.setdefault("winner", min(drivers, key=lambda d: d.get("finish") or 99) if drivers else None)
+
+
+class RaceStore:
+    def __init__(self, tiers: List[_Tier]):
+        self.tiers = tiers
+        self._key_locks = {}
+        self._locks_guard = threading.Lock()
+        self._listeners = []
+
+    def subscribe(self, callback):
+        """callback(year, round_number, doc) for every race loaded below memory."""
+        self._listeners.append(callback)
+
+    def _key_lock(self, key) -> threading.Lock:
+        with self._locks_guard:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get_race(self, year: int, round_number: int) -> Optional[dict]:
+        """
+        Read through the tiers; write the first hit back to the faster ones.
+        Concurrent misses for the same race share one fall-through.
+        """
+        doc = self.tiers[0].get(year, round_number)
+        if doc is not None:
+            return doc
+        return self._fall_through(year, round_number, 1)
+
+    def _fall_through(self, year, round_number, start):
+        """Tiers from `start` down, one caller at a time per race."""
+        with self._key_lock((year, round_number)):
+            # another request may have filled memory while we waited
+            doc = self.tiers[0]._get(year, round_number)
+            if doc is not None:
+                return doc
+
+            for i, tier in enumerate(self.tiers[start:], start=start):
+                if not tier.available():
+                    continue
+                try:
+                    doc = tier.get(year, round_number)
+                except Exception:
+                    # the live tier is the source of truth — let its errors surface
+                    if tier is self.tiers[-1]:
+                        raise
+                    tier.errors += 1
+                    continue
+                if doc is not None:
+                    self._found(i, year, round_number, doc)
+                    return doc
+        return None
+
+    async def get_race_async(self, year: int, round_number: int) -> Optional[dict]:
+        """
+        get_race for async routes, without blocking the event loop: each run
+        of local tiers (memory, shared, files) is read in one threadpool call,
+        Mongo is awaited through Motor, and a miss on every stored tier hands
+        the live build to the threadpool, where it is still shared between
+        concurrent requests.
+        """
+        stored = len(self.tiers) - 1
+        i = 0
+        while i < stored:
+            tier = self.tiers[i]
+            if tier.awaitable:
+                if tier.available():
+                    try:
+                        doc = await tier.aget(year, round_number)
+                    except Exception:
+                        tier.errors += 1
+                        doc = None
+                    if doc is not None:
+                        await run_in_threadpool(self._found, i, year, round_number, doc)
+                        return doc
+                i += 1
+                continue
+            j = i
+            while j < stored and not self.tiers[j].awaitable:
+                j += 1
+            doc = await run_in_threadpool(self._first_hit, i, j, year, round_number)
+            if doc is not None:
+                return doc
+            i = j
+        return await run_in_threadpool(self._fall_through, year, round_number, stored)
+
+    def _first_hit(self, start, stop, year, round_number):
+        """First document from tiers[start:stop], handled like any hit; None on a miss."""
+        for i in range(start, stop):
+            tier = self.tiers[i]
+            if not tier.available():
+                continue
+            try:
+                doc = tier.get(year, round_number)
+            except Exception:
+                tier.errors += 1
+                continue
+            if doc is not None:
+                if i:
+                    self._found(i, year, round_number, doc)
+                return doc
+        return None
+
+    def _found(self, i, year, round_number, doc):
+        """A hit on tier i: conform it, write it back above i, tell listeners."""
+        _conform(year, round_number, doc)
+        self._write_back(self.tiers[:i], year, round_number, doc)
+        self._notify(year, round_number, doc)
+
+    def _write_back(self, tiers, year, round_number, doc):
+        for tier in tiers:
+            if not (tier.writable and tier.available()):
+                continue
+            try:
+                tier.put(year, round_number, doc)
+            except Exception:
+                tier.errors += 1
+
+    def _notify(self, year, round_number, doc):
+        for callback in self._listeners:
+            try:
+                callback(year, round_number, doc)
+            except Exception:
+                pass
+
+    def invalidate(self, year: int, round_number: int):
+        for tier in self.tiers:
+            if isinstance(tier, (MemoryTier, SharedTier)):
+                tier.invalidate(year, round_number)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [t.stats() for t in self.tiers]
+
+
+race_store = RaceStore([
+    MemoryTier(),
+    SharedTier(),
+    PrecomputedTier(),
+    MongoTier(),
+    LiveTier(),
+])
+
+
+def get_race(year: int, round_number: int) -> Optional[dict]:
+    return race_store.get_race(year, round_number)
+
+
+async def get_race_async(year: int, round_number: int) -> Optional[dict]:
+    return await race_store.get_race_async(year, round_number)
+
+
+def available_seasons() -> List[int]:
+    """Seasons with stored race documents (files and/or Mongo)."""
+    seasons = set()
+    try:
+        seasons.update(precomputed_loader.list_seasons.__wrapped__())
+    except OSError:
+        pass
+    if mongo.MONGO_URI:
+        try:
+            seasons.update(mongo_loader.query_seasons())
+        except Exception:
+            pass
+    return sorted(seasons)
+
+
+async def available_seasons_async() -> List[int]:
+    """available_seasons for async callers: Mongo through Motor, files off the loop."""
+    seasons = set()
+    try:
+        seasons.update(await run_in_threadpool(precomputed_loader.list_seasons.__wrapped__))
+    except OSError:
+        pass
+    if mongo.MONGO_URI:
+        try:
+            seasons.update(await mongo_loader.list_seasons_async())
+        except Exception:
+            pass
+    return sorted(seasons)
+
+
+def available_rounds(year: int) -> List[int]:
+    """Rounds of a season with a stored race document (files and/or Mongo)."""
+    rounds = set(precomputed_loader.stored_rounds(year))
+    if mongo.MONGO_URI:
+        try:
+            rounds.update(r["round"] for r in mongo_loader.query_races(year))
+        except Exception:
+            pass
+    return sorted(rounds)
+
+
+async def available_rounds_async(year: int) -> List[int]:
+    """available_rounds for async callers: Mongo through Motor, files off the loop."""
+    rounds = set(await run_in_threadpool(precomputed_loader.stored_rounds, year))
+    if mongo.MONGO_URI:
+        try:
+            rounds.update(r["round"] for r in await mongo_loader.list_races_async(year))
+        except Exception:
+            pass
+    return sorted(rounds)
+
+
+def season_complete(year: int) -> bool:
+    """Marked complete by precompute (season.json), or followed by a stored season."""
+    meta = precomputed_loader.load_season_meta(year)
+    if meta is not None and meta.get("complete"):
+        return True
+    return any(s > year for s in available_seasons())
+
+
+def stored_race(year: int, round_number: int) -> Optional[dict]:
+    """
+    A race document from files / Mongo only, for one-pass bulk reads: no live
+    build, no write-back, and the memory tier's hot documents stay put.
+    """
+    for tier in race_store.tiers:
+        if not isinstance(tier, (PrecomputedTier, MongoTier)) or not tier.available():
+            continue
+        try:
+            doc = tier.get(year, round_number)
+        except Exception:
+            tier.errors += 1
+            continue
+        if doc is not None:
+            _conform(year, round_number, doc)
+            return doc
+    return None
+
+
+def backfill(has_race, add_race, years: Optional[List[int]] = None) -> int:
+    """
+    Feed every stored race (of `years`, default all) an aggregate hasn't seen
+    yet into it: has_race(year, round) → bool, add_race(year, round, doc).
+    Documents are read from files / Mongo directly, so the memory tier is
+    left alone and no listener is notified.
+    """
+    added = 0
+    for year in (available_seasons() if years is None else years):
+        for rnd in available_rounds(year):
+            if has_race(year, rnd):
+                continue
+            doc = stored_race(year, rnd)
+            if doc is not None:
+                add_race(year, rnd, doc)
+                added += 1
+    return added
@@ -0,0 +1,307 @@
+"""
+In-memory columnar table of every (season, round, driver) row in the stored
+race documents, for ad-hoc filter / aggregate queries across seasons.
+
+Each race is converted to column chunks once, when it is first seen (backfill
+from files / Mongo, or the race store handing over a freshly loaded race);
+the full columns are the concatenation of the chunks, rebuilt only after a
+race was added or replaced. Queries are NumPy boolean masks over the columns
+plus a bincount group-by:
+
+    filters    "positions_gained>5", "strategy=HARD-MEDIUM", "team~Ferrari",
+               "driver=VER,HAM" (comma = any of), "is_winner=true"
+    group_by   column names
+    agg        count | sum:<col> | mean:<col> | min:<col> | max:<col>
+"""
+
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.race_store import backfill, race_store
+from app.core.standings import driver_points
+
+RACE_TABLE_REFRESH_S = float(os.getenv("RACE_TABLE_REFRESH_S", "300"))
+MAX_ROWS = 1000
+
+# column → kind ("i" int, "f" float, "b" bool, "s" string)
+COLUMNS = {
+    "season":                 "i",
+    "round":                  "i",
+    "event_name":             "s",
+    "location":               "s",
+    "driver":                 "s",
+    "team":                   "s",
+    "grid":                   "i",
+    "finish":                 "i",
+    "positions_gained":       "i",
+    "points":                 "f",
+    "stops":                  "i",
+    "strategy":               "s",      # tyre sequence, e.g. "MEDIUM-HARD"
+    "start_compound":         "s",
+    "longest_stint":          "i",
+    "consistency_index":      "f",
+    "tyre_degradation_index": "f",
+    "pit_efficiency":         "s",      # label, e.g. "Efficient"
+    "risk_score":             "f",
+    "is_winner":              "b",
+    "classified":             "b",
+}
+_DTYPES = {"i": np.int32, "f": np.float64, "b": np.bool_, "s": object}
+_MISSING_INT = -1
+
+_FILTER = re.compile(r"^\s*(\w+)\s*(>=|<=|!=|=|>|<|~)\s*(.*?)\s*$")
+_AGGS = ("count", "sum", "mean", "min", "max")
+
+
+def _num(value, default):
+    try:
+        return default if value is None else float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def race_rows(season: int, round_number: int, doc: Dict[str, Any]) -> List[Dict[str, Any]]:
+    rows = []
+    for i, d in enumerate(doc.get("drivers", [])):
+        if not d.get("driver_code"):
+            continue
+        seq = [c for c in d.get("tyre_sequence") or [] if c]
+        finish = int(_num(d.get("finish"), _MISSING_INT))
+        rows.append({
+            "season":                 season,
+            "round":                  round_number,
+            "event_name":             doc.get("event_name") or "",
+            "location":               doc.get("location") or "",
+            "driver":                 d["driver_code"],
+            "team":                   d.get("team") or "",
+            "grid":                   int(_num(d.get("grid"), _MISSING_INT)),
+            "finish":                 finish,
+            "positions_gained":       int(_num(d.get("positions_gained"), 0)),
+            "points":                 driver_points(d),
+            "stops":                  int(_num(d.get("stops"), _MISSING_INT)),
+            "strategy":               "-".join(seq),
+            "start_compound":         seq[0] if seq else "",
+            "longest_stint":          int(_num(d.get("longest_stint"), _MISSING_INT)),
+            "consistency_index":      _num(d.get("consistency_index"), np.nan),
+            "tyre_degradation_index": _num(d.get("tyre_degradation_index"), np.nan),
+            "pit_efficiency":         d.get("pit_efficiency") or "",
+            "risk_score":             _num((d.get("strategy_risk") or {}).get("risk_score"), np.nan),
+            "is_winner":              finish == 1,
+            "classified":             0 < finish < 99,
+        })
+    return rows
+
+
+def _chunk(rows: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    return {
+        name: np.array([r[name] for r in rows], dtype=_DTYPES[kind])
+        for name, kind in COLUMNS.items()
+    }
+
+
+def _py(value):
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    return value
+
+
+class RaceTable:
+    def __init__(self):
+        self._chunks: Dict[Tuple[int, int], Dict[str, np.ndarray]] = {}
+        self._columns: Optional[Dict[str, np.ndarray]] = None
+        self._lock = threading.RLock()
+        self.refreshed_at = 0.0
+
+    # ---------------------------
+    # incremental updates
+    # ---------------------------
+
+    def add_race(self, season: int, round_number: int, doc: Dict[str, Any]):
+        chunk = _chunk(race_rows(season, round_number, doc))
+        with self._lock:
+            self._chunks[(season, round_number)] = chunk
+            self._columns = None
+
+    def has_race(self, season: int, round_number: int) -> bool:
+        return (season, round_number) in self._chunks
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        with self._lock:
+            if self._columns is None:
+                chunks = [self._chunks[k] for k in sorted(self._chunks)]
+                self._columns = {
+                    name: np.concatenate([c[name] for c in chunks]) if chunks
+                    else np.array([], dtype=_DTYPES[kind])
+                    for name, kind in COLUMNS.items()
+                }
+            return self._columns
+
+    # ---------------------------
+    # queries
+    # ---------------------------
+
+    def mask(self, cols: Dict[str, np.ndarray], filters: Sequence[str]) -> np.ndarray:
+        n = len(cols["season"])
+        mask = np.ones(n, dtype=bool)
+        for expr in filters:
+            m = _FILTER.match(expr)
+            if not m:
+                raise ValueError(f"Bad filter '{expr}' (expected e.g. stops=1, positions_gained>5)")
+            name, op, raw = m.groups()
+            if name not in COLUMNS:
+                raise ValueError(f"Unknown column '{name}' (available: {', '.join(COLUMNS)})")
+            col, kind = cols[name], COLUMNS[name]
+
+            if op == "~":
+                if kind != "s":
+                    raise ValueError(f"'~' only applies to text columns, not '{name}'")
+                needle = raw.lower()
+                mask &= np.fromiter((needle in v.lower() for v in col), dtype=bool, count=n)
+                continue
+
+            values = [v for v in raw.split(",") if v != ""] if op in ("=", "!=") else [raw]
+            if not values:
+                raise ValueError(f"Missing value in filter '{expr}'")
+            if kind in "sb" and op not in ("=", "!="):
+                raise ValueError(f"'{op}' does not apply to column '{name}'")
+
+            if kind == "s":
+                # case-insensitive match on text columns
+                lowered = {v.lower() for v in values}
+                hit = np.fromiter((v.lower() in lowered for v in col), dtype=bool, count=n)
+            elif kind == "b":
+                wanted = np.array([v.lower() in ("1", "true", "yes") for v in values])
+                hit = np.isin(col, wanted)
+            else:
+                try:
+                    nums = np.array([float(v) for v in values])
+                except ValueError:
+                    raise ValueError(f"Bad number in filter '{expr}'")
+                hit = (
+                    np.isin(col, nums) if op in ("=", "!=") else
+                    col > nums[0] if op == ">" else
+                    col >= nums[0] if op == ">=" else
+                    col < nums[0] if op == "<" else
+                    col <= nums[0]
+                )
+            mask &= ~hit if op == "!=" else hit
+        return mask
+
+    def query(
+        self,
+        filters: Sequence[str] = (),
+        group_by: Sequence[str] = (),
+        aggs: Sequence[str] = ("count",),
+        select: Sequence[str] = (),
+        sort: Optional[str] = None,
+        limit: int = 100,
+    ) -> Dict[str, Any]:
+        t0 = time.perf_counter()
+        cols = self.columns()
+        mask = self.mask(cols, filters)
+        idx = np.flatnonzero(mask)
+        limit = max(1, min(limit, MAX_ROWS))
+
+        for name in list(group_by) + list(select):
+            if name not in COLUMNS:
+                raise ValueError(f"Unknown column '{name}' (available: {', '.join(COLUMNS)})")
+
+        if group_by:
+            rows = self._aggregate(cols, idx, list(group_by), list(aggs))
+        else:
+            names = list(select) or list(COLUMNS)
+            rows = [{name: _py(cols[name][i]) for name in names} for i in idx]
+
+        if sort:
+            key, desc = sort.lstrip("-"), sort.startswith("-")
+            if rows and key not in rows[0]:
+                raise ValueError(f"Cannot sort by '{key}'")
+            present = [r for r in rows if r.get(key) is not None]
+            rows = sorted(present, key=lambda r: r[key], reverse=desc) + [r for r in rows if r.get(key) is None]
+
+        return {
+            "matched":    int(idx.size),
+            "total_rows": int(mask.size),
+            "rows":       rows[:limit],
+            "truncated":  len(rows) > limit,
+            "elapsed_ms": round((time.perf_counter() - t0) * 1000, 3),
+        }
+
+    @staticmethod
+    def _aggregate(cols, idx: np.ndarray, group_by: List[str], aggs: List[str]) -> List[Dict[str, Any]]:
+        specs = []
+        for a in aggs or ["count"]:
+            fn, _, col = a.partition(":")
+            if fn not in _AGGS:
+                raise ValueError(f"Unknown aggregate '{fn}' (available: {', '.join(_AGGS)})")
+            if fn != "count":
+                if col not in COLUMNS or COLUMNS[col] == "s":
+                    raise ValueError(f"'{fn}' needs a numeric column, got '{col}'")
+            specs.append((fn, col))
+        if idx.size == 0:
+            return []
+
+        # one integer group id per row from the key columns
+        keys, inverse = np.unique(
+            np.stack([np.unique(cols[g][idx].astype(str), return_inverse=True)[1] for g in group_by], axis=1),
+            axis=0, return_inverse=True,
+        )
+        inverse = inverse.ravel()
+        n_groups = len(keys)
+        first = np.full(n_groups, idx.size, dtype=np.int64)
+        np.minimum.at(first, inverse, np.arange(idx.size))
+        counts = np.bincount(inverse, minlength=n_groups)
+
+        out = [{g: _py(cols[g][idx[first[k]]]) for g in group_by} for k in range(n_groups)]
+        for fn, col in specs:
+            label = "count" if fn == "count" else f"{fn}_{col}"
+            if fn == "count":
+                values = counts.astype(float)
+            else:
+                x = cols[col][idx].astype(np.float64)
+                if COLUMNS[col] == "i":
+                    x[x == _MISSING_INT] = np.nan
+                ok = ~np.isnan(x)
+                if fn in ("sum", "mean"):
+                    sums = np.bincount(inverse[ok], weights=x[ok], minlength=n_groups)
+                    n_ok = np.bincount(inverse[ok], minlength=n_groups)
+                    with np.errstate(all="ignore"):
+                        values = sums if fn == "sum" else sums / n_ok
+                else:
+                    values = np.full(n_groups, np.inf if fn == "min" else -np.inf)
+                    (np.minimum if fn == "min" else np.maximum).at(values, inverse[ok], x[ok])
+            for k in range(n_groups):
+                v = values[k]
+                out[k][label] = int(v) if fn == "count" else (round(float(v), 3) if np.isfinite(v) else None)
+        return out
+
+
+race_table = RaceTable()
+_build_lock = threading.Lock()
+
+
+def refresh(force: bool = False) -> RaceTable:
+    """Add stored races the table hasn't seen (at most every RACE_TABLE_REFRESH_S)."""
+    now = time.monotonic()
+    if not force and race_table.refreshed_at and now - race_table.refreshed_at < RACE_TABLE_REFRESH_S:
+        return race_table
+    with _build_lock:
+        if not force and race_table.refreshed_at and now - race_table.refreshed_at < RACE_TABLE_REFRESH_S:
+            return race_table
+        backfill(race_table.has_race, race_table.add_race)
+        race_table.refreshed_at = time.monotonic()
+    return race_table
+
+
+def query(**kwargs) -> Dict[str, Any]:
+    return refresh().query(**kwargs)
+
+
+race_store.subscribe(race_table.add_race)
@@ -0,0 +1,103 @@
+"""
+Sector analytics for the whole field in one grouped pass over the lap table.
+
+Per driver: best sectors, theoretical best lap (sum of their best sectors),
+gap from their fastest lap to it, and sector consistency (mean std of the
+three sector times). Field-wide: best sector holders, the ideal lap and each
+driver's gap to it.
+
+Only representative green-flag laps are used (no in/out laps, no lap 1,
+within 107% of the median lap). The result is stored on the race document
+as `sector_analysis`, so it is computed once per race.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core import lap_store, metrics, precomputed_loader
+from app.core.race_store import get_race
+
+SECTORS = ("Sector1Time", "Sector2Time", "Sector3Time")
+
+
+def _r(value, digits: int = 3) -> Optional[float]:
+    return round(float(value), digits) if value is not None and np.isfinite(value) else None
+
+
+def green_laps(table: pd.DataFrame) -> pd.DataFrame:
+    green = table[
+        table["LapTime"].notna() & table["PitInTime"].isna() & table["PitOutTime"].isna()
+        & (table["TrackStatus"].astype(str) == "1") & (table["LapNumber"] > 1)
+    ]
+    return green[green["LapTime"] <= green["LapTime"].median() * 1.07]
+
+
+def analyze(table: pd.DataFrame) -> Dict[str, Any]:
+    green = green_laps(table)
+    if green.empty:
+        return {}
+
+    g = green.groupby("Driver", sort=False)
+    best = g[list(SECTORS)].min()
+    spread = g[list(SECTORS)].std()
+    fastest = g["LapTime"].min()
+    laps = g.size()
+
+    theoretical = best.sum(axis=1, min_count=3)
+    ideal = {s: green[s].min() for s in SECTORS}
+    # a sector column can be all NaN when timing data is missing
+    timed = {s: green[s].dropna() for s in SECTORS}
+    holders = {s: str(green.at[t.idxmin(), "Driver"]) if not t.empty else None for s, t in timed.items()}
+    ideal_lap = sum(ideal.values())
+    ranks = best.rank(method="min")
+
+    drivers = {}
+    for code in theoretical.sort_values().index:
+        drivers[str(code)] = {
+            "best_s1":            _r(best.at[code, "Sector1Time"]),
+            "best_s2":            _r(best.at[code, "Sector2Time"]),
+            "best_s3":            _r(best.at[code, "Sector3Time"]),
+            "sector_ranks":       [int(ranks.at[code, s]) if pd.notna(ranks.at[code, s]) else None for s in SECTORS],
+            "theoretical_best":   _r(theoretical.at[code]),
+            "fastest_lap":        _r(fastest.at[code]),
+            "gap_to_ideal":       _r(fastest.at[code] - theoretical.at[code]),    # own fastest vs own best sectors
+            "gap_to_field_ideal": _r(theoretical.at[code] - ideal_lap),
+            "sector_consistency": _r(float(np.nanmean(spread.loc[code].to_numpy(dtype=float)))
+                                     if spread.loc[code].notna().any() else np.nan),
+            "laps":               int(laps.at[code]),
+        }
+
+    return {
+        "field": {
+            "best_s1":            _r(ideal["Sector1Time"]),
+            "best_s2":            _r(ideal["Sector2Time"]),
+            "best_s3":            _r(ideal["Sector3Time"]),
+            "best_sector_holders": [holders[s] for s in SECTORS],
+            "theoretical_best":   _r(ideal_lap),
+            "fastest_lap":        _r(green["LapTime"].min()),
+            "sector_consistency": _r(float(np.nanmean([green[s].std() for s in SECTORS]))),
+        },
+        "drivers": drivers,
+    }
+
+
+def get_sector_analysis(year: int, round_number: int) -> Dict[str, Any]:
+    """Stored on the race document when present, else from the lap table."""
+    return _sector_analysis(
+        year, round_number,
+        precomputed_loader.race_mtime(year, round_number), lap_store.table_mtime(year, round_number),
+    )
+
+
+@lru_cache(maxsize=128)
+def _sector_analysis(year: int, round_number: int, race_mtime, table_mtime) -> Dict[str, Any]:
+    # keyed by the source files' mtimes, so a re-precomputed race is picked up
+    doc = get_race(year, round_number)
+    if doc and doc.get("sector_analysis"):
+        return doc["sector_analysis"]
+    table = lap_store.get_lap_table(year, round_number)
+    with metrics.timer("analytics", task="sector_analysis"):
+        return analyze(table)
@@ -0,0 +1,216 @@
+"""
+Cross-process cache for multi-worker deployments.
+
+Every uvicorn worker on the host opens the same SQLite file (WAL mode), so a
+race document or schedule computed by one worker is reused by all of them.
+Values are zlib-compressed JSON. The cache is bounded by a byte budget and
+evicts least-recently-used entries; entries may also carry a TTL.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+SHARED_CACHE_ENABLED = os.getenv("F1_SHARED_CACHE", "1") == "1"
+SHARED_CACHE_PATH = os.getenv(
+    "F1_SHARED_CACHE_PATH",
+    os.path.join(BASE_DIR, ".shared-cache", "f1_shared.sqlite3"),
+)
+SHARED_CACHE_MAX_MB = float(os.getenv("F1_SHARED_CACHE_MAX_MB", "256"))
+
+# Access times are only refreshed when older than this, so hot reads
+# don't turn into a write per request.
+_TOUCH_INTERVAL_S = 30.0
+
+# Least-recently-used entries are evicted this many rows per statement.
+_EVICT_BATCH = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key      TEXT PRIMARY KEY,
+    value    BLOB NOT NULL,
+    size     INTEGER NOT NULL,
+    expires  REAL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE INDEX IF NOT EXISTS entries_expires ON entries (expires);
+
+-- running byte total, so a write never has to SUM the whole table
+CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL);
+INSERT OR IGNORE INTO totals (id, bytes) SELECT 0, COALESCE(SUM(size), 0) FROM entries;
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE totals SET bytes = bytes + NEW.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE totals SET bytes = bytes - OLD.size + NEW.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE totals SET bytes = bytes - OLD.size WHERE id = 0;
+END;
+"""
+
+
+class SharedCache:
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # one transaction, so the byte total is seeded before any trigger fires
+        self._conn().executescript(f"BEGIN IMMEDIATE;{_SCHEMA}COMMIT;")
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite connections are per-thread; one per worker thread is cheap
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # -------------------------
+    # READ
+    # -------------------------
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        try:
+            row = self._conn().execute(
+                "SELECT value, expires, accessed FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[2] > _TOUCH_INTERVAL_S:
+                self._conn().execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        except sqlite3.OperationalError:
+            # locked / busy past the timeout — behave like a miss
+            row = None
+        if row is None or (row[1] is not None and row[1] < now):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(zlib.decompress(row[0]))
+
+    # -------------------------
+    # WRITE (+ eviction)
+    # -------------------------
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        blob = zlib.compress(json.dumps(value, separators=(",", ":")).encode(), 6)
+        now = time.time()
+        conn = self._conn()
+        try:
+            # an upsert (not INSERT OR REPLACE) so the size triggers see the update
+            conn.execute(
+                "INSERT INTO entries (key, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, size = excluded.size, "
+                "expires = excluded.expires, accessed = excluded.accessed",
+                (key, blob, len(blob), now + ttl if ttl else None, now),
+            )
+            self._evict(conn, now)
+        except sqlite3.OperationalError:
+            # another worker holds the write lock — the value is only a cache
+            pass
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        conn.execute("DELETE FROM entries WHERE expires < ?", (now,))
+        if self._total(conn) <= self.max_bytes:
+            return
+        # trim to 90% of the budget so we don't evict on every write
+        target = int(self.max_bytes * 0.9)
+        while self._total(conn) > target:
+            deleted = conn.execute(
+                "DELETE FROM entries WHERE key IN "
+                "(SELECT key FROM entries ORDER BY accessed ASC LIMIT ?)",
+                (_EVICT_BATCH,),
+            ).rowcount
+            if deleted <= 0:
+                break
+            self.evictions += deleted
+
+    @staticmethod
+    def _total(conn: sqlite3.Connection) -> int:
+        return conn.execute("SELECT bytes FROM totals WHERE id = 0").fetchone()[0]
+
+    def delete(self, key: str):
+        self._conn().execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self):
+        self._conn().execute("DELETE FROM entries")
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self._conn()
+        entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        size = self._total(conn)
+        lookups = self.hits + self.misses
+        return {
+            "path":      self.path,
+            "entries":   entries,
+            "bytes":     size,
+            "max_bytes": self.max_bytes,
+            "hits":      self.hits,
+            "misses":    self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_shared_cache() -> Optional[SharedCache]:
+    """Process-wide SharedCache, or None when disabled / the file can't be opened."""
+    global _cache
+    if not SHARED_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    _cache = SharedCache(SHARED_CACHE_PATH, int(SHARED_CACHE_MAX_MB * 1024 * 1024))
+                except (OSError, sqlite3.Error):
+                    return None
+    return _cache
+
+
+def shared_cached(key: Callable[..., str], ttl: Optional[float] = None):
+    """
+    Read a loader's results through the shared cache under key(*args); None
+    results aren't stored. A plain call when the shared cache is disabled.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args):
+            shared = get_shared_cache()
+            if shared is None:
+                return fn(*args)
+            k = key(*args)
+            value = shared.get(k)
+            if value is None:
+                value = fn(*args)
+                if value is not None:
+                    shared.set(k, value, ttl)
+            return value
+        return wrapper
+    return decorator
+
+
+def race_key(year: int, round_number: int) -> str:
+    return f"race:{year}:{round_number}"
+
+
+def schedule_key(year: int) -> str:
+    return f"schedule:{year}"
+
+
+def insights_key(year: int, round_number: int, section: str, version: str = "") -> str:
+    return f"insights:{year}:{round_number}:{section}:{version}"
@@ -0,0 +1,216 @@
+"""
+Incremental championship standings.
+
+Each season keeps, in memory:
+
+  * one points delta per round (driver + constructor points, wins, podiums)
+  * a cumulative snapshot after every round
+
+Adding a new round folds only that round's delta into the latest snapshot;
+a re-ingested or out-of-order round rebuilds the snapshots from that round
+on. "Standings after round N" is a lookup, never a re-scan of race documents.
+
+Rounds are discovered from precomputed files / MongoDB and every race that
+enters the race store below the memory tier is folded in as it arrives.
+
+Points are Grand Prix points only. Sprint races are not stored, so their
+points are never counted, and a driver row without recorded points is
+scored from the finishing-position table (no fastest-lap point). Standings
+can therefore trail the official ones; responses say so in `points_note`.
+"""
+
+import bisect
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core.race_store import backfill, race_store
+
+POINTS_TABLE = (25, 18, 15, 12, 10, 8, 6, 4, 2, 1)
+POINTS_NOTE = (
+    "Grand Prix points only: sprint points are not included, and rounds without "
+    "recorded points are scored from the finishing position (no fastest-lap point)."
+)
+STANDINGS_REFRESH_S = float(os.getenv("STANDINGS_REFRESH_S", "60"))
+
+
+def driver_points(driver: Dict[str, Any]) -> float:
+    """
+    Points scored in the Grand Prix as recorded in the document, else the
+    standard table by finish (which has no fastest-lap point). Sprint points
+    are never included.
+    """
+    pts = driver.get("points")
+    if isinstance(pts, (int, float)):
+        return float(pts)
+    finish = driver.get("finish")
+    if isinstance(finish, int) and 1 <= finish <= len(POINTS_TABLE):
+        return float(POINTS_TABLE[finish - 1])
+    return 0.0
+
+
+def round_delta(doc: Dict[str, Any]) -> Dict[str, Any]:
+    drivers, teams = {}, {}
+    from_table = False
+    for d in doc.get("drivers", []):
+        code = d.get("driver_code")
+        if not code:
+            continue
+        finish = d.get("finish")
+        team = d.get("team") or "Unknown"
+        pts = driver_points(d)
+        from_table = from_table or not isinstance(d.get("points"), (int, float))
+        win = int(finish == 1)
+        podium = int(isinstance(finish, int) and 1 <= finish <= 3)
+
+        drivers[code] = {
+            "driver_name": d.get("driver_name") or code,
+            "team":        team,
+            "points":      pts,
+            "wins":        win,
+            "podiums":     podium,
+            "finish":      finish,
+        }
+        t = teams.setdefault(team, {"points": 0.0, "wins": 0, "podiums": 0})
+        t["points"] += pts
+        t["wins"] += win
+        t["podiums"] += podium
+    return {
+        "round":      doc.get("round"),
+        "event_name": doc.get("event_name"),
+        "drivers":    drivers,
+        "teams":      teams,
+        "points_from_table": from_table,
+    }
+
+
+def _apply(prev: Optional[Dict[str, Any]], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """New cumulative snapshot = previous snapshot + one round's delta."""
+    drivers = {k: dict(v) for k, v in (prev or {}).get("drivers", {}).items()}
+    teams = {k: dict(v) for k, v in (prev or {}).get("teams", {}).items()}
+
+    for code, d in delta["drivers"].items():
+        cur = drivers.setdefault(code, {"points": 0.0, "wins": 0, "podiums": 0, "races": 0, "best_finish": None})
+        cur["driver_name"] = d["driver_name"]
+        cur["team"] = d["team"]                 # latest team wins mid-season swaps
+        cur["points"] += d["points"]
+        cur["wins"] += d["wins"]
+        cur["podiums"] += d["podiums"]
+        cur["races"] += 1
+        if isinstance(d["finish"], int) and (cur["best_finish"] is None or d["finish"] < cur["best_finish"]):
+            cur["best_finish"] = d["finish"]
+
+    for team, t in delta["teams"].items():
+        cur = teams.setdefault(team, {"points": 0.0, "wins": 0, "podiums": 0})
+        cur["points"] += t["points"]
+        cur["wins"] += t["wins"]
+        cur["podiums"] += t["podiums"]
+
+    return {"round": delta["round"], "drivers": drivers, "teams": teams}
+
+
+def _ranked(rows: Dict[str, Dict[str, Any]], key: str) -> List[Dict[str, Any]]:
+    ordered = sorted(rows.items(), key=lambda kv: (-kv[1]["points"], -kv[1]["wins"], -kv[1]["podiums"], kv[0]))
+    return [
+        {"position": i, key: name, **{k: (round(v, 1) if k == "points" else v) for k, v in row.items()}}
+        for i, (name, row) in enumerate(ordered, start=1)
+    ]
+
+
+# ===========================
+# SEASON AGGREGATE
+# ===========================
+
+class SeasonStandings:
+    def __init__(self, year: int):
+        self.year = year
+        self.rounds: List[int] = []                 # sorted
+        self.deltas: Dict[int, Dict[str, Any]] = {}
+        self.snapshots: List[Dict[str, Any]] = []   # aligned with self.rounds
+        self.refreshed_at = 0.0
+        self._lock = threading.Lock()
+
+    def add_race(self, round_number: int, doc: Dict[str, Any]) -> bool:
+        """Fold one round in; returns False when nothing changed."""
+        delta = round_delta(doc)
+        with self._lock:
+            if self.deltas.get(round_number) == delta:
+                return False
+            self.deltas[round_number] = delta
+            i = bisect.bisect_left(self.rounds, round_number)
+            if i == len(self.rounds) or self.rounds[i] != round_number:
+                self.rounds.insert(i, round_number)
+
+            # appending the latest round touches one snapshot; anything else
+            # replays the deltas from that round forward
+            del self.snapshots[i:]
+            for rnd in self.rounds[i:]:
+                prev = self.snapshots[-1] if self.snapshots else None
+                self.snapshots.append(_apply(prev, self.deltas[rnd]))
+            return True
+
+    def has_round(self, round_number: int) -> bool:
+        return round_number in self.deltas
+
+    def snapshot(self, after_round: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if not self.snapshots:
+                return None
+            if after_round is None:
+                return self.snapshots[-1]
+            i = bisect.bisect_right(self.rounds, after_round)
+            return self.snapshots[i - 1] if i else None
+
+    def to_dict(self, after_round: Optional[int] = None) -> Dict[str, Any]:
+        snap = self.snapshot(after_round)
+        rounds = [r for r in self.rounds if after_round is None or r <= after_round]
+        return {
+            "year":         self.year,
+            "after_round":  snap["round"] if snap else None,
+            "rounds":       rounds,
+            "standings":    _ranked(snap["drivers"], "driver_code") if snap else [],
+            "constructors": _ranked(snap["teams"], "team") if snap else [],
+            "points_note":  POINTS_NOTE,
+            "points_from_table_rounds": [r for r in rounds if self.deltas[r]["points_from_table"]],
+        }
+
+
+# ===========================
+# REGISTRY
+# ===========================
+
+_seasons: Dict[int, SeasonStandings] = {}
+_seasons_lock = threading.Lock()
+
+
+def _season(year: int) -> SeasonStandings:
+    with _seasons_lock:
+        return _seasons.setdefault(year, SeasonStandings(year))
+
+
+def refresh(year: int, force: bool = False) -> SeasonStandings:
+    """Fold in rounds that appeared since the last refresh (at most every STANDINGS_REFRESH_S)."""
+    season = _season(year)
+    now = time.monotonic()
+    if not force and season.snapshots and now - season.refreshed_at < STANDINGS_REFRESH_S:
+        return season
+    season.refreshed_at = now
+    # stored documents only: the memory tier and the store listeners are left alone
+    backfill(
+        lambda y, rnd: season.has_round(rnd),
+        lambda y, rnd, doc: season.add_race(rnd, doc),
+        years=[year],
+    )
+    return season
+
+
+def add_race(year: int, round_number: int, doc: Dict[str, Any]) -> bool:
+    return _season(year).add_race(round_number, doc)
+
+
+def get_standings(year: int, after_round: Optional[int] = None) -> Dict[str, Any]:
+    return refresh(year).to_dict(after_round)
+
+
+race_store.subscribe(add_race)
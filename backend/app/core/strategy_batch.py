@@ -0,0 +1,231 @@
+"""
+Batched strategy scoring.
+
+Vectorized versions of the three strategy rule sets used across the backend,
+operating on field-wide (or season-wide) NumPy arrays:
+
+    rules="engine"      → strategy_engine.compute_strategy_risk / simulate_strategy_swap
+    rules="dashboard"   → race_builder._strategy_risk / _strategy_simulation
+    rules="precompute"  → scripts/precompute_season.py strategy_risk / strategy_swap
+
+The per-driver functions are thin wrappers over the kernels below, so every
+rule lives in exactly one place. `score_field` derives each race's context
+(averages, winner, typical stops, most common tyre sequence) with grouped
+reductions and scores every row in one call.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+RISK_LABELS = np.array(["Conservative", "Balanced", "High Risk"])
+PRECOMPUTE_RISK_LABELS = np.array(["Low Risk", "Medium Risk", "High Risk"])
+
+ENGINE_VERDICTS = np.array([
+    "Minimal or negative impact.",
+    "Marginal potential improvement.",
+    "Would likely gain track position.",
+    "Would likely gain multiple positions.",
+])
+DASHBOARD_VERDICTS = np.array([
+    "Strategy was well-calibrated relative to the race winner — no significant gains identified.",
+    "Marginal improvements possible through tighter alignment with optimal strategy.",
+    "A closer mirroring of the race winner's approach could have secured track position.",
+    "Adopting the winning strategy would likely have yielded multiple position gains.",
+])
+# indexed by sign(stops - typical_stops) + 1
+PRECOMPUTE_SWAP = (
+    np.array([-1, 0, 2]),
+    np.array([
+        "Likely slower without extra tyre advantage",
+        "Strategy aligned with race winner",
+        "Could gain positions with fewer stops",
+    ]),
+)
+
+
+# ===========================
+# ENCODING
+# ===========================
+
+def tyre_key(seq) -> Any:
+    """Hashable key for a tyre sequence (list) or an already-joined string."""
+    return seq if isinstance(seq, str) else tuple(seq)
+
+
+def encode_tyre_sequences(seqs: Iterable, vocab: Optional[Dict[Any, int]] = None) -> Tuple[np.ndarray, Dict[Any, int]]:
+    """Map tyre sequences to int codes; pass `vocab` to share codes across calls."""
+    vocab = {} if vocab is None else vocab
+    codes = np.fromiter(
+        (vocab.setdefault(tyre_key(s), len(vocab)) for s in seqs),
+        dtype=np.int32,
+    )
+    return codes, vocab
+
+
+def _label(labels: np.ndarray, risk: np.ndarray, low: float, high: float) -> np.ndarray:
+    return labels[(risk >= low).astype(np.int8) + (risk >= high)]
+
+
+# ===========================
+# KERNELS (context is scalar or per-row)
+# ===========================
+
+def engine_risk(stops, longest_stint, positions_gained, tyre_codes,
+                avg_stops, avg_longest_stint, common_tyre_code) -> Dict[str, np.ndarray]:
+    risk = (
+        np.abs(stops - avg_stops) * 15
+        + np.where(longest_stint < avg_longest_stint - 5, 20, 0)
+        + np.where(tyre_codes != common_tyre_code, 15, 0)
+        + np.where(positions_gained < -3, 20, 0)
+    )
+    risk = np.minimum(100, risk)
+    return {"risk_score": risk, "risk_label": _label(RISK_LABELS, risk, 35, 65)}
+
+
+def engine_swap(stops, longest_stint, tyre_codes,
+                typical_stops, avg_longest_stint, common_tyre_code) -> Dict[str, np.ndarray]:
+    delta = (
+        np.where(stops > typical_stops, 2, 0)
+        + np.where(longest_stint < avg_longest_stint, 1, 0)
+        + np.where(tyre_codes != common_tyre_code, 1, 0)
+    )
+    return {"position_change": delta, "verdict": ENGINE_VERDICTS[np.minimum(delta, 3)]}
+
+
+def dashboard_risk(stops, positions_gained, avg_stops) -> Dict[str, np.ndarray]:
+    risk = (
+        np.floor(np.abs(stops - avg_stops) * 20).astype(np.int64)
+        + np.where(positions_gained < -3, 25, 0)
+        + np.where(stops >= 3, 20, 0)
+    )
+    risk = np.minimum(100, risk)
+    return {"risk_score": risk, "risk_label": _label(RISK_LABELS, risk, 35, 65)}
+
+
+def dashboard_swap(stops, positions_gained, winner_stops) -> Dict[str, np.ndarray]:
+    delta = (
+        np.where(stops > winner_stops + 1, 2, np.where(stops > winner_stops, 1, 0))
+        + np.where(positions_gained < -2, 1, 0)
+    )
+    return {"position_change": delta, "verdict": DASHBOARD_VERDICTS[np.minimum(delta, 3)]}
+
+
+def precompute_risk(stops, longest_stint, avg_stops, avg_longest_stint) -> Dict[str, np.ndarray]:
+    risk = 50 + (stops - avg_stops) * 12 - (longest_stint - avg_longest_stint) * 1.5
+    risk = np.clip(np.trunc(risk), 0, 100).astype(np.int64)
+    return {"risk_score": risk, "risk_label": _label(PRECOMPUTE_RISK_LABELS, risk, 35, 70)}
+
+
+def precompute_swap(stops, typical_stops) -> Dict[str, np.ndarray]:
+    idx = np.sign(stops - typical_stops).astype(np.int64) + 1
+    changes, verdicts = PRECOMPUTE_SWAP
+    return {"position_change": changes[idx], "verdict": verdicts[idx]}
+
+
+# ===========================
+# GROUPED RACE CONTEXT
+# ===========================
+
+def _group_mean(race_ids, values, n_races):
+    total = np.bincount(race_ids, weights=values, minlength=n_races)
+    count = np.bincount(race_ids, minlength=n_races)
+    return np.divide(total, count, out=np.zeros(n_races), where=count > 0)
+
+
+def _group_mode(race_ids, values, n_races, mask=None):
+    """Most common value per race; ties go to the first seen (like Counter.most_common)."""
+    if mask is not None:
+        race_ids, values = race_ids[mask], values[mask]
+    out = np.full(n_races, -1, dtype=np.int64)
+    n = len(values)
+    if n == 0:
+        return out
+    uniq, inv = np.unique(values, return_inverse=True)
+    counts = np.zeros((n_races, len(uniq)), dtype=np.int64)
+    first = np.full((n_races, len(uniq)), n, dtype=np.int64)
+    np.add.at(counts, (race_ids, inv), 1)
+    np.minimum.at(first, (race_ids, inv), np.arange(n))
+    has = counts.sum(axis=1) > 0
+    rank = counts * (n + 1) - first
+    out[has] = uniq[rank[has].argmax(axis=1)]
+    return out
+
+
+def _group_first_by(race_ids, order_key, values, n_races):
+    """values[row with the smallest order_key] per race."""
+    order = np.lexsort((order_key, race_ids))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = race_ids[order][1:] != race_ids[order][:-1]
+    out = np.zeros(n_races, dtype=values.dtype)
+    out[race_ids[order][first]] = values[order][first]
+    return out
+
+
+def score_field(
+    stops,
+    longest_stint,
+    positions_gained,
+    tyre_codes,
+    race_ids=None,
+    finish=None,
+    rules: str = "dashboard",
+) -> Dict[str, np.ndarray]:
+    """
+    Score every driver row of one race (race_ids=None) or of many races
+    (race_ids = dense 0..R-1 race index per row) in one vectorized pass.
+
+    Returns per-row arrays: risk_score, risk_label, position_change, verdict.
+    """
+    stops = np.asarray(stops, dtype=np.int64)
+    longest_stint = np.asarray(longest_stint, dtype=np.int64)
+    positions_gained = np.asarray(positions_gained, dtype=np.int64)
+    tyre_codes = np.asarray(tyre_codes, dtype=np.int64)
+    n = len(stops)
+    race_ids = np.zeros(n, dtype=np.int64) if race_ids is None else np.asarray(race_ids, dtype=np.int64)
+    finish = np.arange(n) + 1 if finish is None else np.asarray(finish, dtype=np.int64)
+    n_races = int(race_ids.max()) + 1 if n else 0
+
+    avg_stops = _group_mean(race_ids, stops, n_races)[race_ids]
+    avg_longest = _group_mean(race_ids, longest_stint, n_races)[race_ids]
+
+    if rules == "dashboard":
+        winner_stops = _group_first_by(race_ids, finish, stops, n_races)[race_ids]
+        risk = dashboard_risk(stops, positions_gained, avg_stops)
+        swap = dashboard_swap(stops, positions_gained, winner_stops)
+    elif rules == "precompute":
+        typical = _group_mode(race_ids, stops, n_races, mask=finish > 0)[race_ids]
+        risk = precompute_risk(stops, longest_stint, avg_stops, avg_longest)
+        swap = precompute_swap(stops, typical)
+    elif rules == "engine":
+        typical = _group_mode(race_ids, stops, n_races)[race_ids]
+        common = _group_mode(race_ids, tyre_codes, n_races)[race_ids]
+        risk = engine_risk(stops, longest_stint, positions_gained, tyre_codes,
+                           avg_stops, avg_longest, common)
+        swap = engine_swap(stops, longest_stint, tyre_codes, typical, avg_longest, common)
+    else:
+        raise ValueError(f"Unknown rule set: {rules}")
+
+    return {**risk, **swap}
+
+
+def field_arrays(races: List[dict]) -> Dict[str, np.ndarray]:
+    """Flatten race documents' `drivers` into score_field inputs (+ race_ids)."""
+    rows = [(i, d) for i, race in enumerate(races) for d in race.get("drivers", [])]
+    codes, _ = encode_tyre_sequences(d.get("tyre_sequence", []) for _, d in rows)
+    return {
+        "race_ids":         np.fromiter((i for i, _ in rows), dtype=np.int64, count=len(rows)),
+        "stops":            np.fromiter((d.get("stops", 0) for _, d in rows), dtype=np.int64, count=len(rows)),
+        "longest_stint":    np.fromiter((d.get("longest_stint", 0) for _, d in rows), dtype=np.int64, count=len(rows)),
+        "positions_gained": np.fromiter((d.get("positions_gained", 0) for _, d in rows), dtype=np.int64, count=len(rows)),
+        "finish":           np.fromiter((d.get("finish", 0) for _, d in rows), dtype=np.int64, count=len(rows)),
+        "tyre_codes":       codes,
+    }
+
+
+def py(value):
+    """NumPy scalar → plain Python (int when integral) for JSON responses."""
+    value = value.item() if hasattr(value, "item") else value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
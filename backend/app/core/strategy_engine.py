@@ -2,6 +2,8 @@ from typing import Dict, Any
 import pandas as pd
 import math
 
+from app.core import strategy_batch
+
 
 # ===========================
 # CORE DRIVER STRATEGY
@@ -56,38 +58,26 @@ def compute_strategy_risk(
     - Stint aggressiveness
     - Tyre strategy deviation
     - Net position outcome
-    """
-
-    risk = 0
-
-    # 1️⃣ Stop deviation
-    stop_diff = abs(driver["stops"] - race_context["avg_stops"])
-    risk += stop_diff * 15
-
-    # 2️⃣ Stint aggressiveness
-    if driver["longest_stint"] < race_context["avg_longest_stint"] - 5:
-        risk += 20
-
-    # 3️⃣ Tyre deviation
-    if driver["tyre_sequence"] != race_context["common_tyre_sequence"]:
-        risk += 15
-
-    # 4️⃣ Outcome validation
-    if driver["positions_gained"] < -3:
-        risk += 20
 
-    risk = min(100, risk)
-
-    if risk >= 65:
-        label = "High Risk"
-    elif risk >= 35:
-        label = "Balanced"
-    else:
-        label = "Conservative"
+    Per-driver wrapper over strategy_batch.engine_risk.
+    """
+    same_tyres = (
+        strategy_batch.tyre_key(driver["tyre_sequence"])
+        == strategy_batch.tyre_key(race_context["common_tyre_sequence"])
+    )
+    out = strategy_batch.engine_risk(
+        driver["stops"],
+        driver["longest_stint"],
+        driver["positions_gained"],
+        0 if same_tyres else 1,
+        race_context["avg_stops"],
+        race_context["avg_longest_stint"],
+        0,
+    )
 
     return {
-        "strategy_risk_score": risk,
-        "risk_label": label
+        "strategy_risk_score": strategy_batch.py(out["risk_score"]),
+        "risk_label": str(out["risk_label"])
     }
 
 
@@ -102,34 +92,25 @@ def simulate_strategy_swap(
     """
     Counterfactual simulation:
     'What if this driver ran the winning strategy?'
-    """
-
-    delta = 0
-
-    # Stops alignment
-    if driver["stops"] > winning_recipe["typical_stops"]:
-        delta += 2
-
-    # Stint alignment
-    if driver["longest_stint"] < winning_recipe["avg_longest_stint"]:
-        delta += 1
 
-    # Tyre alignment
-    if driver["tyre_sequence"] != winning_recipe["common_tyre_sequence"]:
-        delta += 1
-
-    if delta >= 3:
-        verdict = "Would likely gain multiple positions."
-    elif delta == 2:
-        verdict = "Would likely gain track position."
-    elif delta == 1:
-        verdict = "Marginal potential improvement."
-    else:
-        verdict = "Minimal or negative impact."
+    Per-driver wrapper over strategy_batch.engine_swap.
+    """
+    same_tyres = (
+        strategy_batch.tyre_key(driver["tyre_sequence"])
+        == strategy_batch.tyre_key(winning_recipe["common_tyre_sequence"])
+    )
+    out = strategy_batch.engine_swap(
+        driver["stops"],
+        driver["longest_stint"],
+        0 if same_tyres else 1,
+        winning_recipe["typical_stops"],
+        winning_recipe["avg_longest_stint"],
+        0,
+    )
 
     return {
-        "estimated_position_change": delta,
-        "verdict": verdict
+        "estimated_position_change": strategy_batch.py(out["position_change"]),
+        "verdict": str(out["verdict"])
     }
 
 
@@ -170,3 +151,34 @@ def derive_track_signals(drivers: list) -> Dict[str, Any]:
     }
 
     return signals
+
+
+# ===========================
+# TRACK STYLE PROFILE
+# ===========================
+
+def safe_mean(values):
+    vals = [v for v in values if isinstance(v, (int, float)) and not math.isnan(v)]
+    return sum(vals) / len(vals) if vals else None
+
+
+def compute_style_profile(drivers: list) -> list:
+    """Track personality tags from one race's finishers."""
+    finishers = [d for d in drivers if d["finish"] > 0]
+    if not finishers:
+        return []
+
+    avg_stint = safe_mean(d["longest_stint"] for d in finishers) or 0
+    avg_gain = safe_mean(d["positions_gained"] for d in finishers) or 0
+
+    tags = []
+    if avg_stint >= 28:
+        tags.append("Tyre Saving Track")
+    if avg_stint <= 20:
+        tags.append("High Degradation Track")
+    if avg_gain > 1.5:
+        tags.append("Overtaking Friendly")
+    if avg_gain < 0.5:
+        tags.append("Track Position Critical")
+
+    return tags
@@ -0,0 +1,149 @@
+"""
+Time-optimal pit strategy search.
+
+Uses the per-compound pace model from race_model. A stint of n laps on
+compound c (fresh tyres, ages 1..n) costs
+
+    n * base[c] + deg[c] * n * (n + 1) / 2
+
+so tyre age never has to be tracked lap by lap — it is the stint length. For
+every compound sequence allowed by the two-compound rule we run a k-best
+dynamic program over (stint, laps covered): the best K ways to cover l laps
+with the first i stints come from the best K ways to cover l - n laps with
+i - 1 stints plus one n-lap stint. Stint cost doesn't depend on its position
+in the race (fuel burn is the same for everyone), so sequences are only
+enumerated in one canonical order (softest first) and permutations of the
+same stints are collapsed.
+"""
+
+import time
+from itertools import combinations_with_replacement
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.race_model import DRY_COMPOUNDS
+
+MIN_STINT_LAPS = 5
+MAX_STOPS = 4
+
+
+def stint_costs(model: Dict[str, Any], compound: str, race_laps: int, min_stint: int) -> np.ndarray:
+    """cost[n] of an n-lap stint on fresh tyres (inf where n isn't allowed)."""
+    c = model["compounds"][compound]
+    n = np.arange(race_laps + 1, dtype=np.float64)
+    cost = n * c["base"] + c["deg"] * n * (n + 1) / 2
+    cost[(n < min_stint) | (n > c.get("max_stint", race_laps))] = np.inf
+    return cost
+
+
+def _k_best_splits(costs: Sequence[np.ndarray], race_laps: int, pit_loss: float, k: int):
+    """
+    k-best DP over (stint, laps covered) for one compound sequence.
+    Returns [(total_time, [stint lengths])] sorted by time.
+    """
+    L = race_laps
+    f = np.full((L + 1, k), np.inf)
+    f[0, 0] = 0.0
+    n = np.arange(1, L + 1)                        # candidate stint lengths
+    prev = np.arange(L + 1)[:, None] - n[None, :]  # laps covered before this stint
+    valid = prev >= 0
+    prev_c = np.where(valid, prev, 0)
+    pointers = []
+
+    for i, cost in enumerate(costs):
+        stint = np.where(valid, cost[n][None, :], np.inf) + (pit_loss if i else 0.0)
+        cand = (f[prev_c] + stint[:, :, None]).reshape(L + 1, -1)     # (laps, n * k)
+        keep = min(k, cand.shape[1])
+        best = np.argpartition(cand, keep - 1, axis=1)[:, :keep]
+        vals = np.take_along_axis(cand, best, axis=1)
+        order = np.argsort(vals, axis=1)
+        best = np.take_along_axis(best, order, axis=1)
+        f = np.full((L + 1, k), np.inf)
+        f[:, :keep] = np.take_along_axis(vals, order, axis=1)
+        pointers.append((n[best // k], best % k))                     # (stint length, prev rank)
+
+    out = []
+    for j in range(k):
+        total = f[L, j]
+        if not np.isfinite(total):
+            break
+        lengths, laps, rank = [], L, j
+        for step_n, step_rank in reversed(pointers):
+            length = int(step_n[laps, rank])
+            rank = int(step_rank[laps, rank])
+            lengths.append(length)
+            laps -= length
+        out.append((float(total), lengths[::-1]))
+    return out
+
+
+def optimal_strategies(
+    model: Dict[str, Any],
+    race_laps: Optional[int] = None,
+    top_k: int = 5,
+    max_stops: int = 3,
+    compounds: Optional[List[str]] = None,
+    min_stint: int = MIN_STINT_LAPS,
+    distinct: bool = True,
+) -> Dict[str, Any]:
+    """
+    Top-K strategies by predicted race time. With `distinct`, only the best
+    stop laps per compound plan are kept (otherwise neighbouring stop laps of
+    the same plan fill the list).
+    """
+    t0 = time.perf_counter()
+    race_laps = int(race_laps or model["total_laps"])
+    max_stops = max(1, min(max_stops, MAX_STOPS))
+    unknown = sorted(set(compounds or []) - set(DRY_COMPOUNDS))
+    if unknown:
+        raise ValueError(f"Unknown compounds: {', '.join(unknown)} (dry compounds: {', '.join(DRY_COMPOUNDS)})")
+    allowed = [c for c in DRY_COMPOUNDS if compounds is None or c in compounds]
+    if len(set(allowed)) < 2:
+        raise ValueError("At least two dry compounds are required (two-compound rule)")
+
+    costs = {c: stint_costs(model, c, race_laps, min_stint) for c in allowed}
+    pit_loss = model["pit_loss_s"]
+    fuel = model["fuel_effect_s_per_lap"] * race_laps * (race_laps - 1) / 2
+    buffer = 1 if distinct else top_k * 3   # room for permutations collapsed below
+
+    candidates = []
+    for stints in range(2, max_stops + 2):
+        for seq in combinations_with_replacement(allowed, stints):
+            if len(set(seq)) < 2:
+                continue
+            for total, lengths in _k_best_splits([costs[c] for c in seq], race_laps, pit_loss, buffer):
+                candidates.append((total - fuel, seq, lengths))
+
+    seen, ranked = set(), []
+    for total, seq, lengths in sorted(candidates, key=lambda x: x[0]):
+        key = seq if distinct else tuple(sorted(zip(seq, lengths)))
+        if key in seen:
+            continue
+        seen.add(key)
+        ranked.append((total, seq, lengths))
+        if len(ranked) == top_k:
+            break
+
+    best = ranked[0][0] if ranked else None
+    strategies = []
+    for total, seq, lengths in ranked:
+        stop_laps = np.cumsum(lengths)[:-1].tolist()
+        strategies.append({
+            "stops":               len(lengths) - 1,
+            "stop_laps":           [int(x) for x in stop_laps],
+            "compounds":           list(seq),
+            "stints":              [{"compound": c, "laps": n} for c, n in zip(seq, lengths)],
+            "predicted_time_s":    round(total, 3),
+            "delta_to_best_s":     round(total - best, 3),
+        })
+
+    return {
+        "season":      model["season"],
+        "round":       model["round"],
+        "race_laps":   race_laps,
+        "pit_loss_s":  pit_loss,
+        "max_stint":   {c: model["compounds"][c].get("max_stint") for c in allowed},
+        "strategies":  strategies,
+        "elapsed_ms":  round((time.perf_counter() - t0) * 1000, 1),
+    }
@@ -0,0 +1,149 @@
+"""
+Season team pace matrix.
+
+Each constructor's representative race pace per round: the median clean,
+fuel-corrected lap time of both cars, normalized to the fastest team of that
+round (gap in % — 0 = fastest). Computed for a whole season from the stored
+lap tables with one grouped median and an unstack:
+
+    teams × rounds    float32 gap_pct / pace_s, NaN where a team has no laps
+
+Stored compactly as computed_data/<year>/team_pace.json (row-major lists) and
+kept in memory as NumPy arrays, so any (teams, rounds) slice is an index.
+"""
+
+import json
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from app.core import lap_store, precomputed_loader
+from app.core.race_model import clean_laps
+
+MIN_TEAM_LAPS = 10
+
+
+def season_matrix(laps: pd.DataFrame) -> Dict[str, Any]:
+    """
+    laps: season lap table (lap_store.season_lap_table) with Round and Team.
+    Returns {"teams", "rounds", "pace_s", "gap_pct"} with team × round arrays.
+    """
+    empty = {"teams": [], "rounds": [], "pace_s": np.empty((0, 0), np.float32), "gap_pct": np.empty((0, 0), np.float32)}
+    if laps.empty:
+        return empty
+
+    teams = laps[["Round", "Driver", "Team"]].drop_duplicates(["Round", "Driver"])
+    clean = []
+    for rnd, race in laps.groupby("Round", sort=True):
+        c = clean_laps(race)
+        if not c.empty:
+            clean.append(c[["Driver", "fuel_corrected"]].assign(Round=rnd))
+    if not clean:
+        return empty
+    clean = pd.concat(clean, ignore_index=True).merge(teams, on=["Round", "Driver"], how="left")
+    clean = clean[clean["Team"].notna()]
+
+    g = clean.groupby(["Team", "Round"])["fuel_corrected"]
+    pace = g.median().where(g.size() >= MIN_TEAM_LAPS).unstack("Round").sort_index()
+    pace = pace.dropna(how="all").dropna(axis=1, how="all")
+    values = pace.to_numpy(dtype=np.float64)
+    gap = (values / np.nanmin(values, axis=0)[None, :] - 1.0) * 100.0
+
+    # fastest team on average first
+    order = np.argsort(np.nanmean(gap, axis=1), kind="stable")
+    return {
+        "teams":   [str(t) for t in pace.index[order]],
+        "rounds":  [int(r) for r in pace.columns],
+        "pace_s":  values[order].astype(np.float32),
+        "gap_pct": gap[order].astype(np.float32),
+    }
+
+
+# ---------------------------
+# Persistence (computed_data/<year>/team_pace.json)
+# ---------------------------
+
+def _path(year: int) -> str:
+    return os.path.join(precomputed_loader.DATA_DIR, str(year), "team_pace.json")
+
+
+def _rows(a: np.ndarray, digits: int) -> List[List[Optional[float]]]:
+    return [[None if np.isnan(v) else round(float(v), digits) for v in row] for row in a]
+
+
+def save_matrix(year: int, matrix: Dict[str, Any]):
+    path = _path(year)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({
+            "season":  year,
+            "teams":   matrix["teams"],
+            "rounds":  matrix["rounds"],
+            "pace_s":  _rows(matrix["pace_s"], 3),
+            "gap_pct": _rows(matrix["gap_pct"], 3),
+        }, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def get_matrix(year: int) -> Dict[str, Any]:
+    """Stored matrix, else computed from the season's stored lap tables."""
+    path = _path(year)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        stamps = tuple((rnd, lap_store.table_mtime(year, rnd)) for rnd in lap_store.stored_rounds(year))
+        return _computed_matrix(year, stamps)
+    return _read_matrix(path, mtime)
+
+
+@lru_cache(maxsize=8)
+def _computed_matrix(year: int, stamps: tuple) -> Dict[str, Any]:
+    # keyed by every lap table's mtime, so a new or rewritten race rebuilds it
+    return season_matrix(lap_store.season_lap_table(year, [rnd for rnd, _ in stamps]))
+
+
+@lru_cache(maxsize=8)
+def _read_matrix(path: str, mtime: float) -> Dict[str, Any]:
+    # keyed by mtime, so a rewritten file is re-read
+    with open(path) as f:
+        raw = json.load(f)
+    return {
+        "teams":   raw["teams"],
+        "rounds":  raw["rounds"],
+        "pace_s":  np.array(raw["pace_s"], dtype=np.float32).reshape(len(raw["teams"]), len(raw["rounds"])),
+        "gap_pct": np.array(raw["gap_pct"], dtype=np.float32).reshape(len(raw["teams"]), len(raw["rounds"])),
+    }
+
+
+def _pick(names: Sequence, wanted: Optional[Sequence]) -> np.ndarray:
+    if not wanted:
+        return np.arange(len(names))
+    lookup = {str(n).lower(): i for i, n in enumerate(names)}
+    missing = [w for w in wanted if str(w).lower() not in lookup]
+    if missing:
+        raise LookupError(f"Not in the matrix: {', '.join(map(str, missing))}")
+    return np.array([lookup[str(w).lower()] for w in wanted], dtype=np.int64)
+
+
+def matrix_slice(
+    year: int,
+    teams: Optional[Sequence[str]] = None,
+    rounds: Optional[Sequence[int]] = None,
+) -> Dict[str, Any]:
+    m = get_matrix(year)
+    ti, ri = _pick(m["teams"], teams), _pick(m["rounds"], rounds)
+    gap = m["gap_pct"][np.ix_(ti, ri)]
+    with np.errstate(all="ignore"):
+        avg = np.nanmean(gap, axis=1) if gap.size else np.array([])
+    return {
+        "season":  year,
+        "teams":   [m["teams"][i] for i in ti],
+        "rounds":  [m["rounds"][i] for i in ri],
+        "gap_pct": _rows(gap, 3),
+        "pace_s":  _rows(m["pace_s"][np.ix_(ti, ri)], 3),
+        "avg_gap_pct": [None if np.isnan(v) else round(float(v), 3) for v in avg],
+    }
@@ -1,11 +1,9 @@
 import os
-import fastf1
 from functools import lru_cache
 
-CACHE_DIR = os.path.join(os.getcwd(), ".fastf1-cache")
-os.makedirs(CACHE_DIR, exist_ok=True)
+from app.core import fastf1_cache
 
-fastf1.Cache.enable_cache(CACHE_DIR)
+TELEMETRY_SESSION_CACHE = int(os.getenv("TELEMETRY_SESSION_CACHE", "2"))
 
 
 @lru_cache(maxsize=32)
@@ -13,9 +11,38 @@ def load_session(year: int, round_number: int):
     """
     Loads and caches an F1 race session for given year + round.
     """
-    session = fastf1.get_session(year, round_number, 'R')  # 'R' = Race
-    session.load()
-    return session
+    return fastf1_cache.load_session(year, round_number, 'R')  # 'R' = Race
+
+
+@lru_cache(maxsize=32)
+def load_session_parts(
+    year: int,
+    round_number: int,
+    laps: bool = True,
+    weather: bool = False,
+    messages: bool = False,
+):
+    """
+    Loads only the requested parts of a race session (never car telemetry —
+    see load_telemetry_session). Cached per (race, parts) so analytics don't
+    pay for data they don't use.
+    """
+    return fastf1_cache.load_session(
+        year, round_number, 'R',
+        laps=laps, telemetry=False, weather=weather, messages=messages,
+    )
+
+
+@lru_cache(maxsize=TELEMETRY_SESSION_CACHE)
+def load_telemetry_session(year: int, round_number: int):
+    """
+    Race session with laps + car / position data for the whole field. That is
+    large, so only the last TELEMETRY_SESSION_CACHE sessions stay in memory.
+    """
+    return fastf1_cache.load_session(
+        year, round_number, 'R',
+        laps=True, telemetry=True, weather=False, messages=False,
+    )
 
 
 def get_race_basic_data(year: int, round_number: int):
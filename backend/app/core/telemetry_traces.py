@@ -0,0 +1,193 @@
+"""
+Per-lap car telemetry traces, downsampled for charts.
+
+Full car data is only ever loaded for the session being viewed (and only the
+last couple of such sessions are kept, see load_telemetry_session). Each
+requested (driver, lap) is cut out once and kept as compact typed arrays
+(float32 distance/time, uint16 speed/rpm, uint8 throttle/brake/gear/drs)
+in memory and under computed_data/<year>/telemetry/<round>/, along with the
+lap number "fastest" resolved to, so repeat requests never touch FastF1.
+
+Responses are reduced to a point budget with Largest-Triangle-Three-Buckets
+on the speed trace; every other channel is sampled at the same indices so
+the traces stay aligned.
+"""
+
+import json
+import os
+from functools import lru_cache
+from typing import Any, Dict, Union
+
+import numpy as np
+
+from app.core import precomputed_loader
+from app.core.telemetry_source import load_telemetry_session
+
+DEFAULT_POINTS = 400
+
+_CHANNELS = {
+    # name: (source column, dtype)
+    "distance": ("Distance", np.float32),
+    "time":     ("Time",     np.float32),
+    "speed":    ("Speed",    np.uint16),
+    "throttle": ("Throttle", np.uint8),
+    "brake":    ("Brake",    np.uint8),
+    "gear":     ("nGear",    np.uint8),
+    "rpm":      ("RPM",      np.uint16),
+    "drs":      ("DRS",      np.uint8),
+}
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n: int) -> np.ndarray:
+    """Indices of the n points Largest-Triangle-Three-Buckets keeps (first and last always)."""
+    size = len(x)
+    if n >= size or n < 3:
+        return np.arange(size)
+
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    every = (size - 2) / (n - 2)
+    edges = (np.floor(np.arange(n - 1) * every) + 1).astype(np.int64)   # bucket i = [edges[i], edges[i+1])
+    edges[-1] = size - 1
+
+    out = np.empty(n, dtype=np.int64)
+    out[0], out[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        start, end = edges[i], edges[i + 1]
+        nxt_end = edges[i + 2] if i + 2 < len(edges) else size
+        avg_x = x[end:nxt_end].mean()
+        avg_y = y[end:nxt_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+# ---------------------------
+# Compact per-lap arrays
+# ---------------------------
+
+def _path(year: int, round_number: int, driver: str, lap: int) -> str:
+    return os.path.join(precomputed_loader.DATA_DIR, str(year), "telemetry", str(round_number), f"{driver}_{lap}.npz")
+
+
+def _fastest_path(year: int, round_number: int, driver: str) -> str:
+    return os.path.join(precomputed_loader.DATA_DIR, str(year), "telemetry", str(round_number), f"{driver}_fastest.json")
+
+
+def _stored_fastest(year: int, round_number: int, driver: str):
+    path = _fastest_path(year, round_number, driver)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)["lap"]
+
+
+def _save_fastest(year: int, round_number: int, driver: str, lap: int):
+    path = _fastest_path(year, round_number, driver)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"lap": lap}, f)
+    os.replace(tmp, path)
+
+
+def _extract(year: int, round_number: int, driver: str, lap: Union[int, str]) -> Dict[str, Any]:
+    laps = load_telemetry_session(year, round_number).laps
+    driver_laps = laps.pick_drivers(driver)
+    if driver_laps.empty:
+        raise LookupError(f"No laps for driver {driver}")
+    if lap == "fastest":
+        row = driver_laps.pick_fastest()
+    else:
+        picked = driver_laps[driver_laps["LapNumber"] == int(lap)]
+        row = picked.iloc[0] if not picked.empty else None
+    if row is None:
+        raise LookupError(f"Lap {lap} not found for driver {driver}")
+
+    car = row.get_car_data().add_distance()
+    if car.empty:
+        raise LookupError(f"No car data for {driver} lap {int(row['LapNumber'])}")
+    arrays = {}
+    for name, (col, dtype) in _CHANNELS.items():
+        values = car[col]
+        if name == "time":
+            values = values.dt.total_seconds()
+        arrays[name] = np.nan_to_num(values.to_numpy(dtype=np.float64)).astype(dtype)
+    lap_time = row["LapTime"]
+    return {
+        "lap":      int(row["LapNumber"]),
+        "lap_time": round(lap_time.total_seconds(), 3) if lap_time == lap_time else None,
+        "compound": str(row.get("Compound")) if row.get("Compound") == row.get("Compound") else None,
+        "arrays":   arrays,
+    }
+
+
+def _save(year: int, round_number: int, driver: str, trace: Dict[str, Any]):
+    path = _path(year, round_number, driver, trace["lap"])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp.npz"
+    meta = np.array([trace["lap_time"] if trace["lap_time"] is not None else np.nan], dtype=np.float64)
+    np.savez_compressed(tmp, _lap_time=meta, _compound=np.array(trace["compound"] or ""), **trace["arrays"])
+    os.replace(tmp, path)
+
+
+def _load(year: int, round_number: int, driver: str, lap: int):
+    path = _path(year, round_number, driver, lap)
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as f:
+        lap_time = float(f["_lap_time"][0])
+        compound = str(f["_compound"])
+        return {
+            "lap":      lap,
+            "lap_time": None if np.isnan(lap_time) else lap_time,
+            "compound": compound or None,
+            "arrays":   {name: f[name] for name in _CHANNELS},
+        }
+
+
+@lru_cache(maxsize=256)
+def get_lap_trace(year: int, round_number: int, driver: str, lap: Union[int, str]) -> Dict[str, Any]:
+    """Full-resolution compact arrays for one lap (disk, else FastF1 → disk)."""
+    resolved = _stored_fastest(year, round_number, driver) if lap == "fastest" else int(lap)
+    if resolved is not None:
+        stored = _load(year, round_number, driver, resolved)
+        if stored is not None:
+            return stored
+    trace = _extract(year, round_number, driver, lap)
+    _save(year, round_number, driver, trace)
+    if lap == "fastest":
+        _save_fastest(year, round_number, driver, trace["lap"])
+    return trace
+
+
+def downsampled_trace(
+    year: int,
+    round_number: int,
+    driver: str,
+    lap: Union[int, str],
+    points: int = DEFAULT_POINTS,
+) -> Dict[str, Any]:
+    trace = get_lap_trace(year, round_number, driver.upper(), lap)
+    arrays = trace["arrays"]
+    idx = lttb(arrays["distance"], arrays["speed"], points)
+
+    channels = {}
+    for name, values in arrays.items():
+        picked = values[idx]
+        channels[name] = (
+            np.round(picked.astype(np.float64), 1 if name == "distance" else 3).tolist()
+            if values.dtype.kind == "f" else picked.tolist()
+        )
+    return {
+        "season":        year,
+        "round":         round_number,
+        "driver":        driver.upper(),
+        "lap":           trace["lap"],
+        "lap_time":      trace["lap_time"],
+        "compound":      trace["compound"],
+        "points":        int(len(idx)),
+        "source_points": int(len(arrays["speed"])),
+        "channels":      channels,
+    }
@@ -0,0 +1,228 @@
+"""
+Per-circuit historical intelligence.
+
+Each stored race is reduced once to a small signal record (strategy_engine's
+derive_track_signals + compute_style_profile, plus stint / stop / overtaking
+averages) and filed under its circuit. A circuit profile aggregates those
+records across seasons — typical stops, stint lengths, overtaking and the
+degradation trend by year — without loading any session or race document.
+
+Kept current from the race store like the driver index; a re-loaded race
+replaces its earlier record.
+"""
+
+import os
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from app.core.race_store import backfill, race_store
+from app.core.strategy_engine import compute_style_profile, derive_track_signals, safe_mean
+
+TRACK_INDEX_REFRESH_S = float(os.getenv("TRACK_INDEX_REFRESH_S", "300"))
+
+
+def circuit_key(location: str) -> str:
+    """'Monte Carlo' → 'monte-carlo'"""
+    return re.sub(r"[^a-z0-9]+", "-", (location or "").lower()).strip("-")
+
+
+def _finishers(doc: Dict[str, Any]) -> List[Dict[str, Any]]:
+    out = []
+    for d in doc.get("drivers", []):
+        finish = d.get("finish")
+        if not isinstance(finish, int) or not 0 < finish < 99:
+            continue
+        if not all(isinstance(d.get(k), (int, float)) for k in ("stops", "longest_stint", "positions_gained")):
+            continue
+        out.append(d)
+    return sorted(out, key=lambda d: d["finish"])
+
+
+def race_record(doc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """One race → the signals a circuit profile is built from."""
+    finishers = _finishers(doc)
+    if not finishers:
+        return None
+    winner = finishers[0]
+
+    def avg(key):
+        return round(safe_mean(d.get(key) for d in finishers) or 0, 2)
+
+    return {
+        "season":                doc.get("season"),
+        "round":                 doc.get("round"),
+        "event_name":            doc.get("event_name"),
+        "location":              doc.get("location"),
+        "avg_stops":             avg("stops"),
+        "avg_longest_stint":     avg("longest_stint"),
+        "avg_positions_gained":  avg("positions_gained"),
+        "avg_degradation_index": avg("tyre_degradation_index"),
+        "winner":                winner.get("driver_code"),
+        "winner_stops":          winner.get("stops"),
+        "winner_sequence":       list(winner.get("tyre_sequence") or []),
+        "signals":               derive_track_signals(finishers),
+        "style_profile":         compute_style_profile(finishers),
+    }
+
+
+def _majority(values: List[str]) -> Optional[str]:
+    return Counter(values).most_common(1)[0][0] if values else None
+
+
+def _trend(points: List[tuple]) -> str:
+    """Least-squares slope of longest-stint length by season; shorter stints = rising degradation."""
+    if len(points) < 2:
+        return "Insufficient data"
+    n = len(points)
+    mx = sum(x for x, _ in points) / n
+    my = sum(y for _, y in points) / n
+    sxx = sum((x - mx) ** 2 for x, _ in points)
+    slope = sum((x - mx) * (y - my) for x, y in points) / sxx if sxx else 0.0
+    if slope <= -1.0:
+        return "Rising"
+    if slope >= 1.0:
+        return "Falling"
+    return "Stable"
+
+
+def circuit_profile(key: str, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    records = sorted(records, key=lambda r: (r["season"], r["round"]))
+    latest = records[-1]
+
+    by_year = []
+    for season in sorted({r["season"] for r in records}):
+        rows = [r for r in records if r["season"] == season]
+        by_year.append({
+            "season":                season,
+            "avg_stops":             round(safe_mean(r["avg_stops"] for r in rows), 2),
+            "avg_longest_stint":     round(safe_mean(r["avg_longest_stint"] for r in rows), 2),
+            "avg_positions_gained":  round(safe_mean(r["avg_positions_gained"] for r in rows), 2),
+            "avg_degradation_index": round(safe_mean(r["avg_degradation_index"] for r in rows), 2),
+            "degradation_level":     _majority([r["signals"].get("degradation_level") for r in rows]),
+            "winner":                rows[-1]["winner"],
+        })
+
+    avg_gain = safe_mean(r["avg_positions_gained"] for r in records)
+    tag_counts = Counter(t for r in records for t in r["style_profile"])
+
+    return {
+        "circuit":              key,
+        "location":             latest["location"],
+        "event_name":           latest["event_name"],
+        "races":                len(records),
+        "seasons":              [y["season"] for y in by_year],
+        "typical_stops":        _majority([r["winner_stops"] for r in records]),
+        "avg_stops":            round(safe_mean(r["avg_stops"] for r in records), 2),
+        "avg_longest_stint":    round(safe_mean(r["avg_longest_stint"] for r in records), 2),
+        "avg_positions_gained": round(avg_gain, 2),
+        "overtake_difficulty":  "Easy" if avg_gain > 1.5 else "Moderate" if avg_gain >= 0.5 else "Hard",
+        "degradation_level":    _majority([r["signals"].get("degradation_level") for r in records]),
+        "overtaking_pressure":  _majority([r["signals"].get("overtaking_pressure") for r in records]),
+        "corner_stress":        _majority([r["signals"].get("corner_stress") for r in records]),
+        "common_winning_sequence": _majority([" → ".join(r["winner_sequence"]) for r in records if r["winner_sequence"]]),
+        "style_profile":        [t for t, n in tag_counts.most_common() if n * 2 >= len(records)],
+        "degradation_trend":    _trend([(y["season"], y["avg_longest_stint"]) for y in by_year]),
+        "by_year":              by_year,
+    }
+
+
+# ===========================
+# INDEX
+# ===========================
+
+class TrackIndex:
+    def __init__(self):
+        self.records: Dict[str, Dict[tuple, Dict[str, Any]]] = {}   # circuit → (season, round) → record
+        self._circuit_of: Dict[tuple, Optional[str]] = {}
+        self._profiles: Dict[str, Dict[str, Any]] = {}              # memoized, dropped on change
+        self._lock = threading.RLock()
+        self.refreshed_at = 0.0
+
+    def add_race(self, season: int, round_number: int, doc: Dict[str, Any]):
+        record = race_record(doc)
+        key = circuit_key(doc.get("location") or doc.get("event_name"))
+        with self._lock:
+            old = self._circuit_of.pop((season, round_number), None)
+            if old:
+                self.records[old].pop((season, round_number), None)
+                self._profiles.pop(old, None)
+            if record is None or not key:
+                # remembered (as None) so backfill doesn't reload it
+                self._circuit_of[(season, round_number)] = None
+                return
+            self.records.setdefault(key, {})[(season, round_number)] = record
+            self._circuit_of[(season, round_number)] = key
+            self._profiles.pop(key, None)
+
+    def has_race(self, season: int, round_number: int) -> bool:
+        return (season, round_number) in self._circuit_of
+
+    def circuits(self) -> List[str]:
+        with self._lock:
+            return sorted(k for k, recs in self.records.items() if recs)
+
+    def profile(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if key not in self._profiles:
+                records = list(self.records.get(key, {}).values())
+                if not records:
+                    return None
+                self._profiles[key] = circuit_profile(key, records)
+            return self._profiles[key]
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Circuit key from a slug, location or event name."""
+        key = circuit_key(name)
+        with self._lock:
+            if self.records.get(key):
+                return key
+            for circuit, recs in self.records.items():
+                if any(circuit_key(r["event_name"]) == key for r in recs.values()):
+                    return circuit
+        return None
+
+
+track_index = TrackIndex()
+_build_lock = threading.Lock()
+
+
+def refresh(force: bool = False) -> TrackIndex:
+    """Add stored races the index hasn't seen (at most every TRACK_INDEX_REFRESH_S)."""
+    now = time.monotonic()
+    if not force and track_index.refreshed_at and now - track_index.refreshed_at < TRACK_INDEX_REFRESH_S:
+        return track_index
+    with _build_lock:
+        if not force and track_index.refreshed_at and now - track_index.refreshed_at < TRACK_INDEX_REFRESH_S:
+            return track_index
+        backfill(track_index.has_race, track_index.add_race)
+        track_index.refreshed_at = time.monotonic()
+    return track_index
+
+
+def list_tracks() -> List[Dict[str, Any]]:
+    index = refresh()
+    out = []
+    for key in index.circuits():
+        p = index.profile(key)
+        out.append({
+            "circuit":             key,
+            "location":            p["location"],
+            "event_name":          p["event_name"],
+            "races":               p["races"],
+            "seasons":             p["seasons"],
+            "degradation_level":   p["degradation_level"],
+            "overtake_difficulty": p["overtake_difficulty"],
+        })
+    return out
+
+
+def get_track(name: str) -> Optional[Dict[str, Any]]:
+    index = refresh()
+    key = index.resolve(name)
+    return index.profile(key) if key else None
+
+
+race_store.subscribe(track_index.add_race)
@@ -0,0 +1,172 @@
+"""
+Season-wide tyre degradation fits.
+
+Fits degradation slopes (seconds lost per lap of tyre age) from clean,
+fuel-corrected laps for every stint of a season in one pass:
+
+  1. per stint: Σx, Σy, Σxy, Σx², n via one grouped sum (x = TyreLife, y = lap time)
+  2. per (race, compound): pooled within-stint least squares
+         slope = Σ Sxy / Σ Sxx      (Sxy = Σxy − ΣxΣy/n, per stint)
+     i.e. one line per compound with a free intercept per stint, so driver
+     pace and car differences don't leak into the slope.
+  3. per (race, driver): the same estimator over the driver's stints,
+     compared with the race-compound slopes → 0–100 tyre degradation index
+     (higher = better tyre life, as in the race documents).
+"""
+
+import json
+import os
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core import precomputed_loader
+from app.core.race_model import clean_laps
+
+MIN_STINT_LAPS = 5
+INDEX_SCALE = 500      # 0.1 s/lap worse than the field → index 0
+
+
+def _stint_sums(clean: pd.DataFrame) -> pd.DataFrame:
+    x = clean["TyreLife"].to_numpy(dtype=np.float64)
+    y = clean["fuel_corrected"].to_numpy(dtype=np.float64)
+    frame = pd.DataFrame({
+        "Round": clean["Round"].to_numpy(),
+        "Driver": clean["Driver"].to_numpy(),
+        "Stint": clean["Stint"].to_numpy(),
+        "Compound": clean["Compound"].to_numpy(),
+        "n": 1.0, "sx": x, "sy": y, "sxy": x * y, "sxx": x * x,
+    })
+    s = frame.groupby(["Round", "Driver", "Stint", "Compound"], sort=False).sum().reset_index()
+    s = s[s["n"] >= MIN_STINT_LAPS]
+    s["Sxy"] = s["sxy"] - s["sx"] * s["sy"] / s["n"]
+    s["Sxx"] = s["sxx"] - s["sx"] ** 2 / s["n"]
+    return s[s["Sxx"] > 0]
+
+
+def _pooled(stints: pd.DataFrame, keys) -> pd.DataFrame:
+    g = stints.groupby(keys, sort=True)[["n", "sx", "sy", "Sxy", "Sxx"]].sum()
+    g["stints"] = stints.groupby(keys, sort=True).size()
+    g["slope"] = g["Sxy"] / g["Sxx"]
+    # fuel-corrected lap time on fresh tyres (TyreLife = 1), averaged over stints
+    g["base"] = (g["sy"] - g["slope"] * g["sx"]) / g["n"] + g["slope"]
+    return g.reset_index()
+
+
+def fit_season(laps: pd.DataFrame) -> Dict[str, Any]:
+    """
+    laps: season lap table (lap_store.season_lap_table) with a Round column.
+    Returns {"rounds": {round: {"compounds": {...}, "drivers": {...}}}}.
+    """
+    if laps.empty:
+        return {"rounds": {}}
+
+    # clean_laps keeps Driver/LapNumber/... — carry Round through the same mask
+    clean = []
+    for rnd, race in laps.groupby("Round", sort=True):
+        c = clean_laps(race)
+        if not c.empty:
+            clean.append(c.assign(Round=rnd))
+    if not clean:
+        return {"rounds": {}}
+    stints = _stint_sums(pd.concat(clean, ignore_index=True))
+    if stints.empty:
+        return {"rounds": {}}
+
+    by_compound = _pooled(stints, ["Round", "Compound"])
+
+    # driver slope relative to the field: residual of each stint vs its race-compound slope
+    field_slope = by_compound.set_index(["Round", "Compound"])["slope"]
+    stints = stints.assign(field_slope=field_slope.reindex(
+        pd.MultiIndex.from_frame(stints[["Round", "Compound"]])
+    ).to_numpy())
+    stints["excess"] = stints["Sxy"] - stints["field_slope"] * stints["Sxx"]
+    drv = stints.groupby(["Round", "Driver"], sort=True)[["excess", "Sxx", "n"]].sum().reset_index()
+    drv["relative_slope"] = drv["excess"] / drv["Sxx"]
+    drv["index"] = np.clip(np.round(50 - drv["relative_slope"] * INDEX_SCALE), 0, 100).astype(int)
+
+    rounds: Dict[str, Any] = {}
+    for row in by_compound.itertuples(index=False):
+        r = rounds.setdefault(str(int(row.Round)), {"compounds": {}, "drivers": {}})
+        r["compounds"][row.Compound] = {
+            "slope_s_per_lap": round(float(row.slope), 4),
+            "base_s":          round(float(row.base), 3),
+            "stints":          int(row.stints),
+            "laps":            int(row.n),
+        }
+    for row in drv.itertuples(index=False):
+        r = rounds.setdefault(str(int(row.Round)), {"compounds": {}, "drivers": {}})
+        r["drivers"][str(row.Driver)] = {
+            "relative_slope_s_per_lap": round(float(row.relative_slope), 4),
+            "tyre_degradation_index":   int(row.index),
+            "laps":                     int(row.n),
+        }
+    return {"rounds": rounds}
+
+
+def driver_indices(laps: pd.DataFrame) -> Dict[str, int]:
+    """{driver: tyre_degradation_index} for a single race's lap table."""
+    fit = fit_season(laps.assign(Round=0))["rounds"].get("0", {})
+    return {code: d["tyre_degradation_index"] for code, d in fit.get("drivers", {}).items()}
+
+
+# ---------------------------
+# Persistence (next to computed_data/<year>/race_N.json)
+# ---------------------------
+
+def _path(year: int) -> str:
+    return os.path.join(precomputed_loader.DATA_DIR, str(year), "tyre_degradation.json")
+
+
+def _write_fit(year: int, doc: Dict[str, Any]):
+    path = _path(year)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(doc, f)
+    os.replace(tmp, path)
+
+
+def save_season_fit(year: int, fit: Dict[str, Any]):
+    _write_fit(year, {"season": year, **fit})
+
+
+def save_race_fit(year: int, round_number: int, race_fit: Dict[str, Any]):
+    """Add one race to the stored season fit (races are fitted independently)."""
+    path = _path(year)
+    doc = _read_fit(path, os.path.getmtime(path)) if os.path.exists(path) else None
+    doc = dict(doc or {"season": year, "rounds": {}})
+    doc["rounds"] = {**doc.get("rounds", {}), str(round_number): race_fit}
+    _write_fit(year, doc)
+
+
+def load_season_fit(year: int) -> Optional[Dict[str, Any]]:
+    """Stored season fit; re-read whenever the file is rewritten (e.g. by a refit)."""
+    path = _path(year)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    return _read_fit(path, mtime)
+
+
+@lru_cache(maxsize=8)
+def _read_fit(path: str, mtime: float) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def race_degradation(year: int, round_number: int) -> Optional[Dict[str, Any]]:
+    """Stored fit for one race, or fit that race alone from its lap table and store it."""
+    fit = load_season_fit(year)
+    if fit and str(round_number) in fit["rounds"]:
+        return fit["rounds"][str(round_number)]
+
+    from app.core.lap_store import get_lap_table
+    laps = get_lap_table(year, round_number).assign(Round=round_number)
+    race_fit = fit_season(laps)["rounds"].get(str(round_number))
+    if race_fit:
+        save_race_fit(year, round_number, race_fit)
+    return race_fit
@@ -5,6 +5,37 @@ from dotenv import load_dotenv
 load_dotenv()
 
 MONGO_URI = os.getenv("MONGO_URI_NEW")
+MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "f1_strathub")
+
+# ---------------------------------------------------------------------------
+# Pool & timeout tuning (shared by the sync and async clients)
+# ---------------------------------------------------------------------------
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "10"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "10000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "0")) or None
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "0")) or None
+
+
+def _client_options() -> dict:
+    return {
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS":         MONGO_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS":          MONGO_SOCKET_TIMEOUT_MS,
+        "maxPoolSize":              MONGO_MAX_POOL_SIZE,
+        "minPoolSize":              MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS":            MONGO_MAX_IDLE_TIME_MS,
+    }
+
+
+def _not_configured():
+    from fastapi import HTTPException
+    return HTTPException(
+        status_code=503,
+        detail="❌ MongoDB not configured. Add MONGO_URI_NEW to backend/.env"
+    )
+
 
 # ---------------------------------------------------------------------------
 # Lazy DB proxy — server starts even without MONGO_URI_NEW.
@@ -18,22 +49,36 @@ class _LazyDB:
     def _connect(self):
         if self._db is None:
             if not MONGO_URI:
-                from fastapi import HTTPException
-                raise HTTPException(
-                    status_code=503,
-                    detail="❌ MongoDB not configured. Add MONGO_URI_NEW to backend/.env"
-                )
-            self._client = MongoClient(
-                MONGO_URI,
-                serverSelectionTimeoutMS=5000,
-                maxPoolSize=10,
-            )
-            self._db = self._client["f1_strathub"]
+                raise _not_configured()
+            self._client = MongoClient(MONGO_URI, **_client_options())
+            self._db = self._client[MONGO_DB_NAME]
         return self._db
 
     def __getattr__(self, name):
         return getattr(self._connect(), name)
 
 
-db = _LazyDB()
+# ---------------------------------------------------------------------------
+# Lazy async proxy (Motor) — same contract as _LazyDB, but queries are
+# awaited on the event loop instead of holding a threadpool thread.
+# ---------------------------------------------------------------------------
+class _LazyAsyncDB:
+    """Proxy that defers AsyncIOMotorClient creation until first attribute access."""
+    _client = None
+    _db = None
+
+    def _connect(self):
+        if self._db is None:
+            if not MONGO_URI:
+                raise _not_configured()
+            from motor.motor_asyncio import AsyncIOMotorClient
+            self._client = AsyncIOMotorClient(MONGO_URI, **_client_options())
+            self._db = self._client[MONGO_DB_NAME]
+        return self._db
 
+    def __getattr__(self, name):
+        return getattr(self._connect(), name)
+
+
+db = _LazyDB()
+async_db = _LazyAsyncDB()
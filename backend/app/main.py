@@ -1,8 +1,10 @@
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 
-from app.routers import races, tracks, seasons
+from app.routers import races, tracks, seasons, simulation, drivers
+from app.core import metrics
 from app.core.precomputed_loader import list_seasons
 
 app = FastAPI(
@@ -33,6 +35,11 @@ async def root_health_check():
         "message": "F1 Analytics API Gateway Operational"
     }
 
+# -----------------------------
+# Metrics (per-route latency / payload size, exposed on /metrics)
+# -----------------------------
+app.add_middleware(metrics.MetricsMiddleware)
+
 # -----------------------------
 # CORS
 # -----------------------------
@@ -48,11 +55,15 @@ app.add_middleware(
 app.include_router(races.router, prefix="/api")
 app.include_router(tracks.router, prefix="/api")
 app.include_router(seasons.router, prefix="/api")
+app.include_router(simulation.router, prefix="/api")
+app.include_router(drivers.router, prefix="/api")
 
 # without /api (ADD THIS)
 app.include_router(races.router)
 app.include_router(tracks.router)
 app.include_router(seasons.router)
+app.include_router(simulation.router)
+app.include_router(drivers.router)
 
 # -----------------------------
 # Warm cache on startup
@@ -70,3 +81,11 @@ def warm_cache():
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+
+# -----------------------------
+# Prometheus metrics
+# -----------------------------
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,73 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.core.driver_index import dna, get_profile, insight, list_drivers
+from app.core.head_to_head import compare, resolve_races
+
+router = APIRouter(tags=["drivers"])
+
+
+def _profile(code: str):
+    try:
+        profile = get_profile(code)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to load driver index: {e}")
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Driver {code.upper()} not found")
+    return profile
+
+
+@router.get("/drivers")
+def drivers():
+    """Every driver in the stored seasons with a headline rating."""
+    try:
+        return list_drivers()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/drivers/compare")
+def drivers_compare(
+    drivers: str = Query(..., description="Comma-separated driver codes, e.g. VER,HAM"),
+    season: Optional[int] = None,
+    circuit: Optional[str] = None,
+    races: Optional[str] = Query(None, description="Comma-separated season-round pairs, e.g. 2023-1,2023-5"),
+):
+    """Head-to-head over a season, a circuit across seasons, or an explicit race list."""
+    codes = [c.strip().upper() for c in drivers.split(",") if c.strip()]
+    if len(codes) < 2:
+        raise HTTPException(status_code=400, detail="Give at least two driver codes")
+    try:
+        explicit = [tuple(int(x) for x in r.split("-")) for r in races.split(",")] if races else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="races must look like 2023-1,2023-5")
+    if explicit and any(len(r) != 2 for r in explicit):
+        raise HTTPException(status_code=400, detail="races must look like 2023-1,2023-5")
+
+    race_set = resolve_races(season=season, circuit=circuit, races=explicit)
+    if not race_set:
+        raise HTTPException(status_code=404, detail="No races match the selection")
+    try:
+        return compare(codes, race_set)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/drivers/{code}")
+def driver_profile(code: str):
+    """Career + per-season aggregates, answered from the driver index."""
+    return _profile(code)
+
+
+@router.get("/drivers/{code}/dna")
+def driver_dna(code: str):
+    return dna(_profile(code))
+
+
+@router.get("/ai/driver/{code}", tags=["AI Analytics"])
+def driver_insight(code: str):
+    """
+    Maps to frontend call: /api/ai/driver/VER
+    """
+    return insight(_profile(code))
@@ -1,6 +1,16 @@
-from fastapi import APIRouter, HTTPException
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from app.core.telemetry_source import get_race_basic_data, get_driver_laps
 from app.core.strategy_engine import analyze_driver_strategy
+from app.core.standings import get_standings
+from app.core.race_insights import get_insights
+from app.core.incidents import get_timeline
+from app.core.telemetry_traces import DEFAULT_POINTS, downsampled_trace
+from app.core.race_progress import progress_binary, progress_json
+from app.core.sector_analysis import get_sector_analysis
+from app.core import race_table, race_replay
 
 # By removing the prefix parameter, we define explicitly clear, independent paths.
 router = APIRouter(tags=["races"])
@@ -11,6 +21,27 @@ def ping():
     return {"message": "races router alive"}
 
 
+@router.get("/races/query", tags=["Query"])
+def query_races(
+    filter: List[str] = Query([], description="e.g. is_winner=true, stops=1, positions_gained>5, strategy=HARD-MEDIUM"),
+    group_by: List[str] = Query([], description="Columns to group by, e.g. driver"),
+    agg: List[str] = Query(["count"], description="count | sum:<col> | mean:<col> | min:<col> | max:<col>"),
+    select: List[str] = Query([], description="Columns to return for row results (default: all)"),
+    sort: Optional[str] = Query(None, description="Output field to sort by, prefix '-' for descending"),
+    limit: int = Query(100, ge=1, le=race_table.MAX_ROWS),
+):
+    """
+    Filter / aggregate over every (season, round, driver) row of the stored
+    race documents, answered from the in-memory columnar race table.
+    """
+    try:
+        return race_table.query(filters=filter, group_by=group_by, aggs=agg, select=select, sort=sort, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/races/{year}/{round_number}/summary")
 def race_summary(year: int, round_number: int):
     try:
@@ -36,28 +67,122 @@ def driver_strategy(year: int, round_number: int, driver_code: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/races/{year}/{round_number}/incidents")
+def race_incidents(year: int, round_number: int):
+    """
+    Time-ordered SC / VSC / red flag / penalty / retirement events aligned to laps.
+    Extracted once from race control messages + track status, then served from disk.
+    """
+    try:
+        return get_timeline(year, round_number)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/races/{year}/{round_number}/sectors")
+def race_sectors(year: int, round_number: int):
+    """
+    Best sectors, theoretical best, gap to ideal and sector consistency for
+    every driver, plus the field-wide ideal lap. Stored with the race.
+    """
+    try:
+        return {"season": year, "round": round_number, **get_sector_analysis(year, round_number)}
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/races/{year}/{round_number}/telemetry/{driver_code}/{lap}")
+def lap_telemetry(
+    year: int,
+    round_number: int,
+    driver_code: str,
+    lap: str,
+    points: int = Query(DEFAULT_POINTS, ge=10, le=5000, description="Point budget per channel (LTTB)"),
+):
+    """
+    Speed / throttle / brake / gear / rpm / DRS traces vs distance for one lap
+    (a lap number or 'fastest'), downsampled server-side.
+    """
+    if lap != "fastest" and not lap.isdigit():
+        raise HTTPException(status_code=422, detail="lap must be a lap number or 'fastest'")
+    try:
+        return downsampled_trace(year, round_number, driver_code, lap if lap == "fastest" else int(lap), points)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/races/{year}/{round_number}/progress")
+def race_progress(
+    year: int,
+    round_number: int,
+    format: str = Query("json", pattern="^(json|binary)$"),
+):
+    """
+    Position and gap-to-leader for every driver on every lap, compactly encoded
+    (see app/core/race_progress.py). format=binary returns the raw buffers.
+    """
+    try:
+        if format == "binary":
+            body, headers = progress_binary(year, round_number)
+            return Response(content=body, media_type="application/octet-stream", headers=headers)
+        return progress_json(year, round_number)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # -------------------------------------------------------------
 # 🛠️ FIXED COUPLING ENDPOINTS (MATCHES FRONTEND AXIOS EXPECTATIONS)
 # -------------------------------------------------------------
 
+@router.get("/races/{year}/{round_number}/replay")
+async def race_replay_stream(
+    year: int,
+    round_number: int,
+    speed: float = Query(1.0, ge=0, le=1000, description="Replay rate vs real time (0 = no pauses)"),
+    from_lap: int = Query(1, ge=1, description="Start with a full-state snapshot of this lap"),
+):
+    """
+    Server-Sent Events replay, one event per lap carrying only what changed
+    (positions, gaps, pit stops, tyre changes). The replay is computed once
+    per race and shared by every subscriber.
+    """
+    try:
+        await race_replay.get_replay(year, round_number)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return StreamingResponse(
+        race_replay.stream(year, round_number, speed, from_lap),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/race-insights/{year}/{round_number}", tags=["Race Insights"])
-def get_race_insights(year: int, round_number: int):
+def get_race_insights(
+    year: int,
+    round_number: int,
+    sections: Optional[str] = Query(
+        None,
+        description="Comma-separated sections, e.g. weather,incidents (default: all but telemetry)",
+    ),
+):
     """
     Maps perfectly to frontend call: /api/race-insights/2025/3
+    Each section loads only the FastF1 data it needs and is cached on its own.
     """
+    wanted = [s.strip() for s in sections.split(",") if s.strip()] if sections else None
     try:
-        return {
-            "pit_strategy": {
-                "avg_pit_time": "2.4s",
-                "tyre_sequences": {}
-            },
-            "telemetry": {},
-            "incidents": {},
-            "weather": {},
-            "track_profile": {},
-            "event_info": {},
-            "ai_performance": {}
-        }
+        return get_insights(year, round_number, wanted)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -76,14 +201,15 @@ def get_ai_race_analysis(year: int, round_number: int):
 
 
 @router.get("/standings/{year}", tags=["Standings"])
-def get_season_standings(year: int):
+def get_season_standings(
+    year: int,
+    after_round: Optional[int] = Query(None, ge=1, description="Standings as they stood after this round"),
+):
     """
     Maps perfectly to frontend call: /api/standings/2025
+    Driver + constructor standings from the in-memory incremental aggregate.
     """
     try:
-        return {
-            "year": year,
-            "standings": []
-        }
+        return get_standings(year, after_round)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,89 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.core.race_model import get_race_model
+from app.core.race_simulator import simulate
+from app.core.strategy_optimizer import optimal_strategies
+
+router = APIRouter(prefix="/simulation", tags=["simulation"])
+
+
+def _model(year: int, round_number: int):
+    try:
+        return get_race_model(year, round_number)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to build race model: {e}")
+
+
+def _csv_ints(raw: str):
+    try:
+        return [int(x) for x in raw.split(",") if x.strip()]
+    except ValueError:
+        raise HTTPException(status_code=422, detail="stops must be comma-separated lap numbers")
+
+
+@router.get("/{year}/{round_number}/model")
+def race_model(year: int, round_number: int):
+    """Per-compound pace & degradation, pit loss and SC likelihood for one race."""
+    return _model(year, round_number)
+
+
+@router.get("/{year}/{round_number}/optimal")
+def optimal_strategy(
+    year: int,
+    round_number: int,
+    top_k: int = Query(5, ge=1, le=20),
+    max_stops: int = Query(3, ge=1, le=4),
+    race_laps: Optional[int] = Query(None, ge=10, le=100),
+    compounds: Optional[str] = Query(None, description="Allowed dry compounds, e.g. MEDIUM,HARD"),
+    distinct: bool = Query(True, description="One entry per compound plan"),
+):
+    """Time-optimal strategies (stops, stop laps, compound order) for this race's tyre model."""
+    model = _model(year, round_number)
+    allowed = [c.strip().upper() for c in compounds.split(",") if c.strip()] if compounds else None
+    try:
+        return optimal_strategies(
+            model,
+            race_laps=race_laps,
+            top_k=top_k,
+            max_stops=max_stops,
+            compounds=allowed,
+            distinct=distinct,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@router.get("/{year}/{round_number}")
+def simulate_strategy(
+    year: int,
+    round_number: int,
+    compounds: str = Query(..., description="Compound per stint, e.g. MEDIUM,HARD"),
+    stops: str = Query("", description="Pit-stop laps, e.g. 22"),
+    driver: Optional[str] = Query(None, description="Driver whose pace/grid slot the strategy replaces"),
+    runs: int = Query(10_000, ge=100, le=50_000),
+    seed: Optional[int] = None,
+):
+    """
+    Monte Carlo finishing-position distribution for a candidate strategy,
+    e.g. /simulation/2023/1?driver=HAM&stops=18,38&compounds=SOFT,HARD,MEDIUM
+    """
+    model = _model(year, round_number)
+    driver_code = driver.upper() if driver else None
+    if driver_code and driver_code not in model["drivers"]:
+        raise HTTPException(status_code=404, detail=f"Driver {driver_code} has no complete race data")
+
+    try:
+        return simulate(
+            model,
+            _csv_ints(stops),
+            [c for c in compounds.split(",") if c.strip()],
+            driver_code=driver_code,
+            runs=runs,
+            seed=seed,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
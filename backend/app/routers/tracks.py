@@ -1,7 +1,33 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
+
+from app.core.track_intel import get_track, list_tracks
 
 router = APIRouter(prefix="/tracks", tags=["tracks"])
 
 @router.get("/ping")
 def ping():
     return {"message": "tracks router alive"}
+
+
+@router.get("")
+def tracks():
+    """Every circuit in the stored seasons with its headline personality."""
+    try:
+        return list_tracks()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{circuit}")
+def track(circuit: str):
+    """
+    Historical profile for one circuit (slug, location or event name),
+    e.g. /tracks/monza or /tracks/italian-grand-prix
+    """
+    try:
+        profile = get_track(circuit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to load track index: {e}")
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"No stored races for circuit '{circuit}'")
+    return profile
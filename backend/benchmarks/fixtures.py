@@ -0,0 +1,190 @@
+"""
+Offline FastF1 stand-in for benchmarks.
+
+`FakeSession` has the parts of a loaded race session the backend reads —
+laps (with pick_drivers / pick_driver / pick_fastest), results, event,
+weather, race control messages — generated deterministically from a seed:
+a 20-car field on 1–3 stop strategies with tyre degradation, fuel burn,
+pit-lane losses, a safety-car window and the odd retirement.
+
+`install()` routes every FastF1 load in the app to these sessions and points
+all computed_data reads/writes at a scratch directory (F1_DATA_DIR), so
+nothing touches the network or the real precomputed store.
+"""
+
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+COMPOUNDS = ("SOFT", "MEDIUM", "HARD")
+_BASE = {"SOFT": 0.0, "MEDIUM": 0.45, "HARD": 0.9}
+_DEG = {"SOFT": 0.085, "MEDIUM": 0.055, "HARD": 0.035}
+_UTC0 = pd.Timestamp("2024-01-01 13:00:00")
+_SESSION_OFFSET_S = 3600.0        # session clock starts an hour before lights out
+
+
+class FakeLaps(pd.DataFrame):
+    @property
+    def _constructor(self):
+        return FakeLaps
+
+    def pick_drivers(self, identifiers):
+        if isinstance(identifiers, str):
+            identifiers = [identifiers]
+        return self[self["Driver"].isin(identifiers)]
+
+    def pick_driver(self, identifier):
+        return self.pick_drivers(identifier)
+
+    def pick_fastest(self):
+        timed = self[self["LapTime"].notna()]
+        return None if timed.empty else timed.loc[timed["LapTime"].idxmin()]
+
+
+class FakeSession:
+    def __init__(self, year: int, round_number: int, laps, results, weather, messages, status):
+        self.year, self.round_number = year, round_number
+        self.laps, self.results = laps, results
+        self.weather_data, self.race_control_messages = weather, messages
+        self.track_status = status
+        self.api_path = f"/static/{year}/bench_{round_number}/race/"
+        self.event = pd.Series({
+            "EventName": f"Bench Grand Prix {round_number}",
+            "Location":  f"Bench Circuit {round_number % 12 + 1}",
+            "Country":   "Benchland",
+            "EventDate": pd.Timestamp(f"{year}-03-01") + pd.Timedelta(days=14 * round_number),
+            "RoundNumber": round_number,
+        })
+
+    def load(self, **kwargs):
+        return None
+
+
+def make_session(year: int, round_number: int, drivers: int = 20, laps: int = 57) -> FakeSession:
+    rng = np.random.default_rng(year * 100 + round_number)
+    base_lap = 80.0 + (round_number % 7) * 2.5
+    sc_start = int(rng.integers(12, laps - 15))
+    sc_laps = set(range(sc_start, sc_start + 4)) if rng.random() < 0.6 else set()
+
+    rows, results = [], []
+    for d in range(drivers):
+        code = f"D{d:02d}"
+        pace = d * 0.06 + rng.normal(0, 0.05)
+        n_stops = int(rng.choice([1, 1, 2, 2, 3]))
+        stops = sorted(rng.choice(np.arange(10, laps - 5), size=n_stops, replace=False).tolist())
+        seq = [COMPOUNDS[int(rng.integers(0, 2))]] + [COMPOUNDS[int(rng.integers(1, 3))] for _ in stops]
+        retire_at = int(rng.integers(5, laps)) if rng.random() < 0.08 else None
+
+        stint, life, t = 1, 0, _SESSION_OFFSET_S + d * 0.25
+        done = 0
+        for lap in range(1, laps + 1):
+            if retire_at and lap > retire_at:
+                break
+            life += 1
+            comp = seq[stint - 1]
+            pit_in, pit_out = lap in stops, lap - 1 in stops
+            lt = base_lap + _BASE[comp] + _DEG[comp] * life - 0.055 * (lap - 1) + pace + rng.normal(0, 0.25)
+            if lap == 1:
+                lt += 4.0
+            if pit_in:
+                lt += 9.5
+            if pit_out:
+                lt += 12.0
+            status = "4" if lap in sc_laps else "1"
+            if status == "4":
+                lt *= 1.35
+            start = t
+            t += lt
+            rows.append({
+                "Driver": code, "DriverNumber": str(d + 1), "Team": f"Team {d // 2}",
+                "LapNumber": float(lap), "Stint": float(stint), "Compound": comp, "TyreLife": float(life),
+                "LapTime": pd.Timedelta(seconds=lt),
+                "Sector1Time": pd.Timedelta(seconds=lt * 0.31), "Sector2Time": pd.Timedelta(seconds=lt * 0.38),
+                "Sector3Time": pd.Timedelta(seconds=lt * 0.31),
+                # pit entry ~8 s before the line, exit ~12 s after it: a ~20 s lane
+                "PitInTime": pd.Timedelta(seconds=t - 8.0) if pit_in else pd.NaT,
+                "PitOutTime": pd.Timedelta(seconds=start + 12.0) if pit_out else pd.NaT,
+                "Time": pd.Timedelta(seconds=t), "TrackStatus": status, "SpeedST": 300.0 + rng.normal(0, 6),
+                "IsAccurate": True,
+            })
+            done = lap
+            if pit_in:
+                stint, life = stint + 1, 0
+        results.append({"code": code, "d": d, "laps": done, "time": t, "retired": retire_at is not None})
+
+    lap_df = FakeLaps(pd.DataFrame(rows))
+    # positions by race time at the end of each lap
+    lap_df["Position"] = lap_df.groupby("LapNumber")["Time"].rank(method="first").astype(float)
+
+    order = sorted(results, key=lambda r: (-r["laps"], r["time"]))
+    points = [25, 18, 15, 12, 10, 8, 6, 4, 2, 1]
+    winner_time = order[0]["time"]
+    res = []
+    for pos, r in enumerate(order, start=1):
+        res.append({
+            "DriverNumber": str(r["d"] + 1), "Abbreviation": r["code"], "FullName": f"Bench Driver {r['d']}",
+            "TeamName": f"Team {r['d'] // 2}", "GridPosition": float(r["d"] + 1), "Position": float(pos),
+            "ClassifiedPosition": "R" if r["retired"] else str(pos),
+            "Status": "Retired" if r["retired"] else ("Finished" if r["laps"] == laps else "+1 Lap"),
+            "Points": float(points[pos - 1]) if pos <= 10 and not r["retired"] else 0.0,
+            "Laps": float(r["laps"]),
+            "Time": pd.Timedelta(seconds=r["time"] - winner_time) if pos > 1 else pd.Timedelta(seconds=winner_time - _SESSION_OFFSET_S),
+        })
+    results_df = pd.DataFrame(res)
+
+    minutes = int((winner_time - _SESSION_OFFSET_S) // 60) + 70
+    weather = pd.DataFrame({
+        "Time": pd.to_timedelta(np.arange(minutes) * 60, unit="s"),
+        "AirTemp": 24 + rng.normal(0, 0.5, minutes), "TrackTemp": 38 + rng.normal(0, 1.5, minutes),
+        "Humidity": 45 + rng.normal(0, 2, minutes), "WindSpeed": np.abs(rng.normal(2, 0.7, minutes)),
+        "Rainfall": np.zeros(minutes, dtype=bool),
+    })
+
+    # track status feed + the race control messages that accompany it
+    leader = lap_df.groupby("LapNumber")["Time"].min().dt.total_seconds()
+    status, messages = [{"Time": pd.Timedelta(seconds=0), "Status": "1"}], []
+    if sc_laps:
+        s0, s1 = min(sc_laps), max(sc_laps)
+        for lap, code, text in ((s0, "4", "SAFETY CAR DEPLOYED"), (s1, "1", "TRACK CLEAR")):
+            at = float(leader.get(float(lap - 1), _SESSION_OFFSET_S))
+            status.append({"Time": pd.Timedelta(seconds=at), "Status": code})
+            messages.append({"Time": _UTC0 + pd.Timedelta(seconds=at), "Category": "SafetyCar", "Message": text,
+                             "Flag": None, "Scope": None, "RacingNumber": None, "Lap": lap})
+    for r in results_df[results_df["Status"] == "Retired"].itertuples():
+        messages.append({"Time": _UTC0 + pd.Timedelta(seconds=_SESSION_OFFSET_S + r.Laps * base_lap), "Category": "Other",
+                         "Message": f"CAR {r.DriverNumber} ({r.Abbreviation}) STOPPED", "Flag": None, "Scope": None,
+                         "RacingNumber": r.DriverNumber, "Lap": int(r.Laps) + 1})
+    for lap in range(1, laps + 1, 10):
+        messages.append({"Time": _UTC0 + pd.Timedelta(seconds=float(leader.get(float(lap), _SESSION_OFFSET_S))),
+                         "Category": "Flag", "Message": "GREEN LIGHT - PIT EXIT OPEN", "Flag": "GREEN",
+                         "Scope": "Track", "RacingNumber": None, "Lap": lap})
+    messages_df = pd.DataFrame(messages).sort_values("Time").reset_index(drop=True)
+
+    return FakeSession(year, round_number, lap_df, results_df, weather, messages_df, pd.DataFrame(status))
+
+
+@lru_cache(maxsize=None)
+def get_session(year: int, round_number: int) -> FakeSession:
+    return make_session(year, round_number)
+
+
+# ---------------------------
+# Wiring
+# ---------------------------
+
+def _load_session(year, round_number, identifier="R", **load_kwargs):
+    return get_session(year, round_number)
+
+
+def install(data_dir: str):
+    """Serve fake sessions for every FastF1 load and keep computed_data in data_dir."""
+    os.environ["F1_DATA_DIR"] = data_dir
+    from app.core import fastf1_cache, precomputed_loader
+
+    if precomputed_loader.DATA_DIR != data_dir:
+        raise RuntimeError("install() must run before app.core.precomputed_loader is imported")
+
+    fastf1_cache.load_session = _load_session
+    fastf1_cache.prune = lambda *a, **k: []
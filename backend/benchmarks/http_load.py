@@ -0,0 +1,84 @@
+"""
+HTTP load test of the main routes, in-process (ASGI TestClient, no server).
+
+    cold   every in-process cache emptied, then one request per route
+    warm   `requests` requests per route from `concurrency` threads after
+           the cold pass, reported as p50 / p95 / p99 latency and throughput
+"""
+
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+
+def routes(year: int, rnd: int) -> List[str]:
+    return [
+        f"/seasons/{year}/races/{rnd}",
+        f"/race-insights/{year}/{rnd}",
+        f"/races/{year}/{rnd}/progress",
+        f"/races/{year}/{rnd}/sectors",
+        f"/races/{year}/{rnd}/incidents",
+        f"/seasons/{year}/races/{rnd}/tyre-degradation",
+        f"/seasons/{year}/team-pace",
+        f"/standings/{year}",
+        "/drivers",
+        "/drivers/D01",
+        f"/drivers/compare?drivers=D01,D02&season={year}",
+        "/tracks",
+        "/races/query?filter=is_winner=true&group_by=season",
+    ]
+
+
+def clear_caches():
+    """Empty every lru_cache in app.* and the race store's memory tier."""
+    from app.core import metrics
+    from app.core.race_store import race_store
+
+    for _, fn in metrics._lru_caches():
+        fn.cache_clear()
+    race_store.tiers[0]._docs.clear()
+
+
+def _pct(values: List[float], q: float) -> float:
+    return round(values[min(len(values) - 1, int(len(values) * q))], 3)
+
+
+def run(year: int, rnd: int, requests: int, concurrency: int) -> Dict[str, Any]:
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    client = TestClient(app)
+    paths = routes(year, rnd)
+
+    clear_caches()
+    cold: Dict[str, Any] = {}
+    for path in paths:
+        t0 = time.perf_counter()
+        r = client.get(path)
+        cold[path] = {"ms": round((time.perf_counter() - t0) * 1000, 3), "status": r.status_code, "bytes": len(r.content)}
+
+    def timed(path: str) -> float:
+        t0 = time.perf_counter()
+        r = client.get(path)
+        if r.status_code != 200:
+            raise RuntimeError(f"{path} → {r.status_code}: {r.text[:200]}")
+        return (time.perf_counter() - t0) * 1000
+
+    warm: Dict[str, Any] = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for path in paths:
+            if cold[path]["status"] != 200:
+                continue
+            t0 = time.perf_counter()
+            times = sorted(pool.map(timed, [path] * requests))
+            elapsed = time.perf_counter() - t0
+            warm[path] = {
+                "p50_ms":   _pct(times, 0.50),
+                "p95_ms":   _pct(times, 0.95),
+                "p99_ms":   _pct(times, 0.99),
+                "mean_ms":  round(statistics.mean(times), 3),
+                "rps":      round(requests / elapsed, 1),
+                "requests": requests,
+            }
+    return {"cold": cold, "warm": warm, "concurrency": concurrency}
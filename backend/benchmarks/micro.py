@@ -0,0 +1,132 @@
+"""
+Micro-benchmarks over synthetic sessions (see fixtures.py).
+
+Each entry is timed `repeat` times and reported as median / p95 / min in ms.
+Loader reads are timed cold (lru caches cleared before every run) and warm;
+load_race itself is uncached, so it is always a file read.
+"""
+
+import importlib.util
+import os
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import fixtures
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(fn: Callable, repeat: int, before: Optional[Callable] = None) -> Dict[str, Any]:
+    times = []
+    for _ in range(repeat):
+        if before:
+            before()
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    times.sort()
+    return {
+        "median_ms": round(statistics.median(times), 4),
+        "p95_ms":    round(times[min(len(times) - 1, int(len(times) * 0.95))], 4),
+        "min_ms":    round(times[0], 4),
+        "runs":      repeat,
+    }
+
+
+def load_precompute(year: int):
+    """scripts/precompute_season.py as a module; it writes under F1_DATA_DIR."""
+    argv = sys.argv
+    sys.argv = ["precompute_season.py", str(year)]
+    try:
+        spec = importlib.util.spec_from_file_location(
+            "precompute_season", os.path.join(BACKEND_DIR, "scripts", "precompute_season.py"),
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        sys.argv = argv
+    os.makedirs(module.OUT_DIR, exist_ok=True)
+    return module
+
+
+def load_bench_strategy():
+    spec = importlib.util.spec_from_file_location(
+        "bench_strategy", os.path.join(BACKEND_DIR, "scripts", "bench_strategy.py"),
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def prepare(year: int, rounds: List[int]) -> Dict[str, Any]:
+    """Precompute the synthetic season under F1_DATA_DIR; times process_race per race."""
+    from app.core import lap_store, team_pace, tyre_model
+
+    precompute = load_precompute(year)
+    timings = []
+    for rnd in rounds:
+        t0 = time.perf_counter()
+        precompute.process_race(rnd)
+        timings.append((time.perf_counter() - t0) * 1000)
+    season_laps = lap_store.season_lap_table(year)
+    tyre_model.save_season_fit(year, tyre_model.fit_season(season_laps))
+    team_pace.save_matrix(year, team_pace.season_matrix(season_laps))
+    timings.sort()
+    return {
+        "median_ms": round(statistics.median(timings), 4),
+        "p95_ms":    round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 4),
+        "min_ms":    round(timings[0], 4),
+        "runs":      len(timings),
+    }
+
+
+def run(year: int, rounds: List[int], repeat: int) -> Dict[str, Any]:
+    """Micro-benchmarks over a season already written by prepare()."""
+    from app.core import (
+        head_to_head, lap_store, precomputed_loader, race_builder, race_store,
+        sector_analysis, strategy_batch, team_pace, tyre_model,
+    )
+
+    out: Dict[str, Any] = {}
+    session = fixtures.get_session(year, rounds[0])
+    codes = list(session.results["Abbreviation"])
+
+    out["driver_lap_stats"] = measure(
+        lambda: [race_builder._driver_lap_stats(session, c) for c in codes], repeat,
+    )
+    out["build_race"] = measure(lambda: race_builder.build_race(year, rounds[0]), repeat)
+    season_laps = lap_store.season_lap_table(year)
+
+    # strategy scoring: per-driver functions vs one batched call
+    bench_strategy = load_bench_strategy()
+    races = [precomputed_loader.load_race(year, r) for r in rounds]
+    out["strategy_per_driver"] = measure(lambda: bench_strategy.per_driver(races), repeat)
+    out["strategy_batched"] = measure(lambda: bench_strategy.batched(races), repeat)
+    for rules in ("precompute", "engine"):
+        out[f"strategy_per_driver_{rules}"] = measure(lambda: bench_strategy.per_driver(races, rules), repeat)
+        out[f"strategy_batched_{rules}"] = measure(lambda: bench_strategy.batched(races, rules), repeat)
+    out["strategy_field_arrays"] = measure(lambda: strategy_batch.field_arrays(races), repeat)
+
+    # loader reads, cold and warm
+    out["load_race"] = measure(lambda: precomputed_loader.load_race(year, rounds[0]), repeat)
+    out["lap_table_cold"] = measure(
+        lambda: lap_store.load_lap_table(year, rounds[0]), repeat,
+        before=lap_store._read_table.cache_clear,
+    )
+    out["lap_table_warm"] = measure(lambda: lap_store.load_lap_table(year, rounds[0]), repeat)
+    out["race_store_warm"] = measure(lambda: race_store.get_race(year, rounds[0]), repeat)
+    out["season_lap_table"] = measure(lambda: lap_store.season_lap_table(year), repeat)
+
+    # season analytics
+    out["tyre_fit_season"] = measure(lambda: tyre_model.fit_season(season_laps), repeat)
+    out["team_pace_matrix"] = measure(lambda: team_pace.season_matrix(season_laps), repeat)
+    table = lap_store.load_lap_table(year, rounds[0])
+    out["sector_analysis"] = measure(lambda: sector_analysis.analyze(table), repeat)
+    race_set = [(year, r) for r in rounds]
+    out["head_to_head_cold"] = measure(
+        lambda: head_to_head.compare(codes[:2], race_set), repeat,
+        before=lambda: (head_to_head._compare.cache_clear(), head_to_head._race_laps.cache_clear()),
+    )
+    return out
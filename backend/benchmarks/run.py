@@ -0,0 +1,130 @@
+"""
+Offline benchmark suite — no network, no real precomputed data needed.
+
+Synthetic FastF1-shaped sessions (fixtures.py) stand in for every FastF1 load;
+computed_data is written to a scratch directory. Runs the micro-benchmarks
+(micro.py) and the in-process HTTP load test (http_load.py), then saves
+everything as JSON keyed by the current git commit.
+
+Usage:
+  python backend/benchmarks/run.py                         # 2023, 6 rounds
+  python backend/benchmarks/run.py --rounds 22 --repeat 20 --requests 500
+  python backend/benchmarks/run.py --only micro
+  python backend/benchmarks/run.py --compare results/abc123.json results/def456.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(HERE))
+
+# before any app import: no cross-process cache, no writes into the real store
+os.environ["F1_SHARED_CACHE"] = "0"
+os.environ["RACE_STORE_FILE_WRITEBACK"] = "0"
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--year", type=int, default=2023)
+    p.add_argument("--rounds", type=int, default=6, help="synthetic races in the season")
+    p.add_argument("--repeat", type=int, default=10, help="runs per micro-benchmark")
+    p.add_argument("--requests", type=int, default=200, help="warm requests per route")
+    p.add_argument("--concurrency", type=int, default=8)
+    p.add_argument("--only", choices=["micro", "http"], default=None)
+    p.add_argument("--out", default=None, help="results file (default: results/<commit>.json)")
+    p.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="compare two results files and exit")
+    return p.parse_args()
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=HERE, stderr=subprocess.DEVNULL,
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# ---------------- COMPARE ----------------
+
+def _flatten(results: dict) -> dict:
+    out = {}
+    for name, r in results.get("micro", {}).items():
+        out[f"micro {name}"] = r["median_ms"]
+    for path, r in results.get("http", {}).get("warm", {}).items():
+        out[f"warm  {path}"] = r["p50_ms"]
+    for path, r in results.get("http", {}).get("cold", {}).items():
+        out[f"cold  {path}"] = r["ms"]
+    return out
+
+
+def compare(base_path: str, new_path: str):
+    with open(base_path) as f:
+        base = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    a, b = _flatten(base), _flatten(new)
+    print(f"📊 {base['meta']['commit']} → {new['meta']['commit']}  (ms, lower is better)")
+    for key in sorted(set(a) & set(b)):
+        ratio = b[key] / a[key] if a[key] else float("inf")
+        flag = "🔴" if ratio > 1.15 else "🟢" if ratio < 0.87 else "  "
+        print(f"{flag} {key:<70} {a[key]:>10.3f} {b[key]:>10.3f}  {ratio:5.2f}x")
+
+
+# ---------------- MAIN ----------------
+
+def main():
+    args = parse_args()
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    import fixtures
+    import http_load
+    import micro
+
+    data_dir = tempfile.mkdtemp(prefix="strathub-bench-")
+    fixtures.install(data_dir)
+    rounds = list(range(1, args.rounds + 1))
+    results = {
+        "meta": {
+            "commit":    git_commit(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python":    platform.python_version(),
+            "platform":  platform.platform(),
+            "params":    {k: v for k, v in vars(args).items() if k not in ("out", "compare")},
+        },
+    }
+
+    print(f"🏁 Offline benchmarks: {args.year}, {len(rounds)} synthetic races → {data_dir}")
+    # precompute the synthetic season (what both stages read and serve)
+    process_race = micro.prepare(args.year, rounds)
+
+    if args.only in (None, "micro"):
+        results["micro"] = {"process_race": process_race, **micro.run(args.year, rounds, args.repeat)}
+        for name, r in results["micro"].items():
+            print(f"   {name:<32} {r['median_ms']:>10.3f} ms")
+
+    if args.only in (None, "http"):
+        results["http"] = http_load.run(args.year, rounds[0], args.requests, args.concurrency)
+        for path, r in results["http"]["cold"].items():
+            warm = results["http"]["warm"].get(path)
+            tail = f"warm p50 {warm['p50_ms']:8.3f} ms  p99 {warm['p99_ms']:8.3f} ms  {warm['rps']:8.1f} rps" if warm else "—"
+            print(f"   {path:<52} cold {r['ms']:9.1f} ms ({r['status']})  {tail}")
+
+    out = args.out or os.path.join(HERE, "results", f"{results['meta']['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"✅ Results saved to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Per-driver vs batched strategy scoring over a whole season, for each of the
+three rule sets (see strategy_batch).
+
+Usage:
+  python backend/scripts/bench_strategy.py 2023          # races from computed_data/2023
+  python backend/scripts/bench_strategy.py 2023 --repeat 20
+"""
+
+import importlib.util
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.core import precomputed_loader, strategy_batch
+from app.core.race_builder import _strategy_risk, _strategy_simulation
+from app.core.strategy_engine import compute_strategy_risk, simulate_strategy_swap
+
+RULES = ("dashboard", "precompute", "engine")
+
+
+def _precompute_script():
+    # the per-driver precompute rules live in the script (importing it has no side effects)
+    argv, sys.argv = sys.argv, ["precompute_season.py"]
+    try:
+        spec = importlib.util.spec_from_file_location(
+            "precompute_season", os.path.join(os.path.dirname(os.path.abspath(__file__)), "precompute_season.py"),
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        sys.argv = argv
+    return module
+
+
+precompute_season = _precompute_script()
+
+
+def load_season(year):
+    races = []
+    for rnd in range(1, 31):
+        doc = precomputed_loader.load_race(year, rnd)
+        if doc and doc.get("drivers"):
+            races.append(doc)
+    return races
+
+
+def _most_common(values, default=0):
+    counts = Counter(values).most_common(1)
+    return counts[0][0] if counts else default
+
+
+def per_driver(races, rules="dashboard"):
+    out = []
+    for race in races:
+        drivers = sorted(race["drivers"], key=lambda d: d.get("finish", 99))
+        avg_stops = sum(d["stops"] for d in drivers) / len(drivers)
+        avg_longest = sum(d["longest_stint"] for d in drivers) / len(drivers)
+        if rules == "dashboard":
+            winner_stops = drivers[0]["stops"]
+            for d in drivers:
+                out.append((
+                    _strategy_risk(d["stops"], d["positions_gained"], avg_stops),
+                    _strategy_simulation(d["stops"], d["positions_gained"], winner_stops),
+                ))
+        elif rules == "precompute":
+            ctx = {"avg_stops": avg_stops, "avg_longest_stint": avg_longest}
+            recipe = {"typical_stops": _most_common(d["stops"] for d in drivers if d.get("finish", 0) > 0)}
+            for d in drivers:
+                out.append((
+                    precompute_season.strategy_risk(d, ctx),
+                    precompute_season.strategy_swap(d, recipe),
+                ))
+        elif rules == "engine":
+            common = _most_common(strategy_batch.tyre_key(d.get("tyre_sequence", [])) for d in drivers)
+            ctx = {"avg_stops": avg_stops, "avg_longest_stint": avg_longest, "common_tyre_sequence": common}
+            recipe = {
+                "typical_stops": _most_common(d["stops"] for d in drivers),
+                "avg_longest_stint": avg_longest,
+                "common_tyre_sequence": common,
+            }
+            for d in drivers:
+                out.append((compute_strategy_risk(d, ctx), simulate_strategy_swap(d, recipe)))
+        else:
+            raise ValueError(f"Unknown rule set: {rules}")
+    return out
+
+
+def batched(races, rules="dashboard"):
+    f = strategy_batch.field_arrays(races)
+    return strategy_batch.score_field(
+        f["stops"], f["longest_stint"], f["positions_gained"], f["tyre_codes"],
+        race_ids=f["race_ids"], finish=f["finish"], rules=rules,
+    )
+
+
+def bench(fn, races, repeat, rules):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(races, rules)
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times)
+
+
+def main():
+    if len(sys.argv) < 2:
+        raise RuntimeError("Usage: python bench_strategy.py <YEAR> [--repeat N]")
+    year = int(sys.argv[1])
+    repeat = int(sys.argv[sys.argv.index("--repeat") + 1]) if "--repeat" in sys.argv else 10
+
+    races = load_season(year)
+    if not races:
+        raise RuntimeError(f"No computed race data found for {year}")
+    rows = sum(len(r["drivers"]) for r in races)
+
+    print(f"🏁 {year}: {len(races)} races, {rows} driver rows (median of {repeat})")
+    for rules in RULES:
+        slow = bench(per_driver, races, repeat, rules)
+        fast = bench(batched, races, repeat, rules)
+        print(f"   {rules:<10} per-driver {slow * 1000:8.2f} ms   batched {fast * 1000:8.2f} ms   ({slow / fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Rebuild the season team pace matrix from stored lap tables (no FastF1 needed).
+
+Usage:
+  python backend/scripts/compute_team_pace.py 2025
+
+Reads computed_data/<year>/laps/*.parquet (written by precompute_season.py)
+and writes computed_data/<year>/team_pace.json.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.core import lap_store, team_pace
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    year = int(sys.argv[1])
+
+    rounds = lap_store.stored_rounds(year)
+    if not rounds:
+        print(f"❌ No lap tables for {year} — run precompute_season.py first")
+        sys.exit(1)
+
+    t0 = time.perf_counter()
+    laps = lap_store.season_lap_table(year, rounds)
+    matrix = team_pace.season_matrix(laps)
+    team_pace.save_matrix(year, matrix)
+    print(f"🏎️  {len(laps):,} laps → {len(matrix['teams'])} teams × {len(matrix['rounds'])} rounds "
+          f"in {time.perf_counter() - t0:.2f}s")
+
+    for team, row in zip(matrix["teams"], matrix["gap_pct"]):
+        print(f"   {team:<24} avg gap {np.nanmean(row):.3f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+FastF1 cache footprint & pruning.
+
+Usage:
+  python backend/scripts/fastf1_cache.py                 # report footprint + hit ratio
+  python backend/scripts/fastf1_cache.py --sessions      # ... plus every cached session
+  python backend/scripts/fastf1_cache.py prune           # prune to FASTF1_CACHE_MAX_MB
+  python backend/scripts/fastf1_cache.py prune 1024      # prune to 1024 MB
+"""
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.core import fastf1_cache
+
+
+def _mb(n):
+    return f"{n / (1024 * 1024):,.1f} MB"
+
+
+def print_report(show_sessions: bool):
+    r = fastf1_cache.report()
+    ratio = f"{r['hit_ratio'] * 100:.1f}%" if r["hit_ratio"] is not None else "n/a"
+
+    print(f"📁 {r['cache_dir']}")
+    print(f"   sessions    : {r['sessions']}  ({_mb(r['session_bytes'])} / budget {_mb(r['max_bytes'])})")
+    print(f"   http cache  : {_mb(r['http_cache_bytes'])}")
+    print(f"   hit ratio   : {ratio}  ({r['hits']} hits, {r['misses']} misses)")
+    for season, s in sorted(r["by_season"].items()):
+        print(f"   {season}        : {s['sessions']:>3} sessions  {_mb(s['bytes'])}")
+
+    if show_sessions:
+        for e in sorted(fastf1_cache.session_entries(), key=lambda e: e["last_used"], reverse=True):
+            print(f"   {_mb(e['bytes']):>10}  {e['path']}")
+
+
+def main():
+    args = sys.argv[1:]
+    if args and args[0] == "prune":
+        max_bytes = int(float(args[1]) * 1024 * 1024) if len(args) > 1 else None
+        removed = fastf1_cache.prune(max_bytes)
+        for path in removed:
+            print(f"🗑️  {path}")
+        print(f"✅ Pruned {len(removed)} sessions")
+        return
+
+    print_report("--sessions" in args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Refit season-wide tyre degradation from stored lap tables (no FastF1 needed).
+
+Usage:
+  python backend/scripts/fit_tyre_degradation.py 2025
+
+Reads computed_data/<year>/laps/*.parquet (written by precompute_season.py),
+writes computed_data/<year>/tyre_degradation.json and refreshes the
+tyre_degradation_index of every driver in computed_data/<year>/race_N.json.
+"""
+
+import json
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.core import lap_store, precomputed_loader, tyre_model
+from app.core.precomputed_loader import save_race
+
+
+def update_race_docs(year: int, fit: dict) -> int:
+    updated = 0
+    for rnd, race_fit in fit["rounds"].items():
+        path = os.path.join(precomputed_loader.DATA_DIR, str(year), f"race_{rnd}.json")
+        if not os.path.exists(path):
+            continue
+        with open(path) as f:
+            doc = json.load(f)
+        for d in doc.get("drivers", []):
+            fitted = race_fit["drivers"].get(d.get("driver_code"))
+            if fitted:
+                d["tyre_degradation_index"] = fitted["tyre_degradation_index"]
+        # atomic replace; running workers see the new mtime and drop their cached copy
+        save_race(year, int(rnd), doc)
+        updated += 1
+    return updated
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    year = int(sys.argv[1])
+
+    rounds = lap_store.stored_rounds(year)
+    if not rounds:
+        print(f"❌ No lap tables for {year} — run precompute_season.py first")
+        sys.exit(1)
+
+    t0 = time.perf_counter()
+    laps = lap_store.season_lap_table(year, rounds)
+    fit = tyre_model.fit_season(laps)
+    tyre_model.save_season_fit(year, fit)
+    print(f"🛞 {len(laps):,} laps from {len(rounds)} races fitted in {time.perf_counter() - t0:.2f}s")
+
+    print(f"✅ Updated {update_race_docs(year, fit)} race documents")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 import os
 import json
 import sys
+from app.core import precomputed_loader
 from app.db.mongo import db
 
 def main():
@@ -13,8 +14,7 @@ def main():
 
     YEAR = int(sys.argv[1])
 
-    BASE_DIR = os.path.dirname(os.path.dirname(__file__))
-    DATA_DIR = os.path.join(BASE_DIR, "computed_data", str(YEAR))
+    DATA_DIR = os.path.join(precomputed_loader.DATA_DIR, str(YEAR))
 
     if not os.path.exists(DATA_DIR):
         raise RuntimeError(f"No computed data found for {YEAR}")
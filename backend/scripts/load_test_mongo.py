@@ -0,0 +1,160 @@
+"""
+Sync vs async Mongo loader load test.
+
+Runs the same load_race / list_races mix through:
+  - sync  : the pymongo queries on a thread pool (what FastAPI does for `def` routes)
+  - async : the Motor loaders awaited on one event loop
+            (what the race store does for /seasons/{year}/races/{round})
+
+Usage:
+  python backend/scripts/load_test_mongo.py                      # uses MONGO_URI_NEW
+  python backend/scripts/load_test_mongo.py --uri mongodb://localhost:27017 --seed
+  python backend/scripts/load_test_mongo.py --requests 5000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--uri", default=None, help="Mongo URI (defaults to MONGO_URI_NEW)")
+    p.add_argument("--db", default="f1_strathub_loadtest", help="database to run against")
+    p.add_argument("--seed", action="store_true", help="insert synthetic race documents first")
+    p.add_argument("--requests", type=int, default=2000)
+    p.add_argument("--concurrency", type=int, default=40, help="threads (sync) / in-flight tasks (async)")
+    p.add_argument("--pool", type=int, default=None, help="MONGO_MAX_POOL_SIZE override")
+    return p.parse_args()
+
+
+ARGS = parse_args()
+if ARGS.uri:
+    os.environ["MONGO_URI_NEW"] = ARGS.uri
+os.environ["MONGO_DB_NAME"] = ARGS.db
+if ARGS.pool:
+    os.environ["MONGO_MAX_POOL_SIZE"] = str(ARGS.pool)
+
+from app.db.mongo import db  # noqa: E402
+from app.core import mongo_loader  # noqa: E402
+
+SEASONS = [2023, 2024]
+ROUNDS = range(1, 23)
+
+
+# ---------------- SEED ----------------
+
+def seed():
+    docs = []
+    for season in SEASONS:
+        for rnd in ROUNDS:
+            docs.append({
+                "season": season,
+                "round": rnd,
+                "event_name": f"Load Test Grand Prix {rnd}",
+                "location": "Nowhere",
+                "drivers": [
+                    {
+                        "driver_code": f"D{i:02d}",
+                        "team": f"Team {i // 2}",
+                        "grid": i + 1,
+                        "finish": i + 1,
+                        "positions_gained": 0,
+                        "stops": 1 + i % 3,
+                        "tyre_sequence": ["MEDIUM", "HARD"],
+                        "longest_stint": 20 + i,
+                    }
+                    for i in range(20)
+                ],
+                "derived": {},
+            })
+    db.races.delete_many({"season": {"$in": SEASONS}})
+    db.races.insert_many(docs)
+    db.races.create_index([("season", 1), ("round", 1)])
+    print(f"🌱 Seeded {len(docs)} race documents into {ARGS.db}")
+
+
+# ---------------- WORKLOAD ----------------
+
+def workload(n):
+    rng = random.Random(42)
+    ops = []
+    for _ in range(n):
+        season = rng.choice(SEASONS)
+        if rng.random() < 0.8:
+            ops.append(("load_race", season, rng.choice(ROUNDS)))
+        else:
+            ops.append(("list_races", season, None))
+    return ops
+
+
+# Uncached entry points — we want to measure the driver, not lru_cache / the shared cache.
+SYNC_OPS = {
+    "load_race": lambda s, r: mongo_loader.query_race(s, r),
+    "list_races": lambda s, r: mongo_loader.query_races(s),
+}
+ASYNC_OPS = {
+    "load_race": lambda s, r: mongo_loader.load_race_async(s, r),
+    "list_races": lambda s, r: mongo_loader.list_races_async(s),
+}
+
+
+def summarize(name, latencies, elapsed):
+    latencies = sorted(latencies)
+    q = statistics.quantiles(latencies, n=100)
+    print(
+        f"{name:<6} {len(latencies) / elapsed:>9.1f} req/s   "
+        f"p50 {q[49] * 1000:>7.2f} ms   p95 {q[94] * 1000:>7.2f} ms   "
+        f"p99 {q[98] * 1000:>7.2f} ms"
+    )
+
+
+def run_sync(ops):
+    def one(op):
+        t0 = time.perf_counter()
+        SYNC_OPS[op[0]](op[1], op[2])
+        return time.perf_counter() - t0
+
+    with ThreadPoolExecutor(max_workers=ARGS.concurrency) as pool:
+        list(pool.map(one, ops[:ARGS.concurrency]))   # warm the pool
+        t0 = time.perf_counter()
+        latencies = list(pool.map(one, ops))
+        elapsed = time.perf_counter() - t0
+    summarize("sync", latencies, elapsed)
+
+
+async def run_async(ops):
+    sem = asyncio.Semaphore(ARGS.concurrency)
+
+    async def one(op):
+        async with sem:
+            t0 = time.perf_counter()
+            await ASYNC_OPS[op[0]](op[1], op[2])
+            return time.perf_counter() - t0
+
+    await asyncio.gather(*(one(op) for op in ops[:ARGS.concurrency]))   # warm the pool
+    t0 = time.perf_counter()
+    latencies = await asyncio.gather(*(one(op) for op in ops))
+    elapsed = time.perf_counter() - t0
+    summarize("async", latencies, elapsed)
+
+
+def main():
+    if ARGS.seed:
+        seed()
+
+    ops = workload(ARGS.requests)
+    print(f"🚦 {ARGS.requests} requests, concurrency {ARGS.concurrency}, db {ARGS.db}")
+    run_sync(ops)
+    asyncio.run(run_async(ops))
+
+
+if __name__ == "__main__":
+    main()
@@ -11,33 +11,29 @@ import pandas as pd
 import json
 import os
 import sys
-import math
 from collections import Counter
 
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.core import (
+    fastf1_cache, incidents, lap_store, precomputed_loader, sector_analysis, strategy_batch, team_pace, tyre_model,
+)
+from app.core.race_builder import _str
+from app.core.strategy_engine import compute_style_profile, safe_mean
+
 # ---------------- CONFIG ----------------
 
-fastf1.Cache.enable_cache(".fastf1-cache")
+fastf1_cache.enable()
 
-BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 YEAR = int(sys.argv[1]) if len(sys.argv) > 1 else 2023
 ONLY_ROUND = int(sys.argv[2]) if len(sys.argv) > 2 else None
 
-OUT_DIR = os.path.join(BASE_DIR, "computed_data", str(YEAR))
-os.makedirs(OUT_DIR, exist_ok=True)
+OUT_DIR = os.path.join(precomputed_loader.DATA_DIR, str(YEAR))
 
 RACES_INDEX = []
 
-print(f"🚨 PRECOMPUTING SEASON {YEAR}")
-if ONLY_ROUND:
-    print(f"➡️  ONLY ROUND {ONLY_ROUND}")
-
 # ---------------- HELPERS ----------------
 
-def safe_mean(values):
-    vals = [v for v in values if isinstance(v, (int, float)) and not math.isnan(v)]
-    return sum(vals) / len(vals) if vals else None
-
-
 def compute_winning_recipe(drivers):
     finishers = [d for d in drivers if d["finish"] > 0]
     if not finishers:
@@ -54,56 +50,21 @@ def compute_winning_recipe(drivers):
     }
 
 
-def compute_style_profile(drivers):
-    finishers = [d for d in drivers if d["finish"] > 0]
-    if not finishers:
-        return []
-
-    avg_stint = safe_mean(d["longest_stint"] for d in finishers) or 0
-    avg_gain = safe_mean(d["positions_gained"] for d in finishers) or 0
-
-    tags = []
-    if avg_stint >= 28:
-        tags.append("Tyre Saving Track")
-    if avg_stint <= 20:
-        tags.append("High Degradation Track")
-    if avg_gain > 1.5:
-        tags.append("Overtaking Friendly")
-    if avg_gain < 0.5:
-        tags.append("Track Position Critical")
-
-    return tags
-
-
 def strategy_risk(driver, race_ctx):
-    risk = 50
-    risk += (driver["stops"] - race_ctx["avg_stops"]) * 12
-    risk -= (driver["longest_stint"] - race_ctx["avg_longest_stint"]) * 1.5
-    risk = max(0, min(100, int(risk)))
-
-    label = (
-        "Low Risk" if risk < 35 else
-        "Medium Risk" if risk < 70 else
-        "High Risk"
+    # per-driver wrapper over strategy_batch.precompute_risk
+    out = strategy_batch.precompute_risk(
+        driver["stops"], driver["longest_stint"],
+        race_ctx["avg_stops"], race_ctx["avg_longest_stint"],
     )
-
-    return {"risk_score": risk, "risk_label": label}
+    return {"risk_score": strategy_batch.py(out["risk_score"]), "risk_label": str(out["risk_label"])}
 
 
 def strategy_swap(driver, winning_recipe):
-    if driver["stops"] > winning_recipe["typical_stops"]:
-        return {
-            "estimated_position_change": +2,
-            "verdict": "Could gain positions with fewer stops"
-        }
-    if driver["stops"] < winning_recipe["typical_stops"]:
-        return {
-            "estimated_position_change": -1,
-            "verdict": "Likely slower without extra tyre advantage"
-        }
+    # per-driver wrapper over strategy_batch.precompute_swap
+    out = strategy_batch.precompute_swap(driver["stops"], winning_recipe["typical_stops"])
     return {
-        "estimated_position_change": 0,
-        "verdict": "Strategy aligned with race winner"
+        "estimated_position_change": strategy_batch.py(out["position_change"]),
+        "verdict": str(out["verdict"])
     }
 
 
@@ -127,21 +88,28 @@ def consistency_index(laps):
     if laps.empty or "LapTime" not in laps:
         return None
     valid = laps.dropna(subset=["LapTime"])
-    if valid.empty:
+    if len(valid) <= 3:
         return None
-    return round(valid["LapTime"].dt.total_seconds().std(), 3)
+    # same 0–100 score as the live race documents (higher = more consistent)
+    secs = valid["LapTime"].dt.total_seconds()
+    cv = secs.std() / secs.mean() * 100
+    return int(max(0, min(100, round(100 - cv * 10))))
 
 # ---------------- CORE ----------------
 
 def process_race(round_number):
     print(f"➡️  Processing Round {round_number}")
 
-    session = fastf1.get_session(YEAR, round_number, "R")
-    session.load(laps=True, telemetry=False, weather=False)
+    session = fastf1_cache.load_session(YEAR, round_number, "R", laps=True, telemetry=False, weather=False)
 
     results = session.results
     laps = session.laps
 
+    # slim lap table for season-wide fits (computed_data/<year>/laps/)
+    lap_table = lap_store.lap_table_from_laps(laps)
+    lap_store.save_lap_table(YEAR, round_number, lap_table)
+    fitted_tdi = tyre_model.driver_indices(lap_table)
+
     drivers = []
 
     for _, row in results.iterrows():
@@ -169,10 +137,13 @@ def process_race(round_number):
 
         drivers.append({
             "driver_code": code,
+            "driver_name": _str(row.get("FullName"), code),
             "team": row["TeamName"],
             "grid": int(row["GridPosition"]),
             "finish": int(row["Position"]),
             "positions_gained": int(row["GridPosition"] - row["Position"]),
+            "status": _str(row.get("Status"), "Finished"),
+            "points": float(row["Points"]) if pd.notna(row.get("Points")) else 0.0,
             "stops": max(len(tyre_sequence) - 1, 0),
             "tyre_sequence": tyre_sequence,
             "longest_stint": int(longest_stint),
@@ -181,32 +152,52 @@ def process_race(round_number):
 
     winning = compute_winning_recipe(drivers)
 
-    race_ctx = {
-        "avg_stops": safe_mean(d["stops"] for d in drivers) or 0,
-        "avg_longest_stint": safe_mean(d["longest_stint"] for d in drivers) or 0
-    }
+    # whole field scored in one vectorized call (same rules as strategy_risk / strategy_swap)
+    field = strategy_batch.field_arrays([{"drivers": drivers}])
+    scored = strategy_batch.score_field(
+        field["stops"], field["longest_stint"], field["positions_gained"],
+        field["tyre_codes"], finish=field["finish"], rules="precompute",
+    )
 
-    for d in drivers:
-        d["strategy_risk"] = strategy_risk(d, race_ctx)
-        d["strategy_simulation"] = strategy_swap(d, winning)
-        d["tyre_degradation_index"] = tyre_degradation_index(d)
+    for i, d in enumerate(drivers):
+        d["strategy_risk"] = {
+            "risk_score": strategy_batch.py(scored["risk_score"][i]),
+            "risk_label": str(scored["risk_label"][i]),
+        }
+        d["strategy_simulation"] = {
+            "estimated_position_change": strategy_batch.py(scored["position_change"][i]),
+            "verdict": str(scored["verdict"][i]),
+        }
+        d["tyre_degradation_index"] = fitted_tdi.get(d["driver_code"], tyre_degradation_index(d))
         d["pit_efficiency"] = pit_efficiency(d)
 
+    # same document shape as race_builder.build_race (the live tier)
+    drivers.sort(key=lambda d: d["finish"])
     race_doc = {
         "season": YEAR,
         "round": round_number,
         "event_name": session.event["EventName"],
         "location": session.event["Location"],
+        "date": str(session.event.get("EventDate", ""))[:10],
         "drivers": drivers,
+        "winner": drivers[0] if drivers else None,
         "derived": {
             "winning_recipe": winning,
             "style_profile": compute_style_profile(drivers)
-        }
+        },
+        "sector_analysis": sector_analysis.analyze(lap_table),
+        "consistency_scale": lap_store.CONSISTENCY_SCALE
     }
 
     with open(os.path.join(OUT_DIR, f"race_{round_number}.json"), "w") as f:
         json.dump(race_doc, f, indent=2)
 
+    # incident timeline (race control messages + track status only)
+    try:
+        incidents.save_timeline(YEAR, round_number, incidents.build_timeline(YEAR, round_number))
+    except Exception as e:
+        print(f"⚠️  Round {round_number}: no incident timeline ({e})")
+
     RACES_INDEX.append({
         "season": YEAR,
         "round": round_number,
@@ -216,6 +207,11 @@ def process_race(round_number):
 
 
 def main():
+    print(f"🚨 PRECOMPUTING SEASON {YEAR}")
+    if ONLY_ROUND:
+        print(f"➡️  ONLY ROUND {ONLY_ROUND}")
+    os.makedirs(OUT_DIR, exist_ok=True)
+
     rounds = [ONLY_ROUND] if ONLY_ROUND else range(1, 26)
 
     for rnd in rounds:
@@ -227,6 +223,32 @@ def main():
     with open(os.path.join(OUT_DIR, "races.json"), "w") as f:
         json.dump(RACES_INDEX, f, indent=2)
 
+    # season completion (read by the driver index for championship titles)
+    if not ONLY_ROUND:
+        try:
+            scheduled = len(fastf1.get_event_schedule(YEAR, include_testing=False))
+        except Exception:
+            scheduled = None
+        stored = len(RACES_INDEX)
+        with open(os.path.join(OUT_DIR, "season.json"), "w") as f:
+            json.dump({
+                "season": YEAR,
+                "scheduled_rounds": scheduled,
+                "stored_rounds": stored,
+                "complete": scheduled is not None and stored >= scheduled,
+            }, f, indent=2)
+
+    # season-wide fits over every stored lap table
+    if not ONLY_ROUND:
+        season_laps = lap_store.season_lap_table(YEAR)
+        fit = tyre_model.fit_season(season_laps)
+        tyre_model.save_season_fit(YEAR, fit)
+        print(f"🛞 Tyre degradation fitted for {len(fit['rounds'])} races")
+
+        matrix = team_pace.season_matrix(season_laps)
+        team_pace.save_matrix(YEAR, matrix)
+        print(f"🏎️  Team pace matrix: {len(matrix['teams'])} teams × {len(matrix['rounds'])} rounds")
+
     print(f"✅ {YEAR} precompute complete")
 
 
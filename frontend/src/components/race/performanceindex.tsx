@@ -18,7 +18,7 @@ type Telemetry = {
 };
 
 type PitStrategy = {
-  avg_pit_time?: number;
+  est_stationary_time?: number | null;
 };
 
 type Props = {
@@ -172,8 +172,8 @@ function calculateScore(
   }
 
   /* PIT */
-  if (pit?.avg_pit_time) {
-    score += Math.max(0, 15 - pit.avg_pit_time);
+  if (pit?.est_stationary_time) {
+    score += Math.max(0, 15 - pit.est_stationary_time);
   }
 
   /* NORMALIZE */
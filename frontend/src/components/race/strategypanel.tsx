@@ -1,7 +1,7 @@
 /* ================= TYPES ================= */
 
 type PitStrategy = {
-  avg_pit_time: number;
+  avg_pit_lane_time: number | null;
   total_pitstops: number;
   pit_loss_avg: number;
   tyre_sequences: Record<string, string>;
@@ -50,8 +50,8 @@ export default function StrategyPanel({
       <div className="grid grid-cols-1 md:grid-cols-3 gap-6 mb-10">
 
         <Stat
-          label="Avg Pit Time"
-          value={`${pit.avg_pit_time?.toFixed(2) ?? "0.00"}s`}
+          label="Avg Pit Lane Time"
+          value={`${pit.avg_pit_lane_time?.toFixed(2) ?? "0.00"}s`}
         />
 
         <Stat